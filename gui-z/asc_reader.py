@@ -0,0 +1,400 @@
+"""Reader for AFAD DYNA 1.2 ``.asc`` accelerograms.
+
+The ``KEY: value`` header is parsed into an :class:`AscHeader` and the
+sample column is parsed chunk by chunk (:class:`AscStream`) into a NumPy
+array, so long records never hold their whole text in memory. :class:`RecordStore`
+keeps parsed records in a bounded LRU so switching between features never
+goes back to the disk for a file that has not changed.
+
+Behind the LRU, :class:`SidecarCache` keeps a binary copy of every parsed
+record (``<key>.json`` header + ``<key>.npy`` samples) so later sessions
+memory-map the samples instead of parsing the text again.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import hashlib
+import json
+import os
+import threading
+import warnings
+
+import numpy as np
+
+DEFAULT_ASC_FILE = "20250423094910_3416_ap_RawAcc_N.asc"
+DEFAULT_SAMPLING_INTERVAL_S = 0.01
+
+CACHE_DIR_ENV = "QUAKESENSE_CACHE_DIR"
+DEFAULT_CACHE_DIR = ".asc_cache"
+SIDECAR_VERSION = 1
+CHUNK_BYTES = 4 << 20
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value):
+    number = _to_float(value)
+    return int(number) if number is not None else None
+
+
+def _to_str(value):
+    return value or None
+
+
+# DYNA 1.2 key -> (AscHeader attribute, converter)
+_HEADER_FIELDS = {
+    "EVENT_NAME": ("event_name", _to_str),
+    "EVENT_ID": ("event_id", _to_str),
+    "EVENT_DATE_YYYYMMDD": ("event_date", _to_str),
+    "EVENT_TIME_HHMMSS": ("event_time", _to_str),
+    "EVENT_LATITUDE_DEGREE": ("event_latitude", _to_float),
+    "EVENT_LONGITUDE_DEGREE": ("event_longitude", _to_float),
+    "EVENT_DEPTH_KM": ("event_depth_km", _to_float),
+    "MAGNITUDE_W": ("magnitude_w", _to_float),
+    "MAGNITUDE_L": ("magnitude_l", _to_float),
+    "NETWORK": ("network", _to_str),
+    "STATION_CODE": ("station_code", _to_str),
+    "STATION_NAME": ("station_name", _to_str),
+    "STATION_LATITUDE_DEGREE": ("station_latitude", _to_float),
+    "STATION_LONGITUDE_DEGREE": ("station_longitude", _to_float),
+    "STATION_ELEVATION_M": ("station_elevation_m", _to_float),
+    "LOCATION": ("location", _to_str),
+    "VS30_M/S": ("vs30", _to_float),
+    "EPICENTRAL_DISTANCE_KM": ("epicentral_distance_km", _to_float),
+    "DATE_TIME_FIRST_SAMPLE_YYYYMMDD_HHMMSS": ("first_sample_time", _to_str),
+    "SAMPLING_INTERVAL_S": ("sampling_interval_s", _to_float),
+    "NDATA": ("ndata", _to_int),
+    "STREAM": ("stream", _to_str),
+    "UNITS": ("units", _to_str),
+    "PGA_CM/S^2": ("pga_cm_s2", _to_float),
+}
+
+
+@dataclass
+class AscHeader:
+    sampling_interval_s: float = DEFAULT_SAMPLING_INTERVAL_S
+    ndata: int = None
+    units: str = None
+    stream: str = None
+    network: str = None
+    station_code: str = None
+    station_name: str = None
+    station_latitude: float = None
+    station_longitude: float = None
+    station_elevation_m: float = None
+    location: str = None
+    vs30: float = None
+    epicentral_distance_km: float = None
+    event_name: str = None
+    event_id: str = None
+    event_date: str = None
+    event_time: str = None
+    event_latitude: float = None
+    event_longitude: float = None
+    event_depth_km: float = None
+    magnitude_w: float = None
+    magnitude_l: float = None
+    first_sample_time: str = None
+    pga_cm_s2: float = None
+    fields: dict = field(default_factory=dict)  # every raw KEY: value pair
+
+    @property
+    def sampling_rate(self):
+        return 1.0 / self.sampling_interval_s
+
+    @classmethod
+    def from_fields(cls, fields):
+        kwargs = {}
+        for key, (attr, convert) in _HEADER_FIELDS.items():
+            value = convert(fields.get(key))
+            if value is not None:
+                kwargs[attr] = value
+        if kwargs.get("sampling_interval_s", 1.0) <= 0:
+            kwargs.pop("sampling_interval_s")
+        return cls(fields=dict(fields), **kwargs)
+
+
+@dataclass
+class AscRecord:
+    path: str
+    header: AscHeader
+    data: np.ndarray
+
+    @property
+    def dt(self):
+        return self.header.sampling_interval_s
+
+    @property
+    def n_samples(self):
+        return int(self.data.shape[-1])
+
+    @property
+    def duration(self):
+        return self.n_samples * self.dt
+
+    @property
+    def time(self):
+        return np.arange(self.n_samples) * self.dt
+
+
+def _is_number(line):
+    try:
+        float(line)
+        return True
+    except ValueError:
+        return False
+
+
+def _parse_samples(text):
+    """Samples of whole lines of text; lines with a non-numeric token are skipped.
+
+    The bulk parser handles clean blocks; a block with a stray trailer or
+    comment line falls back to line-by-line parsing, as the old loader did.
+    """
+    try:
+        with warnings.catch_warnings():
+            # NumPy 1.x warns and truncates instead of raising
+            warnings.simplefilter("error", DeprecationWarning)
+            return np.fromstring(text, dtype=np.float64, sep=" ")
+    except (ValueError, DeprecationWarning):
+        pass
+    values = []
+    for line in text.splitlines():
+        try:
+            row = [float(token) for token in line.split()]
+        except ValueError:
+            continue
+        values.extend(row)
+    return np.array(values, dtype=np.float64)
+
+
+def _parse_header(lines):
+    """``(fields, offset)`` from lines with their line ends (``str`` or ``bytes``)."""
+    fields = {}
+    offset = 0
+    for line in lines:
+        text = line.decode("utf-8", errors="replace") if isinstance(line, bytes) else line
+        stripped = text.strip()
+        if stripped and _is_number(stripped.split()[0]):
+            break
+        offset += len(line)
+        if ":" in stripped:
+            key, value = stripped.split(":", 1)
+            fields[key.strip()] = value.strip()
+    return fields, offset
+
+
+def split_header(text):
+    """Return ``(fields, offset)`` where ``offset`` is where the samples start."""
+    return _parse_header(text.splitlines(keepends=True))
+
+
+class AscStream:
+    """Sample blocks of an ``.asc`` file, read ``chunk_bytes`` of text at a time.
+
+    Memory stays bounded by the chunk size whatever the record length.
+    ``fraction`` tells how much of the file has been consumed so far.
+    """
+
+    def __init__(self, path, chunk_bytes=CHUNK_BYTES):
+        self.path = path
+        self.chunk_bytes = chunk_bytes
+        self.size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            fields, self.data_offset = _parse_header(iter(f.readline, b""))
+        self.header = AscHeader.from_fields(fields)
+        self.bytes_read = self.data_offset
+
+    @property
+    def fraction(self):
+        return self.bytes_read / self.size if self.size else 1.0
+
+    def __iter__(self):
+        with open(self.path, "rb") as f:
+            f.seek(self.data_offset)
+            carry = b""
+            while True:
+                chunk = f.read(self.chunk_bytes)
+                if not chunk:
+                    break
+                # A chunk may end in the middle of a number; the tail waits for the next one
+                chunk = carry + chunk
+                cut = chunk.rfind(b"\n") + 1
+                carry = chunk[cut:]
+                self.bytes_read = f.tell() - len(carry)
+                block = _parse_samples(chunk[:cut].decode("ascii", errors="replace"))
+                if block.size:
+                    yield block
+            block = _parse_samples(carry.decode("ascii", errors="replace"))
+            self.bytes_read = self.size
+            if block.size:
+                yield block
+
+
+def read_asc(path, progress=None):
+    """Parse one ``.asc`` file into an :class:`AscRecord`.
+
+    The text is parsed chunk by chunk (see :class:`AscStream`) straight into
+    the sample array; ``progress(fraction)`` is called after every chunk.
+    """
+    stream = AscStream(path)
+    header = stream.header
+    blocks = []
+    for block in stream:
+        blocks.append(block)
+        if progress is not None:
+            progress(stream.fraction)
+    data = np.concatenate(blocks) if blocks else np.empty(0)
+    if data.size == 0:
+        raise ValueError("No valid numeric data found.")
+    if header.ndata is not None and header.ndata != data.size:
+        print(f"[WARN] {os.path.basename(path)}: NDATA={header.ndata} but {data.size} samples read.")
+    return AscRecord(path=path, header=header, data=data)
+
+
+class SidecarCache:
+    """Binary sidecars for parsed records, invalidated by source mtime/size.
+
+    ``cache_dir`` defaults to ``$QUAKESENSE_CACHE_DIR`` or ``.asc_cache``.
+    ``dtype`` may be ``float32`` to halve the cache size; loaded samples are
+    read-only memory maps either way.
+    """
+
+    def __init__(self, cache_dir=None, dtype=np.float64):
+        self.cache_dir = cache_dir or os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+        self.dtype = np.dtype(dtype)
+
+    def _paths(self, path):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        digest = hashlib.sha1(path.encode("utf-8")).hexdigest()[:12]
+        base = os.path.join(self.cache_dir, f"{stem}.{digest}")
+        return base + ".json", base + ".npy"
+
+    @staticmethod
+    def _source_info(stat):
+        return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    def load(self, path, stat):
+        meta_path, npy_path = self._paths(path)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (meta.get("version") != SIDECAR_VERSION
+                or meta.get("source") != self._source_info(stat)
+                or meta.get("dtype") != self.dtype.str):
+            return None
+
+        try:
+            data = np.load(npy_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        header = AscHeader.from_fields(meta["fields"])
+        return AscRecord(path=path, header=header, data=data)
+
+    def store(self, record, stat):
+        meta_path, npy_path = self._paths(record.path)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # The .json is written last and acts as the commit marker, so a
+        # half-written .npy is never picked up.
+        tmp_npy = npy_path + ".tmp.npy"
+        np.save(tmp_npy, np.ascontiguousarray(record.data, dtype=self.dtype))
+        os.replace(tmp_npy, npy_path)
+
+        meta = {
+            "version": SIDECAR_VERSION,
+            "source_path": record.path,
+            "source": self._source_info(stat),
+            "dtype": self.dtype.str,
+            "fields": record.header.fields,
+        }
+        tmp_meta = meta_path + ".tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_meta, meta_path)
+
+    def invalidate(self, path):
+        for cache_path in self._paths(os.path.abspath(path)):
+            try:
+                os.remove(cache_path)
+            except FileNotFoundError:
+                pass
+
+
+class RecordStore:
+    """Bounded LRU of parsed records keyed by ``(path, mtime)``.
+
+    Misses fall through to ``sidecar`` (when given) before parsing text.
+    The store is shared with worker threads, so all access is locked.
+    """
+
+    def __init__(self, max_records=8, sidecar=None):
+        self.max_records = max_records
+        self.sidecar = sidecar
+        self._records = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, path, progress=None):
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns)
+        with self._lock:
+            record = self._records.get(key)
+            if record is not None:
+                self._records.move_to_end(key)
+                return record
+
+            record = self._load(path, stat, progress)
+            # A newer mtime makes any older entry for the same file unreachable.
+            for stale in [k for k in self._records if k[0] == path]:
+                del self._records[stale]
+            self._records[key] = record
+            while len(self._records) > self.max_records:
+                self._records.popitem(last=False)
+            return record
+
+    def read(self, path, progress=None):
+        """Parse ``path`` through the sidecar without keeping it in the LRU.
+
+        For bulk jobs (every station of an event) that would otherwise flush
+        the records the pages are showing and serialise on the store lock.
+        """
+        path = os.path.abspath(path)
+        return self._load(path, os.stat(path), progress)
+
+    def _load(self, path, stat, progress=None):
+        if self.sidecar is None:
+            return read_asc(path, progress)
+
+        record = self.sidecar.load(path, stat)
+        if record is not None:
+            return record
+
+        record = read_asc(path, progress)
+        try:
+            self.sidecar.store(record, stat)
+        except OSError as e:
+            print(f"[WARN] Could not write sidecar cache for {os.path.basename(path)}: {e}")
+        return record
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def __len__(self):
+        return len(self._records)
+
+
+record_store = RecordStore(sidecar=SidecarCache())
+
+
+def load_record(path=DEFAULT_ASC_FILE, progress=None):
+    return record_store.get(path, progress)
@@ -0,0 +1,59 @@
+"""``quakesense://`` URL scheme for QtWebEngine (see ``map_assets``).
+
+``register_scheme()`` must run before the ``QApplication`` is created;
+``install_handler()`` attaches the handler to the default profile and may
+be called any number of times afterwards.
+"""
+
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QUrl
+from PyQt5.QtWebEngineCore import QWebEngineUrlRequestJob, QWebEngineUrlScheme, QWebEngineUrlSchemeHandler
+from PyQt5.QtWebEngineWidgets import QWebEngineProfile
+
+from map_assets import ASSET_HOST, ONLINE_TILE_URL, SCHEME, TILE_HOST, guess_mime, online_url, read_asset, read_tile
+
+
+def register_scheme():
+    scheme = QWebEngineUrlScheme(SCHEME.encode())
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    scheme.setFlags(QWebEngineUrlScheme.SecureScheme | QWebEngineUrlScheme.LocalScheme
+                    | QWebEngineUrlScheme.LocalAccessAllowed | QWebEngineUrlScheme.CorsEnabled)
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+class AssetSchemeHandler(QWebEngineUrlSchemeHandler):
+    """Serves bundled assets and cached tiles; anything missing is redirected online."""
+
+    def requestStarted(self, job):
+        url = job.requestUrl()
+        host, path = url.host(), url.path()
+        if host == ASSET_HOST:
+            data, fallback = read_asset(path), online_url(path)
+        elif host == TILE_HOST:
+            try:
+                z, x, y = (int(part) for part in path.strip("/").rsplit(".", 1)[0].split("/"))
+            except ValueError:
+                job.fail(QWebEngineUrlRequestJob.UrlInvalid)
+                return
+            data, fallback = read_tile(z, x, y), ONLINE_TILE_URL.format(z=z, x=x, y=y)
+        else:
+            job.fail(QWebEngineUrlRequestJob.UrlNotFound)
+            return
+
+        if data is None:
+            job.redirect(QUrl(fallback))
+            return
+        buffer = QBuffer(job)
+        buffer.setData(QByteArray(data))
+        buffer.open(QIODevice.ReadOnly)
+        job.reply(guess_mime(path).encode(), buffer)
+
+
+_handler = None
+
+
+def install_handler():
+    global _handler
+    if _handler is None:
+        _handler = AssetSchemeHandler()
+        QWebEngineProfile.defaultProfile().installUrlSchemeHandler(SCHEME.encode(), _handler)
+    return _handler
@@ -0,0 +1,210 @@
+"""Headless batch computation of intensity measures for AFAD ``.asc`` records.
+
+    python batch_measures.py records/ -o im_table.csv
+    python batch_measures.py "archive/2023*/**/*.asc" -o im_table.parquet --workers 16
+    python batch_measures.py records/ --groups --periods 0.2 1.0 -o rotd_table.csv
+
+Every input file is one component of one station; the output table has one
+row per file, or with ``--groups`` one row per station and event with the
+N/E/Z peaks and the RotD50/RotD100 PGA and spectral accelerations. Records are spread over a process pool in chunks so that
+large archives keep all cores busy without per-file scheduling overhead.
+
+Records are parsed from text and not kept: a batch run writes no sidecar
+caches unless ``--cache-dir`` names a folder for them, since caching a
+whole archive would quietly duplicate it on disk.
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import glob
+import os
+import sys
+import time
+
+import pandas as pd
+
+from asc_reader import RecordStore, SidecarCache, read_asc
+from intensity_measures import compute_intensity_measures
+from preprocessing import DEFAULT_CORNER_FREQ
+from record_groups import COMPONENTS, component_of, find_groups
+from rotd import ROTD_PERCENTILES, rotd_measures
+
+DEFAULT_ROTD_PERIODS = [0.2, 1.0]
+
+# Sidecar klasörü -> okuyucu (işçi süreç başına bir kez kurulur)
+_readers = {}
+
+COLUMNS = [
+    "file", "event_id", "event_name", "station_code", "component", "stream", "units",
+    "dt_s", "n_samples", "pga_cm_s2", "pgv_cm_s", "pgd_cm", "bracketed_duration_s",
+    "bracket_start_s", "bracket_end_s", "site_frequency_hz", "arias_intensity_m_s", "error",
+]
+
+
+def find_records(inputs, recursive=False):
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            pattern = os.path.join(item, "**", "*.asc") if recursive else os.path.join(item, "*.asc")
+            paths.extend(glob.glob(pattern, recursive=recursive))
+        else:
+            paths.extend(glob.glob(item, recursive=True))
+    # Keep the order stable and drop duplicates from overlapping patterns
+    return sorted(set(os.path.abspath(p) for p in paths))
+
+
+def record_reader(cache_dir=None):
+    """``read_asc``, or a reader through sidecars in ``cache_dir`` (no in-memory LRU)."""
+    if cache_dir is None:
+        return read_asc
+    if cache_dir not in _readers:
+        _readers[cache_dir] = RecordStore(sidecar=SidecarCache(cache_dir)).read
+    return _readers[cache_dir]
+
+
+def measure_record(path, corner_freq=DEFAULT_CORNER_FREQ, cache_dir=None):
+    row = {"file": path}
+    try:
+        record = record_reader(cache_dir)(path)
+        header = record.header
+        row.update({
+            "event_id": header.event_id,
+            "event_name": header.event_name,
+            "station_code": header.station_code,
+            "component": component_of(path, header),
+            "stream": header.stream,
+            "units": header.units,
+            "dt_s": record.dt,
+            "n_samples": record.n_samples,
+        })
+        measures = compute_intensity_measures(record.data, record.dt, corner_freq)
+        row.update({key: float(value) for key, value in measures.items()})
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def group_columns(periods=DEFAULT_ROTD_PERIODS):
+    columns = ["event_id", "station_code", "components", "dt_s", "n_samples"]
+    columns += [f"pga_{c.lower()}_cm_s2" for c in COMPONENTS]
+    columns += [f"pga_rotd{nn}_cm_s2" for nn in ROTD_PERCENTILES]
+    columns += [f"sa_rotd{nn}_{period:g}s_cm_s2" for nn in ROTD_PERCENTILES for period in periods]
+    return columns + ["error"]
+
+
+def measure_group(group, corner_freq=DEFAULT_CORNER_FREQ, periods=DEFAULT_ROTD_PERIODS, cache_dir=None):
+    row = {"event_id": group.event_id, "station_code": group.station_code, "components": "".join(group.components)}
+    try:
+        records = group.load(record_reader(cache_dir))
+        row.update({"dt_s": records.dt, "n_samples": records.n_samples})
+        # Üç bileşen tek seferde işlenir
+        pga = compute_intensity_measures(records.data, records.dt, corner_freq)["pga_cm_s2"]
+        row.update({f"pga_{c.lower()}_cm_s2": float(v) for c, v in zip(records.components, pga)})
+        rotd = rotd_measures(records.horizontal, records.dt, periods, corner_freq=corner_freq)
+        for nn in ROTD_PERCENTILES:
+            row[f"pga_rotd{nn}_cm_s2"] = rotd[f"pga_rotd{nn}"]
+            row.update({f"sa_rotd{nn}_{period:g}s_cm_s2": float(v) for period, v in zip(periods, rotd[f"sa_rotd{nn}"])})
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def _measure_job(args):
+    path, corner_freq, cache_dir = args
+    return measure_record(path, corner_freq, cache_dir)
+
+
+def _measure_group_job(args):
+    group, corner_freq, periods, cache_dir = args
+    return measure_group(group, corner_freq, periods, cache_dir)
+
+
+def _run(job, jobs, workers, chunksize, progress):
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        # A few chunks per worker balances load without per-file IPC
+        chunksize = max(1, len(jobs) // (workers * 4))
+    if workers == 1:
+        return _collect(map(job, jobs), len(jobs), progress)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return _collect(pool.map(job, jobs, chunksize=chunksize), len(jobs), progress)
+
+
+def run_batch(paths, workers=None, chunksize=None, corner_freq=DEFAULT_CORNER_FREQ, cache_dir=None, progress=True):
+    jobs = [(path, corner_freq, cache_dir) for path in paths]
+    df = pd.DataFrame(_run(_measure_job, jobs, workers, chunksize, progress), columns=COLUMNS)
+    df["n_samples"] = df["n_samples"].astype("Int64")
+    return df
+
+
+def run_groups(paths, workers=None, chunksize=None, corner_freq=DEFAULT_CORNER_FREQ, periods=DEFAULT_ROTD_PERIODS,
+               cache_dir=None, progress=True):
+    jobs = [(group, corner_freq, list(periods), cache_dir) for group in find_groups(paths)]
+    df = pd.DataFrame(_run(_measure_group_job, jobs, workers, chunksize, progress), columns=group_columns(periods))
+    df["n_samples"] = df["n_samples"].astype("Int64")
+    return df
+
+
+def _collect(results, total, progress):
+    rows = []
+    step = max(1, total // 20)
+    for i, row in enumerate(results, start=1):
+        rows.append(row)
+        if progress and (i % step == 0 or i == total):
+            print(f"\r{i}/{total} records", end="", file=sys.stderr, flush=True)
+    if progress and total:
+        print(file=sys.stderr)
+    return rows
+
+
+def write_table(df, output, fmt=None):
+    fmt = fmt or ("parquet" if output.lower().endswith((".parquet", ".pq")) else "csv")
+    if fmt == "parquet":
+        try:
+            df.to_parquet(output, index=False)
+        except ImportError as e:
+            raise SystemExit(f"[ERROR] Parquet output needs pyarrow or fastparquet: {e}")
+    else:
+        df.to_csv(output, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute intensity measures for a directory or glob of AFAD .asc records.")
+    parser.add_argument("inputs", nargs="+", help="directories, files or glob patterns")
+    parser.add_argument("-o", "--output", default="intensity_measures.csv", help="output .csv or .parquet path")
+    parser.add_argument("--format", choices=["csv", "parquet"], help="override the format implied by --output")
+    parser.add_argument("-r", "--recursive", action="store_true", help="search directories recursively")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=None, help="records per scheduling chunk")
+    parser.add_argument("--corner-freq", type=float, default=DEFAULT_CORNER_FREQ, help="high-pass corner frequency in Hz")
+    parser.add_argument("--groups", action="store_true", help="one row per station/event with RotD50/RotD100 measures")
+    parser.add_argument("--periods", type=float, nargs="+", default=DEFAULT_ROTD_PERIODS,
+                        help="spectral periods in s for the RotD columns (with --groups)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="read and write .npy sidecar caches in this folder (default: no caches)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress output")
+    args = parser.parse_args(argv)
+
+    paths = find_records(args.inputs, recursive=args.recursive)
+    if not paths:
+        print("[ERROR] No .asc records matched the given inputs.", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    if args.groups:
+        df = run_groups(paths, workers=args.workers, chunksize=args.chunksize, corner_freq=args.corner_freq,
+                        periods=args.periods, cache_dir=args.cache_dir, progress=not args.quiet)
+    else:
+        df = run_batch(paths, workers=args.workers, chunksize=args.chunksize, corner_freq=args.corner_freq,
+                       cache_dir=args.cache_dir, progress=not args.quiet)
+    write_table(df, args.output, args.format)
+
+    failed = int(df["error"].notna().sum())
+    if not args.quiet:
+        print(f"💾 {len(df)} rows written to {args.output} in {time.perf_counter() - start:.1f} s"
+              + (f" ({failed} failed)" if failed else ""))
+    return 0 if failed < len(df) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
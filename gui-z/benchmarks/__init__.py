@@ -0,0 +1,17 @@
+"""Performance benchmarks for QuakeSense (run from ``gui-z``).
+
+    python -m benchmarks run                   # full suite, timings stored in benchmarks/results/
+    python -m benchmarks run --quick "parse.*" # small sizes, matching cases only
+    python -m benchmarks run --compare         # exit 1 if slower than the latest stored run
+    python -m benchmarks compare [OLD NEW]     # two stored runs (default: the latest two)
+    python -m benchmarks list
+
+Inputs are synthetic (``synthetic``): AFAD ``.asc`` records of 10k-10M
+samples, event / station tables of 10-1M rows and events recorded by up
+to 300 stations, generated once into ``benchmarks/.data`` (or
+``$QUAKESENSE_BENCH_DATA``). The suite (``suite``) times ``.asc`` parsing
+and sidecar loads, the seven features, the per-station measures of a whole
+event, map generation and Agg rendering of the feature layouts. Every case
+reports the minimum and median of repeated runs; ``compare`` flags cases
+whose minimum grew by more than the threshold.
+"""
@@ -0,0 +1,71 @@
+import argparse
+import sys
+
+from .runner import (DEFAULT_THRESHOLD, MIN_TIME_S, compare, load_results, print_comparison, result_files,
+                     run_suite, save_results, selected_cases)
+from .suite import BENCHMARKS
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="QuakeSense performance benchmarks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run the suite and store the timings.")
+    run.add_argument("patterns", nargs="*", help="Only cases matching these globs / substrings (e.g. 'parse.*').")
+    run.add_argument("--quick", action="store_true", help="Small sizes only.")
+    run.add_argument("--min-time", type=float, default=MIN_TIME_S, help="Seconds spent per case (default %(default)s).")
+    run.add_argument("-o", "--output", help="Result file (default: results/<date>-<commit>.json).")
+    run.add_argument("--compare", nargs="?", const="latest", metavar="BASELINE",
+                     help="Compare with a result file (default: the latest stored one); exit 1 on regressions.")
+    run.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    cmp_ = sub.add_parser("compare", help="Compare two result files (default: the two latest).")
+    cmp_.add_argument("files", nargs="*", metavar="FILE")
+    cmp_.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    ls = sub.add_parser("list", help="List the benchmark cases.")
+    ls.add_argument("patterns", nargs="*")
+    ls.add_argument("--quick", action="store_true")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for name, _, _ in selected_cases(BENCHMARKS, args.patterns, args.quick):
+            print(name)
+        return 0
+
+    if args.command == "compare":
+        files = args.files or result_files()[-2:]
+        if len(files) != 2:
+            print("[ERROR] Need two result files to compare.")
+            return 2
+        old, new = (load_results(path) for path in files)
+        return 1 if print_comparison(old, new, compare(old, new, args.threshold), args.threshold) else 0
+
+    baseline = None
+    if args.compare:
+        stored = result_files()
+        if args.compare != "latest":
+            baseline = args.compare
+        elif stored:
+            baseline = stored[-1]
+        else:
+            print("[WARN] No stored results to compare with.")
+
+    cases = selected_cases(BENCHMARKS, args.patterns, args.quick)
+    if not cases:
+        print("[ERROR] No benchmark matches the given patterns.")
+        return 2
+    results = run_suite(cases, args.min_time)
+    path = save_results(results, args.quick, args.output)
+    print(f"💾 Results saved: {path}")
+
+    if baseline:
+        old, new = load_results(baseline), load_results(path)
+        if print_comparison(old, new, compare(old, new, args.threshold), args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""Timing, result files and regression comparison for the benchmark suite."""
+
+import contextlib
+import fnmatch
+import glob
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+RESULTS_VERSION = 1
+MIN_TIME_S = 0.5             # keep repeating a case until this much time is spent ...
+MIN_REPEATS = 3
+MAX_REPEATS = 50
+SINGLE_RUN_S = 5.0           # ... unless a single run already takes this long
+DEFAULT_THRESHOLD = 0.25     # min time this much slower than the baseline = regression
+NOISE_FLOOR_S = 1e-4         # differences below this are never flagged
+
+
+def time_call(func, min_time=MIN_TIME_S):
+    """``{min, median, repeats}`` seconds of ``func()``, after one untimed warm-up call."""
+    times = []
+    # Zamanlanan çağrıların çıktısı (ör. harita üretimi logları) bastırılır
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        func()
+        warmup = time.perf_counter() - start
+        repeats = 1 if warmup >= SINGLE_RUN_S else MAX_REPEATS
+        while len(times) < repeats and (len(times) < MIN_REPEATS or sum(times) < min_time):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times), "repeats": len(times)}
+
+
+def _git(*args):
+    try:
+        out = subprocess.run(["git", *args], capture_output=True, text=True, timeout=30,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() if out.returncode == 0 else None
+
+
+def commit_info():
+    commit = _git("rev-parse", "--short", "HEAD") or "unknown"
+    dirty = bool(_git("status", "--porcelain", "--untracked-files=no"))
+    return {"commit": commit, "dirty": dirty, "subject": _git("log", "-1", "--format=%s") or ""}
+
+
+def machine_info():
+    import numpy
+    import pandas
+    import matplotlib
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "matplotlib": matplotlib.__version__,
+    }
+
+
+def selected_cases(benchmarks, patterns=(), quick=False):
+    """``[(case name, benchmark, size)]`` whose name matches any of the glob ``patterns``."""
+    cases = []
+    for bench in benchmarks:
+        for name, size in bench.cases(quick):
+            if not patterns or any(fnmatch.fnmatch(name, p) or p in name for p in patterns):
+                cases.append((name, bench, size))
+    return cases
+
+
+def run_suite(cases, min_time=MIN_TIME_S):
+    """Run ``cases``; a failing case is reported and recorded with its error."""
+    results = {}
+    for name, bench, size in cases:
+        try:
+            func = bench.setup(size)
+            timing = time_call(func, min_time)
+        except Exception as e:
+            print(f"[ERROR] {name}: {type(e).__name__}: {e}")
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+            continue
+        results[name] = timing
+        print(f"{name:<48} {format_time(timing['min']):>10}  (median {format_time(timing['median'])},"
+              f" {timing['repeats']} runs)")
+    return results
+
+
+def format_time(seconds):
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def save_results(results, quick=False, path=None):
+    info = commit_info()
+    document = {
+        "version": RESULTS_VERSION,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        **info,
+        "quick": quick,
+        "machine": machine_info(),
+        "results": results,
+    }
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        suffix = "-dirty" if info["dirty"] else ""
+        path = os.path.join(RESULTS_DIR, f"{stamp}-{info['commit']}{suffix}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=1)
+    return path
+
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def result_files():
+    """Stored result files, oldest first."""
+    return sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))
+
+
+def compare(old, new, threshold=DEFAULT_THRESHOLD):
+    """``[(case, old min, new min, ratio, status)]`` for the cases both runs timed.
+
+    ``status`` is ``"regression"`` when the new minimum is more than
+    ``threshold`` slower, ``"improvement"`` when it is that much faster,
+    else ``""``.
+    """
+    rows = []
+    for name, timing in new["results"].items():
+        before = old["results"].get(name, {}).get("min")
+        after = timing.get("min")
+        if before is None or after is None:
+            continue
+        ratio = after / before if before > 0 else float("inf")
+        status = ""
+        if abs(after - before) >= NOISE_FLOOR_S:
+            if ratio > 1 + threshold:
+                status = "regression"
+            elif ratio < 1 / (1 + threshold):
+                status = "improvement"
+        rows.append((name, before, after, ratio, status))
+    return rows
+
+
+def print_comparison(old, new, rows, threshold=DEFAULT_THRESHOLD):
+    print(f"Baseline: {old.get('commit')} ({old.get('date')})  ->  {new.get('commit')} ({new.get('date')})")
+    if old.get("machine") != new.get("machine"):
+        print("[WARN] Results come from different machines or library versions; timings may not be comparable.")
+    for name, before, after, ratio, status in rows:
+        flag = {"regression": "  << REGRESSION", "improvement": "  improved"}.get(status, "")
+        print(f"{name:<48} {format_time(before):>10} -> {format_time(after):>10}  x{ratio:5.2f}{flag}")
+    regressions = [row for row in rows if row[4] == "regression"]
+    if regressions:
+        print(f"[WARN] {len(regressions)} case(s) more than {threshold:.0%} slower than the baseline.")
+    else:
+        print(f"No regressions above {threshold:.0%} in {len(rows)} common case(s).")
+    return regressions
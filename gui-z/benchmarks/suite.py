@@ -0,0 +1,182 @@
+"""Benchmark definitions.
+
+Every benchmark is a setup function registered with :func:`benchmark` for a
+list of sizes. ``setup(size)`` prepares its inputs (synthetic files,
+loaded records, figures), which is not timed, and returns the callable
+that is timed. Heavy imports happen inside the setups, so listing the
+suite stays cheap.
+"""
+
+import os
+
+from .synthetic import catalog_path, data_dir, event_records, record_path, record_paths, stations_path
+
+RECORD_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+FEATURE_SIZES = [10_000, 100_000, 1_000_000]
+CATALOG_SIZES = [10, 1_000, 10_000, 100_000, 1_000_000]
+STATION_COUNTS = [10, 100, 300]
+QUICK_LIMIT = 100_000
+
+
+class Benchmark:
+    def __init__(self, name, setup, sizes, quick_sizes):
+        self.name = name
+        self.setup = setup
+        self.sizes = list(sizes)
+        self.quick_sizes = list(quick_sizes)
+
+    def cases(self, quick=False):
+        return [(f"{self.name}[{size}]", size) for size in (self.quick_sizes if quick else self.sizes)]
+
+
+BENCHMARKS = []
+
+
+def benchmark(name, sizes, quick_sizes=None):
+    """Register ``setup(size) -> callable`` as benchmark ``name``; ``--quick`` runs ``quick_sizes``."""
+    if quick_sizes is None:
+        quick_sizes = [size for size in sizes if size <= QUICK_LIMIT]
+
+    def register(setup):
+        BENCHMARKS.append(Benchmark(name, setup, sizes, quick_sizes))
+        return setup
+    return register
+
+
+# --- .asc okuma ---------------------------------------------------------------
+
+@benchmark("parse.read_asc", RECORD_SIZES)
+def parse_read_asc(n):
+    from asc_reader import read_asc
+    path = record_path(n)
+    return lambda: read_asc(path)
+
+
+@benchmark("parse.sidecar_load", RECORD_SIZES)
+def parse_sidecar_load(n):
+    from asc_reader import SidecarCache, read_asc
+    path = record_path(n)
+    stat = os.stat(path)
+    cache = SidecarCache(os.path.join(data_dir(), "sidecars"))
+    if cache.load(path, stat) is None:
+        cache.store(read_asc(path), stat)
+    # Bellek eşlemesini açmak ve örneklere bir kez dokunmak
+    return lambda: float(cache.load(path, stat).data.max())
+
+
+@benchmark("parse.stream_measures", RECORD_SIZES[1:], quick_sizes=[100_000])
+def parse_stream_measures(n):
+    from streaming import stream_measures
+    path = record_path(n)
+    return lambda: stream_measures(path)
+
+
+# --- Özellikler (kayıt bellekte) ------------------------------------------------
+
+def _feature_setup(index):
+    def setup(n):
+        from asc_reader import read_asc
+        from feature_compute import FEATURES
+        record = read_asc(record_paths(n)["N"])
+        return lambda: FEATURES[index](record)
+    return setup
+
+
+FEATURE_NAMES = ["motion", "fourier", "bracketed_duration", "site_frequency", "arias", "response_spectrum",
+                 "phase_arrivals"]
+# Tepki spektrumu periyot başına bir geçiş yapar; 1M örnekte tek ölçüm dakikalar sürer
+FEATURE_SIZE_LIMITS = {"response_spectrum": 100_000}
+
+for _index, _name in enumerate(FEATURE_NAMES):
+    _limit = FEATURE_SIZE_LIMITS.get(_name, FEATURE_SIZES[-1])
+    benchmark(f"features.{_name}", [n for n in FEATURE_SIZES if n <= _limit])(_feature_setup(_index))
+
+
+@benchmark("features.event_stations", STATION_COUNTS, quick_sizes=[10])
+def features_event_stations(n):
+    from station_measures import measure_event
+    patterns = [os.path.join(event_records(n), "*.asc")]
+    # İlk (zamanlanmayan) çağrı yan dosyaları yazar; ölçülen okuma + tüm istasyonların hesabı
+    return lambda: measure_event(f"EVENT{n}", patterns=patterns)
+
+
+# --- Haritalar --------------------------------------------------------------------
+
+@benchmark("maps.catalog_load", CATALOG_SIZES, quick_sizes=[10, 1_000, 10_000])
+def maps_catalog_load(n):
+    from event_catalog import EventCatalog
+    path = catalog_path(n)
+    return lambda: EventCatalog.from_csv(path)
+
+
+@benchmark("maps.density_bins", CATALOG_SIZES, quick_sizes=[10, 1_000, 10_000])
+def maps_density_bins(n):
+    from event_catalog import EventCatalog
+    from generate_turkey_map import build_density
+    catalog = EventCatalog.from_csv(catalog_path(n))
+    return lambda: build_density(catalog)
+
+
+@benchmark("maps.turkey_map_html", CATALOG_SIZES, quick_sizes=[10, 1_000, 10_000])
+def maps_turkey_map_html(n):
+    from event_catalog import EventCatalog
+    from generate_turkey_map import TURKEY_CENTER, TURKEY_ZOOM, DensityLayer, build_density
+    from map_assets import base_map, render
+    payload = build_density(EventCatalog.from_csv(catalog_path(n)))
+
+    def run():
+        m = base_map(TURKEY_CENTER, TURKEY_ZOOM)
+        DensityLayer(payload).add_to(m)
+        return render(m)
+    return run
+
+
+@benchmark("maps.station_registry", CATALOG_SIZES, quick_sizes=[10, 1_000, 10_000])
+def maps_station_registry(n):
+    from station_registry import StationRegistry
+    path = stations_path(n)
+    return lambda: StationRegistry.from_csv(path)
+
+
+@benchmark("maps.station_map_html", CATALOG_SIZES, quick_sizes=[10, 1_000, 10_000])
+def maps_station_map_html(n):
+    from generate_station_map import build_station_map
+    from map_assets import render
+    station_csv = stations_path(n)
+    events_csv = catalog_path(10)
+
+    def run():
+        m = build_station_map("1", station_csv, events_csv=events_csv)
+        return None if m is None else render(m)
+    return run
+
+
+# --- Agg çizimi -------------------------------------------------------------------
+
+def _render_setup(index, blit):
+    def setup(n):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        from asc_reader import read_asc
+        from feature_compute import FEATURES
+        from plot_decimation import DecimationManager
+        from plot_layouts import FigureLayouts
+        result = FEATURES[index](read_asc(record_paths(n)["N"]))
+        canvas = FigureCanvasAgg(Figure(figsize=(10, 6), dpi=100))
+        layouts = FigureLayouts(canvas, DecimationManager(canvas))
+        layouts.show(index, result)
+        if blit:
+            # Önbellekteki arka plan üzerine yalnızca değişen sanatçılar
+            return lambda: layouts.show(index, result)
+        return canvas.draw
+    return setup
+
+
+# Çizim maliyeti seyreltme sayesinde kayıt uzunluğundan bağımsız olmalı
+RENDER_SIZES = [10_000, 1_000_000]
+
+for _index, _name in enumerate(FEATURE_NAMES):
+    _sizes = [n for n in RENDER_SIZES if n <= FEATURE_SIZE_LIMITS.get(_name, RENDER_SIZES[-1])]
+    benchmark(f"render.draw.{_name}", _sizes, quick_sizes=[10_000])(_render_setup(_index, blit=False))
+    benchmark(f"render.blit.{_name}", _sizes, quick_sizes=[10_000])(_render_setup(_index, blit=True))
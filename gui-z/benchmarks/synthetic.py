@@ -0,0 +1,174 @@
+"""Synthetic AFAD inputs for the benchmarks.
+
+Records are DYNA 1.2 style ``.asc`` files (N/E/Z of one station, like an
+AFAD export) with a noise floor and one decaying strong-motion burst;
+catalogs and station tables follow the ``events.csv`` / ``stations.csv``
+columns with points scattered over Turkey. Every file is written once into
+the data directory and reused by later runs.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR_ENV = "QUAKESENSE_BENCH_DATA"
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data")
+DT = 0.01
+WRITE_BLOCK = 1 << 20
+GROUP_LIMIT = 1_000_000      # larger records are written as a single N component
+EVENT_RECORD_SAMPLES = 12_000    # 120 s per station record
+
+# Türkiye sınırlayıcı kutusu (enlem, boylam)
+LAT_RANGE = (36.0, 42.0)
+LON_RANGE = (26.0, 45.0)
+PROVINCES = ["Istanbul", "Izmir", "Ankara", "Kahramanmaras", "Malatya", "Van", "Duzce", "Hatay"]
+DISTRICTS = ["Merkez", "Silivri", "Bornova", "Cankaya", "Pazarcik", "Yesilyurt", "Ercis", "Antakya"]
+
+ASC_HEADER = """EVENT_NAME: BENCH{n}
+EVENT_ID: {event_id}
+EVENT_DATE_YYYYMMDD: 20250423
+EVENT_TIME_HHMMSS: 094910
+EVENT_LATITUDE_DEGREE: 40.86
+EVENT_LONGITUDE_DEGREE: 28.24444
+EVENT_DEPTH_KM: 6.92
+HYPOCENTER_REFERENCE: AFAD
+MAGNITUDE_W: 6.2
+MAGNITUDE_W_REFERENCE: AFAD
+NETWORK: TK
+STATION_CODE: {station}
+STATION_LATITUDE_DEGREE: 40.97466
+STATION_LONGITUDE_DEGREE: 28.83635
+STATION_ELEVATION_M: 30.0
+VS30_M/S: 420
+EPICENTRAL_DISTANCE_KM: 51.34
+DATE_TIME_FIRST_SAMPLE_YYYYMMDD_HHMMSS: 20250423_094853.000
+DATE_TIME_FIRST_SAMPLE_PRECISION: millisecond
+SAMPLING_INTERVAL_S: {dt}
+NDATA: {n}
+STREAM: HN{component}
+UNITS: cm/s^2
+PGA_CM/S^2: {pga:.3f}
+"""
+
+
+def data_dir():
+    path = os.environ.get(DATA_DIR_ENV) or DEFAULT_DATA_DIR
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def synthetic_trace(n, seed=0, dt=DT, amplitude=40.0):
+    """Acceleration (cm/s^2): noise floor plus one decaying burst after 10% of the record."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) * dt
+    onset = 0.1 * n * dt
+    decay = min(15.0, 0.2 * n * dt)
+    envelope = np.where(t >= onset, np.exp(-np.maximum(t - onset, 0.0) / decay), 0.0)
+    burst = np.sin(2 * np.pi * 1.7 * t) + 0.6 * np.sin(2 * np.pi * 4.3 * t + seed) + rng.standard_normal(n)
+    return 0.05 * rng.standard_normal(n) + amplitude * envelope * burst
+
+
+def write_asc(path, data, component, n_tag, dt=DT, event_id=None, station=None):
+    """Write ``data`` as an AFAD ``.asc`` file, one sample per line."""
+    header = ASC_HEADER.format(n=data.size, event_id=event_id or f"9{n_tag}", station=station or f"B{n_tag}",
+                               dt=dt, component=component, pga=float(np.max(np.abs(data))))
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(header)
+        for start in range(0, data.size, WRITE_BLOCK):
+            block = data[start:start + WRITE_BLOCK].tolist()
+            f.write("\n".join(map("{:.6f}".format, block)))
+            f.write("\n")
+    os.replace(tmp, path)
+
+
+def record_paths(n):
+    """``{component: path}`` of the synthetic record with ``n`` samples, written on first use."""
+    components = "NEZ" if n <= GROUP_LIMIT else "N"
+    paths = {}
+    for seed, component in enumerate(components):
+        path = os.path.join(data_dir(), f"bench_{n}_RawAcc_{component}.asc")
+        if not os.path.exists(path):
+            print(f"[BENCH] Writing {os.path.basename(path)} ...")
+            scale = 0.5 if component == "Z" else 1.0
+            write_asc(path, synthetic_trace(n, seed) * scale, component, n)
+        paths[component] = path
+    return paths
+
+
+def record_path(n):
+    return record_paths(n)["N"]
+
+
+def event_records(n_stations, n=EVENT_RECORD_SAMPLES):
+    """Folder with N/E/Z records of ``n_stations`` stations of one event (ID ``EVENT{n_stations}``)."""
+    folder = os.path.join(data_dir(), f"event_{n_stations}")
+    os.makedirs(folder, exist_ok=True)
+    for i in range(n_stations):
+        for seed, component in enumerate("NEZ"):
+            path = os.path.join(folder, f"S{i:04d}_RawAcc_{component}.asc")
+            if os.path.exists(path):
+                continue
+            if i == 0 and seed == 0:
+                print(f"[BENCH] Writing {n_stations} station records ...")
+            scale = 0.5 if component == "Z" else 1.0
+            write_asc(path, synthetic_trace(n, 3 * i + seed) * scale, component, n,
+                      event_id=f"EVENT{n_stations}", station=f"S{i:04d}")
+    return folder
+
+
+def _scatter(rng, n):
+    return rng.uniform(*LAT_RANGE, n).round(4), rng.uniform(*LON_RANGE, n).round(4)
+
+
+def catalog_path(n, seed=0):
+    """``events.csv`` with ``n`` events (Gutenberg-Richter magnitudes, b = 1)."""
+    path = os.path.join(data_dir(), f"events_{n}.csv")
+    if os.path.exists(path):
+        return path
+    print(f"[BENCH] Writing {os.path.basename(path)} ...")
+    rng = np.random.default_rng(seed)
+    lat, lon = _scatter(rng, n)
+    dates = np.datetime64("1990-01-01") + rng.integers(0, 35 * 365, n).astype("timedelta64[D]")
+    seconds = rng.integers(0, 86400, n)
+    pd.DataFrame({
+        "EventID": np.arange(1, n + 1),
+        "Date": pd.to_datetime(dates).strftime("%Y-%m-%d"),
+        "Time": [f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in seconds.tolist()],
+        "Latitude": lat,
+        "Longitude": lon,
+        "Depth": rng.uniform(0.0, 30.0, n).round(2),
+        "Magnitude": (2.0 + rng.exponential(1 / np.log(10), n)).round(1),
+        "Province": rng.choice(PROVINCES, n),
+        "District": rng.choice(DISTRICTS, n),
+    }).to_csv(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def stations_path(n, n_events=10, seed=1):
+    """``stations.csv`` with ``n`` stations recording events ``1..n_events``."""
+    path = os.path.join(data_dir(), f"stations_{n}.csv")
+    if os.path.exists(path):
+        return path
+    print(f"[BENCH] Writing {os.path.basename(path)} ...")
+    rng = np.random.default_rng(seed)
+    lat, lon = _scatter(rng, n)
+    pga = rng.lognormal(2.0, 1.0, (3, n)).round(3)
+    pd.DataFrame({
+        "EventID": rng.integers(1, n_events + 1, n),
+        "Code": [f"S{i:07d}" for i in range(n)],
+        "Latitude": lat,
+        "Longitude": lon,
+        "Province": rng.choice(PROVINCES, n),
+        "District": rng.choice(DISTRICTS, n),
+        "Litology": rng.choice(["Alluvium", "Rock", "Clay"], n),
+        "Vs30": rng.integers(150, 1200, n),
+        "Morphology": rng.choice(["Plain", "Hill", "Valley"], n),
+        "PGA_NS": pga[0],
+        "PGA_EW": pga[1],
+        "PGA_UD": pga[2],
+    }).to_csv(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+    return path
@@ -0,0 +1,111 @@
+"""Blitted hover crosshair for the plot layouts in ``GraphsPage``.
+
+On every mouse move the nearest sample of each hovered line is found with
+``np.searchsorted`` on its (monotonic) x array, so the cost per event does
+not depend on the record length. Axes that share the x axis with the one
+under the mouse (the three motion panels) get a crosshair and a readout at
+the same time. Everything is drawn as animated artists over a cached
+background and blitted, so hovering never triggers a full figure draw.
+"""
+
+import numpy as np
+
+
+def nearest_index(x, value):
+    """Index of the sample of the sorted array ``x`` closest to ``value``."""
+    i = int(np.searchsorted(x, value))
+    if i <= 0:
+        return 0
+    if i >= len(x):
+        return len(x) - 1
+    return i - 1 if value - x[i - 1] <= x[i] - value else i
+
+
+class Crosshair:
+    def __init__(self, canvas, layouts):
+        self.canvas = canvas
+        self.figure = canvas.figure
+        self.layouts = layouts
+        self._background = None
+        self._artists = {}        # ax -> (vline, readout, {line: marker})
+        self._last = None         # (ax, x) of the last hover position
+        canvas.mpl_connect("motion_notify_event", self._on_move)
+        canvas.mpl_connect("axes_leave_event", lambda event: self.hide())
+        canvas.mpl_connect("figure_leave_event", lambda event: self.hide())
+        canvas.mpl_connect("draw_event", self._on_draw)
+        layouts.rendered.append(self._on_rendered)
+
+    def hide(self):
+        if self._last is None:
+            return
+        self._last = None
+        if self._background is not None:
+            self.canvas.restore_region(self._background)
+            self.canvas.blit(self.figure.bbox)
+
+    def _on_draw(self, event):
+        # The layout manager's own background pass is incomplete; its
+        # rendered callback captures the finished frame instead
+        if self.layouts.capturing:
+            return
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        if self._last is not None:
+            self._draw(*self._last)
+
+    def _on_rendered(self, layout):
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        if self._last is not None and self._last[0] in layout.axes:
+            self._draw(*self._last)
+            self.canvas.blit(self.figure.bbox)
+        else:
+            self._last = None
+
+    def _on_move(self, event):
+        layout = self.layouts.active
+        if (layout is None or not layout.hover_data or self._background is None
+                or event.inaxes not in layout.axes or self.canvas.widgetlock.locked()):
+            self.hide()
+            return
+        self._last = (event.inaxes, event.xdata)
+        self.canvas.restore_region(self._background)
+        self._draw(event.inaxes, event.xdata)
+        self.canvas.blit(self.figure.bbox)
+
+    def _draw(self, hovered, x):
+        layout = self.layouts.active
+        shared = hovered.get_shared_x_axes()
+        for ax in layout.axes:
+            lines = [line for line in layout.hover_lines if line.axes is ax and line in layout.hover_data]
+            if not lines or not (ax is hovered or shared.joined(ax, hovered)):
+                continue
+            vline, readout, markers = self._artists_for(ax, lines)
+
+            rows = []
+            sample_x = x
+            for line in lines:
+                xs, ys = layout.hover_data[line]
+                i = nearest_index(xs, x)
+                sample_x = xs[i]
+                markers[line].set_data([xs[i]], [ys[i]])
+                self.figure.draw_artist(markers[line])
+                name = line.get_label()
+                rows.append(f"{'value' if name.startswith('_') else name}={ys[i]:.2f}")
+
+            vline.set_xdata([sample_x, sample_x])
+            readout.set_text("\n".join([f"{layout.hover_xname}={sample_x:.2f}"] + rows))
+            self.figure.draw_artist(vline)
+            self.figure.draw_artist(readout)
+
+    def _artists_for(self, ax, lines):
+        if ax not in self._artists:
+            vline, = ax.plot([0, 0], [0, 1], color="gray", linewidth=0.8, transform=ax.get_xaxis_transform(),
+                             scalex=False, scaley=False, animated=True)
+            readout = ax.text(0.01, 0.97, "", transform=ax.transAxes, ha="left", va="top", fontsize=8,
+                              bbox=dict(boxstyle="round", facecolor="white", alpha=0.8), animated=True)
+            self._artists[ax] = (vline, readout, {})
+        vline, readout, markers = self._artists[ax]
+        for line in lines:
+            if line not in markers:
+                markers[line], = ax.plot([], [], "o", markersize=4, color=line.get_color(),
+                                         scalex=False, scaley=False, animated=True)
+        return vline, readout, markers
@@ -0,0 +1,148 @@
+"""Indexed, in-memory earthquake event catalog (``events.csv``).
+
+The CSV is read once per file version. Lookups by EventID go through a
+hash index, typeahead through a case-insensitive sorted ID index
+(``np.searchsorted`` gives the matching slice in O(log n)), and the
+date / magnitude / region filters are vectorised masks over that slice.
+Results are arrays of row positions, so a view can show them lazily
+without copying rows.
+"""
+
+import os
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_EVENTS_FILE = "events.csv"
+COLUMNS = ["EventID", "Date", "Time", "Latitude", "Longitude", "Depth", "Magnitude", "Province", "District"]
+
+# Sorts after every character, so prefix + PREFIX_END bounds all IDs starting with prefix
+PREFIX_END = "\U0010ffff"
+
+
+def fold(text):
+    """Case- and accent-insensitive key, so "izmir" and "IZMIR" match "İzmir"."""
+    text = unicodedata.normalize("NFKD", str(text).strip().casefold())
+    return "".join(c for c in text if not unicodedata.combining(c)).replace("ı", "i")
+
+
+def _factorize_folded(values):
+    """Codes, sorted folded keys and key -> display name for a text column.
+
+    Folding runs once per distinct value rather than once per row.
+    """
+    raw_codes, raw_names = pd.factorize(values.fillna("").astype(str).str.strip())
+    folded_codes, keys = pd.factorize(pd.Index([fold(name) for name in raw_names]), sort=True)
+    names = dict(zip((keys[code] for code in folded_codes), raw_names))
+    return folded_codes[raw_codes], keys, names
+
+
+class EventCatalog:
+    def __init__(self, df):
+        df = df.copy()
+        df["EventID"] = df["EventID"].astype(str).str.strip()
+        df = df[df["EventID"] != ""].reset_index(drop=True)
+        self.df = df
+        self.ids = df["EventID"].to_numpy(dtype=str)
+
+        # Hash index: EventID -> row position; filled back to front so the
+        # first occurrence of a duplicated ID wins
+        n = len(self.ids)
+        self._positions = dict(zip(self.ids[::-1].tolist(), range(n - 1, -1, -1)))
+
+        # Sorted prefix index over the case-folded IDs
+        keys = np.char.lower(self.ids) if len(self.ids) else self.ids
+        self.order = np.argsort(keys, kind="stable")
+        self._keys = keys[self.order]
+
+        self.dates = pd.to_datetime(df["Date"], errors="coerce").to_numpy(dtype="datetime64[D]")
+        self.magnitudes = pd.to_numeric(df["Magnitude"], errors="coerce").to_numpy(dtype=float)
+        self._province_codes, self._provinces, self._province_names = _factorize_folded(df["Province"])
+        self._district_codes, self._districts, _ = _factorize_folded(df["District"])
+
+    @classmethod
+    def from_csv(cls, path=DEFAULT_EVENTS_FILE):
+        return cls(pd.read_csv(path, encoding="utf-8"))
+
+    @classmethod
+    def empty(cls):
+        return cls(pd.DataFrame(columns=COLUMNS))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, event_id):
+        return str(event_id).strip() in self._positions
+
+    def position(self, event_id):
+        return self._positions.get(str(event_id).strip())
+
+    def row(self, event_id):
+        """The catalog row of ``event_id`` as a Series, or None if unknown."""
+        pos = self.position(event_id)
+        return None if pos is None else self.df.iloc[pos]
+
+    def regions(self):
+        """Province names in alphabetical order, as written in the catalog."""
+        return [self._province_names[key] for key in self._provinces if key]
+
+    def date_range(self):
+        valid = self.dates[~np.isnat(self.dates)]
+        if not valid.size:
+            return None, None
+        return valid.min(), valid.max()
+
+    def prefix_positions(self, prefix):
+        """Row positions of every ID starting with ``prefix`` (case-insensitive), in ID order."""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return self.order
+        lo = np.searchsorted(self._keys, prefix, side="left")
+        hi = np.searchsorted(self._keys, prefix + PREFIX_END, side="left")
+        return self.order[lo:hi]
+
+    def filter(self, prefix="", date_from=None, date_to=None, min_magnitude=None, max_magnitude=None, region=None):
+        """Row positions matching all given criteria, in ID order.
+
+        ``region`` matches a province or district name (see :func:`fold`).
+        Events with a missing date or magnitude drop out of that filter.
+        """
+        positions = self.prefix_positions(prefix)
+        mask = None
+
+        def narrow(condition):
+            nonlocal mask
+            mask = condition if mask is None else mask & condition
+
+        if date_from is not None:
+            narrow(self.dates[positions] >= np.datetime64(date_from, "D"))
+        if date_to is not None:
+            narrow(self.dates[positions] <= np.datetime64(date_to, "D"))
+        if min_magnitude is not None:
+            narrow(self.magnitudes[positions] >= min_magnitude)
+        if max_magnitude is not None:
+            narrow(self.magnitudes[positions] <= max_magnitude)
+        if region:
+            key = fold(region)
+            province = self._provinces.get_indexer([key])[0]
+            district = self._districts.get_indexer([key])[0]
+            narrow(((self._province_codes[positions] == province) & (province >= 0))
+                   | ((self._district_codes[positions] == district) & (district >= 0)))
+        return positions if mask is None else positions[mask]
+
+
+_catalogs = {}
+
+
+def load_catalog(path=DEFAULT_EVENTS_FILE):
+    """Shared catalog for ``path``; re-read only when the file changes on disk."""
+    try:
+        key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+        if key not in _catalogs:
+            _catalogs.clear()
+            _catalogs[key] = EventCatalog.from_csv(path)
+        return _catalogs[key]
+    except Exception as e:
+        print(f"[ERROR] Failed to load event catalog: {e}")
+        return EventCatalog.empty()
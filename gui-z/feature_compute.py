@@ -0,0 +1,182 @@
+"""Feature computations behind ``GraphsPage``.
+
+Everything here is plain NumPy and safe to run on a worker thread: each
+``compute_*`` function takes an :class:`asc_reader.AscRecord` and returns a
+dict of finished arrays/scalars that the page only has to draw.
+
+Records larger than ``STREAM_BYTES`` are not loaded at all for the
+time-domain features: ``stream_*`` variants walk the file block by block
+(see :mod:`streaming`) and return min/max envelopes of the traces.
+"""
+
+import os
+
+import numpy as np
+
+from asc_reader import load_record
+from hvsr import hvsr, smoothed_spectrum
+from intensity_measures import arias_intensity, bracketed_duration, peak
+from phase_picker import DEFAULT_LTA_S, DEFAULT_STA_S, pick_phases
+from preprocessing import DEFAULT_CORNER_FREQ, integrate_motion, preprocess_boore
+from profiling import span
+from record_groups import group_of
+from spectral_engine import DEFAULT_WINDOW, spectrum, stft, welch_average
+from response_spectrum import DEFAULT_DAMPING, DEFAULT_PERIODS, response_spectrum
+from streaming import stream_motion
+
+STREAM_BYTES = 64 << 20
+DEFAULT_STFT_WINDOW_S = 2.56
+DEFAULT_OVERLAP = 0.5
+
+
+def compute_motion(record, corner_freq=DEFAULT_CORNER_FREQ):
+    raw_signal = np.asarray(record.data)
+    dt = record.dt
+    t = np.arange(len(raw_signal)) * dt
+
+    # Raw and preprocessed traces go through the batch engine together
+    both = np.stack([raw_signal, preprocess_boore(raw_signal, 1.0 / dt, corner_freq)])
+    vel, disp = integrate_motion(both, dt)
+    return {
+        "t": t,
+        "acc": (both[0], both[1]),
+        "vel": (vel[0], vel[1]),
+        "disp": (disp[0], disp[1]),
+        "corner_freq": corner_freq,
+    }
+
+
+def compute_fourier(record):
+    result = spectrum(record.data, record.dt)
+    return {"freq": result.freqs, "amplitude": result.amplitude, "phase": result.phase}
+
+
+def _bracket(start, end):
+    """``(start, end)`` as floats, or ``(None, None)`` when nothing exceeds the threshold."""
+    if np.isnan(start):
+        return None, None
+    return float(start), float(end)
+
+
+def compute_bracketed_duration(record, bracket_fraction=0.05, corner_freq=DEFAULT_CORNER_FREQ):
+    """Preprocessed trace and its bracket at ``bracket_fraction * PGA``, as in :func:`intensity_measures`."""
+    acc = preprocess_boore(np.asarray(record.data), 1.0 / record.dt, corner_freq)
+    _, start, end = bracketed_duration(acc, record.dt, bracket_fraction * peak(acc))
+    start, end = _bracket(start, end)
+    return {"t": record.time, "acc": acc, "start": start, "end": end}
+
+
+def compute_site_frequency(record):
+    """H/V spectral ratio when the N/E/Z files of the record are all present,
+    otherwise the smoothed spectrum of this component alone."""
+    try:
+        group = group_of(record.path)
+    except OSError:
+        group = None
+    if group is not None and group.complete:
+        records = group.load()
+        result = hvsr(records.data, records.dt)
+        return {"freq": result.freqs, "amplitude": result.ratio, "peak_freq": result.f0, "kind": "hvsr"}
+    freq, amplitude = smoothed_spectrum(record.data, record.dt)
+    return {"freq": freq, "amplitude": amplitude, "peak_freq": freq[np.argmax(amplitude)], "kind": "spectrum"}
+
+
+def compute_arias(record, corner_freq=DEFAULT_CORNER_FREQ):
+    """Cumulative Arias intensity (m/s) of the preprocessed trace."""
+    acc = preprocess_boore(np.asarray(record.data), 1.0 / record.dt, corner_freq)
+    return {"t": record.time, "arias": arias_intensity(acc, record.dt, cumulative=True)}
+
+
+def compute_response_spectrum(record, damping=DEFAULT_DAMPING, corner_freq=DEFAULT_CORNER_FREQ):
+    acc = preprocess_boore(np.asarray(record.data), 1.0 / record.dt, corner_freq)
+    spectrum = response_spectrum(acc, record.dt, DEFAULT_PERIODS, damping)
+    return {"periods": spectrum.periods, "response": spectrum.psa, "sd": spectrum.sd, "psv": spectrum.psv}
+
+
+def compute_phase_arrivals(record, sta_s=DEFAULT_STA_S, lta_s=DEFAULT_LTA_S, corner_freq=DEFAULT_CORNER_FREQ):
+    signal = np.asarray(record.data)
+    t = np.arange(len(signal)) * record.dt
+    picks = pick_phases(preprocess_boore(signal, 1.0 / record.dt, corner_freq), record.dt, sta_s, lta_s)
+    return {"t": t, "acc": signal, "p_time": float(picks.p_time), "s_time": float(picks.s_time),
+            "ratio": picks.ratio}
+
+
+def compute_time_frequency(record, window_s=DEFAULT_STFT_WINDOW_S, overlap=DEFAULT_OVERLAP, window=DEFAULT_WINDOW,
+                           with_phase=True, corner_freq=DEFAULT_CORNER_FREQ):
+    """Spectrogram and Welch PSD of the raw trace; with ``with_phase`` also the
+    amplitude/phase spectrum of the preprocessed trace (MATLAB Step 12)."""
+    spec = stft(record.data, record.dt, window_s, overlap, window)
+    result = {"spectrogram": spec, "welch": (spec.freqs, welch_average(spec))}
+    if with_phase:
+        pre = preprocess_boore(np.asarray(record.data), 1.0 / record.dt, corner_freq)
+        result["spectrum"] = spectrum(pre, record.dt)
+    return result
+
+
+def stream_motion_feature(path, corner_freq=DEFAULT_CORNER_FREQ, progress=None):
+    traces = stream_motion(path, corner_freq, progress=progress)
+    result = {"t": traces["t"], "corner_freq": corner_freq}
+    for name in ("acc", "vel", "disp"):
+        result[name] = (traces["raw", name], traces["pre", name])
+    return result
+
+
+def stream_bracketed_duration(path, bracket_fraction=0.05, corner_freq=DEFAULT_CORNER_FREQ, progress=None):
+    """:func:`compute_bracketed_duration` of a long record: filtered envelope and the bracket of
+    :meth:`streaming.RunningMotion.measures`."""
+    traces = stream_motion(path, corner_freq, progress=progress, bracket_fraction=bracket_fraction)
+    measures = traces["measures"]
+    start, end = _bracket(measures["bracket_start_s"], measures["bracket_end_s"])
+    return {"t": traces["t", "pre"], "acc": traces["pre", "acc"], "start": start, "end": end}
+
+
+def stream_arias(path, corner_freq=DEFAULT_CORNER_FREQ, progress=None):
+    """:func:`compute_arias` of a long record, as an envelope of the filtered trace's running Arias intensity."""
+    traces = stream_motion(path, corner_freq, progress=progress)
+    return {"t": traces["t", "pre"], "arias": traces["pre", "arias"]}
+
+
+FEATURES = [
+    compute_motion,
+    compute_fourier,
+    compute_bracketed_duration,
+    compute_site_frequency,
+    compute_arias,
+    compute_response_spectrum,
+    compute_phase_arrivals,
+]
+
+
+# Büyük dosyalarda belleğe yüklemeden çalışan karşılıklar
+STREAMED_FEATURES = {
+    0: stream_motion_feature,
+    2: stream_bracketed_duration,
+    4: stream_arias,
+}
+
+
+def compute_spectral_view(path, progress=None, **options):
+    """:func:`compute_time_frequency` of ``path``, for ``SpectralPage``."""
+    with span("read .asc", "io"):
+        record = load_record(path, progress)
+    with span("spectrogram", "compute"):
+        return compute_time_frequency(record, **options)
+
+
+def compute_feature(index, path, progress=None, **options):
+    """Load ``path`` through the shared record store and compute feature ``index``.
+
+    ``options`` are passed on to the feature function (e.g. ``corner_freq``).
+    Files over ``STREAM_BYTES`` are streamed instead where the feature allows
+    it. ``progress(fraction)`` is called while the file is being read.
+    """
+    if not 0 <= index < len(FEATURES):
+        raise IndexError(f"Invalid feature index: {index}")
+    if index in STREAMED_FEATURES and os.path.getsize(path) > STREAM_BYTES:
+        func = STREAMED_FEATURES[index]
+        with span(func.__name__, "compute"):
+            return func(path, progress=progress, **options)
+    with span("read .asc", "io"):
+        record = load_record(path, progress)
+    with span(FEATURES[index].__name__, "compute"):
+        return FEATURES[index](record, **options)
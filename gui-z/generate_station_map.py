@@ -1,36 +1,108 @@
+import os
+from collections import OrderedDict
 
-import folium
-import pandas as pd
+from folium.plugins import FastMarkerCluster
+from folium.template import Template
+from map_assets import base_map, render
+from event_catalog import DEFAULT_EVENTS_FILE, load_catalog
+from station_registry import DEFAULT_RADIUS_KM, load_registry
 
-def generate_station_map(event_id, station_csv='stations.csv', output_html='station_map.html'):
-    df = pd.read_csv(station_csv)
-    print("📌 Gelen event_id:", event_id)
+MAP_CACHE_SIZE = 16
+
+# Her satır [lat, lon, kod, il, ilçe, mesafe]; işaretçi ve popup tarayıcıda oluşturulur
+MARKER_CALLBACK = """
+function (row) {
+    var icon = L.AwesomeMarkers.icon({icon: 'info-sign', markerColor: 'blue', prefix: 'glyphicon'});
+    var popup = '<b>Station Code:</b> ' + row[2] + '<br>'
+        + '<b>Location:</b> ' + row[0] + '°N, ' + row[1] + '°E<br>'
+        + '<b>Province/District:</b> ' + row[3] + ', ' + row[4] + '<br>'
+        + '<b>Epicentral distance:</b> ' + (row[5] === null ? '-' : row[5] + ' km');
+    return L.marker(new L.LatLng(row[0], row[1]), {icon: icon}).bindPopup(popup, {maxWidth: 300});
+}"""
+
+
+class StationCluster(FastMarkerCluster):
+    """FastMarkerCluster that hands all markers to the cluster in one chunked ``addLayers`` call."""
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function(){
+                {{ this.callback }}
+
+                var data = {{ this.data|tojson }};
+                var cluster = L.markerClusterGroup({{ this.options|tojavascript }});
+                var markers = new Array(data.length);
+                for (var i = 0; i < data.length; i++) {
+                    markers[i] = callback(data[i]);
+                }
+                cluster.addLayers(markers);
+
+                cluster.addTo({{ this._parent.get_name() }});
+                return cluster;
+            })();
+        {% endmacro %}"""
+    )
+
+
+_map_cache = OrderedDict()
+
+
+def _file_version(path):
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
 
-    df['EventID'] = df['EventID'].astype(str).str.strip()
-    event_id = str(event_id).strip()
 
-    filtered = df[df['EventID'] == event_id]
-    print("✅ Filtrelenen istasyon sayısı:", len(filtered))
+def station_rows(stations):
+    """Marker rows ``[lat, lon, code, province, district, distance]`` for a station table."""
+    # Satırlar sütun bazında tek seferde hazırlanır; popup HTML'i tarayıcıda kurulur
+    columns = [stations[c].astype(float).tolist() for c in ('Latitude', 'Longitude')]
+    columns += [stations[c].astype(str).tolist() for c in ('Code', 'Province', 'District')]
+    columns.append(stations['Distance_km'].tolist() if 'Distance_km' in stations else [None] * len(stations))
+    return [list(row) for row in zip(*columns)]
 
+
+def build_station_map(event_id, station_csv='stations.csv', radius_km=DEFAULT_RADIUS_KM, events_csv=DEFAULT_EVENTS_FILE):
+    event_id = str(event_id).strip()
+
+    # İstasyonlar merkez üssüne uzaklıkla seçilir (uzamsal indeks)
+    filtered = load_registry(station_csv).for_event(event_id, radius_km, load_catalog(events_csv))
     if filtered.empty:
-        print("❌ Uyuşan istasyon bulunamadı.")
-        return
+        print(f"[WARN] No stations within {radius_km:g} km of event '{event_id}'.")
+        return None
 
     center_lat = filtered.iloc[0]['Latitude']
     center_lon = filtered.iloc[0]['Longitude']
-    m = folium.Map(location=[center_lat, center_lon], zoom_start=7)
-
-    for _, row in filtered.iterrows():
-        popup_text = (
-            f"<b>Station Code:</b> {row['Code']}<br>"
-            f"<b>Location:</b> {row['Latitude']}°N, {row['Longitude']}°E<br>"
-            f"<b>Province/District:</b> {row['Province']}, {row['District']}"
-        )
-        folium.Marker(
-            location=[row['Latitude'], row['Longitude']],
-            popup=popup_text,
-            icon=folium.Icon(color='blue', icon='info-sign')
-        ).add_to(m)
-
-    m.save(output_html)
+    m = base_map([center_lat, center_lon], 7)
+
+    StationCluster(station_rows(filtered), callback=MARKER_CALLBACK, chunkedLoading=True).add_to(m)
+    return m
+
+
+def station_map_html(event_id, station_csv='stations.csv', radius_km=DEFAULT_RADIUS_KM, events_csv=DEFAULT_EVENTS_FILE):
+    """Rendered map HTML for ``event_id`` (None if no stations), cached per event.
+
+    Entries are keyed on the versions of both CSV files, so editing either
+    one invalidates the maps built from it.
+    """
+    key = (str(event_id).strip(), float(radius_km), _file_version(station_csv), _file_version(events_csv))
+    if key in _map_cache:
+        _map_cache.move_to_end(key)
+        return _map_cache[key]
+
+    m = build_station_map(event_id, station_csv, radius_km, events_csv)
+    html = None if m is None else render(m)
+    _map_cache[key] = html
+    while len(_map_cache) > MAP_CACHE_SIZE:
+        _map_cache.popitem(last=False)
+    return html
+
+
+def generate_station_map(event_id, station_csv='stations.csv', output_html='station_map.html', radius_km=DEFAULT_RADIUS_KM):
+    html = station_map_html(event_id, station_csv, radius_km)
+    if html is None:
+        return None
+    with open(output_html, "w", encoding="utf-8") as f:
+        f.write(html)
     print(f"💾 Harita başarıyla kaydedildi: {output_html}")
+    return html
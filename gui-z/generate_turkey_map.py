@@ -1,28 +1,232 @@
-import folium
-import pandas as pd
-
-def generate_station_map(event_id, station_csv='stations.csv', output_html='station_map.html'):
-    df = pd.read_csv(station_csv)
-    df = df[df['EventID'].astype(str) == str(event_id)]
-
-    if df.empty:
-        print("No stations found for event:", event_id)
-        return
-
-    center_lat = df.iloc[0]['Latitude']
-    center_lon = df.iloc[0]['Longitude']
-    m = folium.Map(location=[center_lat, center_lon], zoom_start=7)
-
-    for _, row in df.iterrows():
-        popup = (
-            f"<b>Station Code:</b> {row['Code']}<br>"
-            f"<b>Location:</b> {row['Latitude']}°N, {row['Longitude']}°E<br>"
-            f"<b>Province/District:</b> {row['Province']}, {row['District']}"
-        )
-        folium.Marker(
-            location=[row['Latitude'], row['Longitude']],
-            popup=popup,
-            icon=folium.Icon(color='blue', icon='info-sign')
-        ).add_to(m)
-
-    m.save(output_html)
+"""Welcome map: earthquake density of the whole event catalog.
+
+Events are binned once into a quadtree of square cells on the Web
+Mercator grid, one level per zoom (``CELL_PX`` screen pixels per cell),
+and within each cell per year and magnitude band. The browser only draws
+the cells of the current zoom level and re-sums their pre-aggregated
+(year, band) rows when the time range or magnitude filter changes, so
+the drawing cost depends on the number of occupied cells, not on the
+number of events.
+
+The bins are kept next to the catalog (``events.density.json``) and only
+rebuilt when the catalog changes.
+
+    python generate_turkey_map.py [events.csv]
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from folium.elements import MacroElement
+from folium.template import Template
+
+from event_catalog import DEFAULT_EVENTS_FILE, load_catalog
+from map_assets import base_map, render
+
+CELL_PX = 64
+MIN_LEVEL = 3
+MAX_LEVEL = 8
+MAG_EDGES = [3.0, 4.0, 5.0, 6.0]
+DENSITY_VERSION = 1
+
+TURKEY_CENTER = [39.0, 35.0]
+TURKEY_ZOOM = 6
+
+# QuakeDensity(map, veri): seçili süzgece göre hücreleri tuval üzerinde çizer
+DENSITY_SCRIPT = """
+function QuakeDensity(map, data) {
+    var renderer = L.canvas({padding: 0.5});
+    var group = L.layerGroup().addTo(map);
+    var levels = Object.keys(data.levels).map(Number).sort(function (a, b) { return a - b; });
+    var filter = {band: 0, from: data.years[0], to: data.years[1]};
+
+    function colour(mag) {
+        return mag >= 6 ? '#7f0000' : mag >= 5 ? '#d7301f' : mag >= 4 ? '#fc8d59' : mag >= 3 ? '#fdcc8a' : '#fef0d9';
+    }
+
+    function level(zoom) {
+        var best = levels[0];
+        levels.forEach(function (z) { if (z <= zoom) best = z; });
+        return data.levels[best];
+    }
+
+    function redraw() {
+        group.clearLayers();
+        var cells = level(map.getZoom());
+        if (!cells) return;
+        for (var i = 0; i + 1 < cells.start.length; i++) {
+            var n = 0, mag = -Infinity;
+            for (var r = cells.start[i]; r < cells.start[i + 1]; r++) {
+                var year = cells.year[r];
+                if (cells.band[r] < filter.band || year < filter.from || year > filter.to) continue;
+                n += cells.count[r];
+                if (cells.mag[r] !== null && cells.mag[r] > mag) mag = cells.mag[r];
+            }
+            if (!n) continue;
+            L.circleMarker([cells.lat[i], cells.lon[i]], {
+                renderer: renderer, radius: Math.min(28, 4 + 3 * Math.log2(1 + n)),
+                color: '#600', weight: 1, fillColor: colour(mag), fillOpacity: 0.7
+            }).bindTooltip(n + (n === 1 ? ' event' : ' events') + (mag > -Infinity ? ', max M' + mag.toFixed(1) : ''))
+              .addTo(group);
+        }
+    }
+
+    map.on('zoomend', redraw);
+    redraw();
+    return {
+        setFilter: function (band, from, to) {
+            filter = {band: band, from: from, to: to};
+            redraw();
+        },
+        remove: function () {
+            map.off('zoomend', redraw);
+            map.removeLayer(group);
+        }
+    };
+}"""
+
+
+def band_labels(edges=MAG_EDGES):
+    return [f"< {edges[0]:g}"] + [f"{lo:g}–{hi:g}" for lo, hi in zip(edges, edges[1:])] + [f"≥ {edges[-1]:g}"]
+
+
+def _mercator(lat, lon):
+    """World coordinates in [0, 1) for the Web Mercator grid."""
+    lat = np.radians(np.clip(lat, -85.0511, 85.0511))
+    x = (lon + 180.0) / 360.0
+    y = (1.0 - np.arcsinh(np.tan(lat)) / np.pi) / 2.0
+    return np.clip(x, 0.0, np.nextafter(1.0, 0)), np.clip(y, 0.0, np.nextafter(1.0, 0))
+
+
+def build_density(catalog, levels=range(MIN_LEVEL, MAX_LEVEL + 1), cell_px=CELL_PX, edges=MAG_EDGES):
+    """Pre-aggregated density bins of ``catalog`` for every zoom level.
+
+    Per level, cells are sorted by id; ``start`` gives the CSR offsets of
+    each cell's (year, band, count, max magnitude) rows.
+    """
+    df = catalog.df
+    lat = pd.to_numeric(df["Latitude"], errors="coerce").to_numpy(dtype=float)
+    lon = pd.to_numeric(df["Longitude"], errors="coerce").to_numpy(dtype=float)
+    valid = np.isfinite(lat) & np.isfinite(lon) & ~np.isnat(catalog.dates)
+    lat, lon = lat[valid], lon[valid]
+    mags = catalog.magnitudes[valid]
+    years = catalog.dates[valid].astype("datetime64[Y]").astype(np.int64) + 1970
+    bands = np.where(np.isnan(mags), 0, np.searchsorted(edges, mags, side="right"))
+
+    payload = {"version": DENSITY_VERSION, "bands": list(edges), "events": int(valid.sum()), "levels": {}}
+    if not valid.any():
+        payload["years"] = [0, 0]
+        return payload
+    y0 = int(years.min())
+    payload["years"] = [y0, int(years.max())]
+    n_bands = len(edges) + 1
+    n_years = int(years.max()) - y0 + 1
+    wx, wy = _mercator(lat, lon)
+
+    for z in levels:
+        scale = (1 << z) * 256 / cell_px
+        cell = np.floor(wy * scale).astype(np.int64) * int(np.ceil(scale)) + np.floor(wx * scale).astype(np.int64)
+        cells, cell_index, cell_counts = np.unique(cell, return_inverse=True, return_counts=True)
+
+        # Her (hücre, yıl, bant) satırı: olay sayısı ve en büyük magnitüd
+        key = (cell_index * n_years + (years - y0)) * n_bands + bands
+        order = np.argsort(key, kind="stable")
+        key = key[order]
+        first = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+        counts = np.diff(np.r_[first, len(key)])
+        with np.errstate(invalid="ignore"):
+            max_mag = np.fmax.reduceat(mags[order], first)
+        row_key = key[first]
+        row_cell = row_key // (n_years * n_bands)
+
+        payload["levels"][str(z)] = {
+            "lat": np.round(np.bincount(cell_index, lat) / cell_counts, 4).tolist(),
+            "lon": np.round(np.bincount(cell_index, lon) / cell_counts, 4).tolist(),
+            "start": np.searchsorted(row_cell, np.arange(len(cells) + 1)).tolist(),
+            "year": ((row_key // n_bands) % n_years + y0).tolist(),
+            "band": (row_key % n_bands).tolist(),
+            "count": counts.tolist(),
+            "mag": [None if m != m else m for m in np.round(max_mag, 1).tolist()],
+        }
+    return payload
+
+
+def density_path(events_csv):
+    return os.path.splitext(events_csv)[0] + ".density.json"
+
+
+def _source_version(events_csv):
+    stat = os.stat(events_csv)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+_density = {}
+
+
+def load_density(events_csv=DEFAULT_EVENTS_FILE):
+    """Density bins for ``events_csv``, from the sidecar file when it is up to date."""
+    try:
+        source = _source_version(events_csv)
+    except OSError as e:
+        print(f"[ERROR] Failed to read event catalog: {e}")
+        return build_density(load_catalog(events_csv))
+    key = (os.path.abspath(events_csv), tuple(source))
+    if key in _density:
+        return _density[key]
+
+    payload = None
+    path = density_path(events_csv)
+    try:
+        with open(path, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("source") == source and cached.get("version") == DENSITY_VERSION:
+            payload = cached
+    except (OSError, ValueError):
+        pass
+
+    if payload is None:
+        payload = build_density(load_catalog(events_csv))
+        payload["source"] = source
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+        except OSError as e:
+            print(f"[WARN] Could not write density cache {path}: {e}")
+
+    _density.clear()
+    _density[key] = payload
+    return payload
+
+
+class DensityLayer(MacroElement):
+    """Density layer with its bins embedded, for standalone HTML pages."""
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            {{ this.script }}
+            var {{ this.get_name() }} = QuakeDensity({{ this._parent.get_name() }}, {{ this.data|tojson }});
+        {% endmacro %}"""
+    )
+
+    def __init__(self, data):
+        super().__init__()
+        self._name = "DensityLayer"
+        self.data = data
+        self.script = DENSITY_SCRIPT
+
+
+def generate_turkey_map(events_csv=DEFAULT_EVENTS_FILE, output_html='turkey_earthquake_map.html'):
+    density = load_density(events_csv)
+    m = base_map(TURKEY_CENTER, TURKEY_ZOOM)
+    DensityLayer({k: v for k, v in density.items() if k != "source"}).add_to(m)
+    with open(output_html, "w", encoding="utf-8") as f:
+        f.write(render(m))
+    print(f"💾 Harita başarıyla kaydedildi: {output_html} ({density['events']} olay)")
+
+
+if __name__ == "__main__":
+    generate_turkey_map(*sys.argv[1:2])
@@ -0,0 +1,99 @@
+"""Scalar ground-motion intensity measures.
+
+Definitions follow ``ensonpreprocessed.m`` (Steps 9, 13, 14 and 15) and are
+computed on the preprocessed trace. Every function reduces the last axis,
+so ``(..., n)`` input gives ``(...)`` output.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from preprocessing import DEFAULT_CORNER_FREQ, cumtrapz, integrate_motion, preprocess_boore
+
+G = 9.81  # m/s^2
+CM_PER_M = 100.0
+
+
+def peak(values):
+    return np.max(np.abs(values), axis=-1)
+
+
+def bracketed_duration(acc, dt, threshold):
+    """Time between the first and last sample with |acc| >= ``threshold``.
+
+    ``threshold`` broadcasts against the leading axes of ``acc``. Returns
+    ``(duration, start, end)``; start/end are NaN where nothing exceeds it.
+    """
+    acc = np.asarray(acc)
+    above = np.abs(acc) >= np.asarray(threshold)[..., None]
+    n = acc.shape[-1]
+    any_above = above.any(axis=-1)
+    first = np.argmax(above, axis=-1)
+    last = n - 1 - np.argmax(above[..., ::-1], axis=-1)
+    start = np.where(any_above, first * dt, np.nan)
+    end = np.where(any_above, last * dt, np.nan)
+    duration = np.where(any_above, end - start, 0.0)
+    return duration, start, end
+
+
+def site_frequency(acc, dt):
+    """Frequency of the largest Fourier amplitude, DC excluded (MATLAB Step 14)."""
+    acc = np.asarray(acc)
+    n = acc.shape[-1]
+    amplitude = np.abs(np.fft.rfft(acc, axis=-1))[..., :max(n // 2, 1)]
+    freqs = np.fft.rfftfreq(n, d=dt)[:amplitude.shape[-1]]
+    amplitude[..., 0] = 0.0
+    return freqs[np.argmax(amplitude, axis=-1)]
+
+
+def arias_intensity(acc_cm_s2, dt, cumulative=False):
+    """Arias intensity in m/s from acceleration in cm/s^2."""
+    acc = np.asarray(acc_cm_s2) / CM_PER_M
+    ia = (np.pi / (2 * G)) * cumtrapz(acc ** 2, dt)
+    return ia if cumulative else ia[..., -1]
+
+
+@dataclass
+class IntensityMeasures:
+    """Scalar measures of one trace (floats) or a stack of traces (arrays)."""
+    pga_cm_s2: np.ndarray
+    pgv_cm_s: np.ndarray
+    pgd_cm: np.ndarray
+    bracketed_duration_s: np.ndarray
+    bracket_start_s: np.ndarray    # NaN where nothing exceeds the threshold
+    bracket_end_s: np.ndarray
+    site_frequency_hz: np.ndarray
+    arias_intensity_m_s: np.ndarray
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+def intensity_measures(acc, dt, corner_freq=DEFAULT_CORNER_FREQ, bracket_fraction=0.05, preprocessed=False):
+    """All scalar measures of a raw acceleration trace (cm/s^2) or stack of traces.
+
+    The bracketed-duration threshold is ``bracket_fraction * PGA`` of the
+    preprocessed trace, as in the MATLAB script. With ``preprocessed`` the
+    input is already the output of ``preprocess_boore`` (``corner_freq`` is
+    then ignored), so callers that need the filtered trace anyway filter once.
+    """
+    pre = np.asarray(acc, dtype=np.float64) if preprocessed else preprocess_boore(acc, 1.0 / dt, corner_freq)
+    vel, disp = integrate_motion(pre, dt)
+    pga = peak(pre)
+    duration, start, end = bracketed_duration(pre, dt, bracket_fraction * pga)
+    return IntensityMeasures(
+        pga_cm_s2=pga,
+        pgv_cm_s=peak(vel),
+        pgd_cm=peak(disp),
+        bracketed_duration_s=duration,
+        bracket_start_s=start,
+        bracket_end_s=end,
+        site_frequency_hz=site_frequency(pre, dt),
+        arias_intensity_m_s=arias_intensity(pre, dt),
+    )
+
+
+def compute_intensity_measures(acc, dt, corner_freq=DEFAULT_CORNER_FREQ, bracket_fraction=0.05):
+    """:func:`intensity_measures` as a dict keyed by the batch table's column names."""
+    return intensity_measures(acc, dt, corner_freq, bracket_fraction).as_dict()
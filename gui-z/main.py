@@ -1,55 +1,128 @@
-# main.py — QStackedWidget version with WelcomePage
-
-import sys
-from PyQt5.QtWidgets import QApplication, QMainWindow, QStackedWidget
-from page_welcome import WelcomePage  # 🆕 Eklendi
-from page_event_select import EventSelectPage
-from page_event_details import EventDetailsPage
-from page_graphs import GraphsPage
-from page_station_graphs import StationAnalysisPage
-
-class MainWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("QuakeSense-Earthquake Analysis Tool")
-        self.setGeometry(100, 100, 1200, 700)
-        self.selected_event = None
-        self.selected_event_row = None
-
-
-
-        self.stack = QStackedWidget()
-        self.setCentralWidget(self.stack)
-
-        # 🆕 Sayfalar
-        self.page0 = WelcomePage(self)  # Hoş Geldiniz Sayfası
-        self.page1 = EventSelectPage(self)
-        self.page2 = EventDetailsPage(self)
-        self.page3 = GraphsPage(self)
-        self.page4 = StationAnalysisPage(self)
-
-        # 🆕 Stack'e sırayla ekle
-        self.stack.addWidget(self.page0)
-        self.stack.addWidget(self.page1)
-        self.stack.addWidget(self.page2)
-        self.stack.addWidget(self.page3)
-        self.stack.addWidget(self.page4)
-
-        self.stack.setCurrentIndex(0)  # Başlangıç sayfası = WelcomePage
-
-    def go_to_page(self, index):
-        self.stack.setCurrentIndex(index)
-
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
-
-    # Load style file if exists
-    try:
-        with open("style.qss", "r") as f:
-            app.setStyleSheet(f.read())
-    except Exception as e:
-        print(f"Style load failed: {e}")
-
-    window = MainWindow()
-    window.show()
-    sys.exit(app.exec_())
+# main.py — QStackedWidget version with WelcomePage
+
+import time
+
+STARTED = time.perf_counter()
+
+from contextlib import nullcontext
+import importlib
+import sys
+from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtWidgets import (QApplication, QFileDialog, QLabel, QMainWindow, QPushButton, QShortcut, QStackedWidget,
+                             QWidget)
+# QtWebEngine modülleri QApplication'dan önce yüklenmeli; sayfalar sonradan içe aktarılır
+from asset_scheme import register_scheme
+from profiling import action, overlay_enabled, profiler, span
+from resources import stylesheet
+from startup_timing import StartupTimer
+
+# Sayfalar ilk açılışta oluşturulur (modül, sınıf)
+PAGES = [
+    ("page_welcome", "WelcomePage"),           # Hoş Geldiniz Sayfası
+    ("page_event_select", "EventSelectPage"),
+    ("page_event_details", "EventDetailsPage"),
+    ("page_graphs", "GraphsPage"),
+    ("page_station_graphs", "StationAnalysisPage"),
+    ("page_spectral", "SpectralPage"),
+]
+
+
+class MainWindow(QMainWindow):
+    # Eylem süreleri işçi iş parçacığında da bitebilir; etiket GUI iş parçacığında güncellenir
+    action_timed = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("QuakeSense-Earthquake Analysis Tool")
+        self.setGeometry(100, 100, 1200, 700)
+        self.selected_event = None
+        self.selected_event_row = None
+
+        self.stack = QStackedWidget()
+        self.setCentralWidget(self.stack)
+
+        # 🆕 Her sayfa için boş yer tutucu; gerçek sayfa ilk ziyarette kurulur
+        self.pages = [None] * len(PAGES)
+        for _ in PAGES:
+            self.stack.addWidget(QWidget())
+
+        self.init_timing_overlay()
+        self.go_to_page(0)  # Başlangıç sayfası = WelcomePage
+
+    def init_timing_overlay(self):
+        # ⏱️ Son eylemin aşama dökümü (QUAKESENSE_TIMING=1 veya Ctrl+Shift+T)
+        self.timing_label = QLabel("⏱ No action timed yet.")
+        self.timing_label.setObjectName("timingLabel")
+        export_button = QPushButton("Export trace…")
+        export_button.setObjectName("smallBackButton")
+        export_button.clicked.connect(self.export_trace)
+        status = self.statusBar()
+        status.addWidget(self.timing_label, 1)
+        status.addPermanentWidget(export_button)
+        status.setVisible(overlay_enabled())
+
+        toggle = QShortcut(QKeySequence("Ctrl+Shift+T"), self)
+        toggle.activated.connect(lambda: status.setVisible(not status.isVisible()))
+        self.action_timed.connect(self.show_timing)
+        profiler.listeners.append(self.action_timed.emit)
+
+    def show_timing(self, trace):
+        self.timing_label.setText(f"⏱ {trace.summary()}")
+        slowest = sorted(trace.spans, key=lambda s: s.self_ms, reverse=True)[:10]
+        self.timing_label.setToolTip("\n".join(
+            f"{s.self_ms:8.1f} ms  {s.category:<8} {s.name} [{s.thread}]" for s in slowest))
+
+    def export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export timing trace", "quakesense_trace.jsonl",
+                                              "JSON Lines (*.jsonl)")
+        if not path:
+            return
+        try:
+            count = profiler.export(path)
+        except OSError as e:
+            print(f"[ERROR] Could not export trace: {e}")
+            return
+        self.statusBar().showMessage(f"💾 {count} action(s) exported to {path}", 5000)
+
+    def page(self, index):
+        """The page at ``index``, built (and its module imported) on first use."""
+        if self.pages[index] is None:
+            module_name, class_name = PAGES[index]
+            # Açık bir eylem varsa onun parçası, yoksa kendi başına bir eylem
+            timed = nullcontext() if profiler.current else action(f"Build {class_name}")
+            with timed, span(f"build {class_name}", "ui"):
+                page_class = getattr(importlib.import_module(module_name), class_name)
+                page = page_class(self)
+                placeholder = self.stack.widget(index)
+                self.stack.removeWidget(placeholder)
+                placeholder.deleteLater()
+                self.stack.insertWidget(index, page)
+            self.pages[index] = page
+        return self.pages[index]
+
+    def go_to_page(self, index):
+        self.stack.setCurrentWidget(self.page(index))
+
+
+if __name__ == "__main__":
+    timer = StartupTimer(STARTED)
+    timer.mark("imports")
+
+    # quakesense:// şeması QApplication'dan önce kaydedilmeli (yerel harita dosyaları)
+    register_scheme()
+    app = QApplication(sys.argv)
+    timer.mark("QApplication")
+
+    # Stil dosyası bir kez okunur ve uygulamanın tamamına uygulanır
+    app.setStyleSheet(stylesheet())
+    timer.mark("stylesheet")
+
+    window = MainWindow()
+    timer.mark("main window")
+    window.show()
+    # İlk kare eşzamanlı çizilir; ertelenmiş işler (ör. hoş geldiniz haritası) sonra çalışır
+    window.repaint()
+    timer.mark("first paint")
+    timer.report()
+    sys.exit(app.exec_())
@@ -0,0 +1,266 @@
+"""Locally bundled map assets and tile cache.
+
+Rendered folium pages reference Leaflet, jQuery, Bootstrap, etc. through
+the ``quakesense://`` scheme instead of the CDNs, and tiles through
+``quakesense://tiles/{z}/{x}/{y}.png``. The scheme handler in
+``asset_scheme`` serves them from the asset directory:
+
+* ``vendor/<host>/<path>``: a mirror of the CDN files (``vendor`` command),
+  so relative ``url(...)`` references inside the CSS resolve as well;
+* ``tiles.mbtiles`` and/or ``tiles/{z}/{x}/{y}.png``: the tile cache
+  (``tiles`` command prefetches the Turkey bounding box from a tile server
+  you run or are licensed to bulk-download from; the OpenStreetMap tile
+  usage policy forbids bulk prefetching from ``tile.openstreetmap.org``, so
+  that host is refused).
+
+Anything not bundled falls back to its online URL, so an unprepared
+install behaves as before; on an isolated network the bundle is all that
+is needed.
+
+    python map_assets.py vendor
+    python map_assets.py tiles --url "https://tiles.example.org/{z}/{x}/{y}.png" --max-zoom 10
+"""
+
+import argparse
+import math
+import mimetypes
+import os
+import re
+import sqlite3
+import sys
+import time
+import urllib.request
+from urllib.parse import urljoin, urlsplit
+
+import folium
+
+ASSET_DIR_ENV = "QUAKESENSE_MAP_ASSETS"
+DEFAULT_ASSET_DIR = "map_assets"
+SCHEME = "quakesense"
+ASSET_HOST = "assets"
+TILE_HOST = "tiles"
+
+TILE_URL = f"{SCHEME}://{TILE_HOST}/{{z}}/{{x}}/{{y}}.png"
+ONLINE_TILE_URL = "https://tile.openstreetmap.org/{z}/{x}/{y}.png"
+TILE_SERVER_ENV = "QUAKESENSE_TILE_SERVER"
+# https://operations.osmfoundation.org/policies/tiles/ : toplu indirme yasak
+BULK_FORBIDDEN_HOSTS = ("openstreetmap.org",)
+TILE_ATTRIBUTION = ('Data by &copy; <a href="http://openstreetmap.org">OpenStreetMap</a>, '
+                    'under <a href="http://www.openstreetmap.org/copyright">ODbL</a>.')
+MAX_ZOOM = 18
+
+# Türkiye sınır kutusu (güney, batı, kuzey, doğu)
+TURKEY_BBOX = (35.8, 25.6, 42.2, 44.9)
+USER_AGENT = "QuakeSense tile prefetch"
+
+_CDN_URL = re.compile(r"""(?<=["'(])https?://[^"')\s]+\.(?:js|css)(?=["')])""")
+_CSS_URL = re.compile(r"""url\(\s*['"]?([^'")]+?)['"]?\s*\)""")
+
+
+def asset_dir():
+    return os.environ.get(ASSET_DIR_ENV) or DEFAULT_ASSET_DIR
+
+
+def local_url(url):
+    """``quakesense://assets/<host>/<path>`` for a CDN URL."""
+    parts = urlsplit(url)
+    return f"{SCHEME}://{ASSET_HOST}/{parts.netloc}{parts.path}"
+
+
+def online_url(path):
+    """Inverse of :func:`local_url` for the path part of an asset URL."""
+    return "https://" + path.lstrip("/")
+
+
+def localize_html(html):
+    """Point every CDN script/stylesheet of a rendered page at the local bundle."""
+    return _CDN_URL.sub(lambda match: local_url(match.group(0)), html)
+
+
+def base_map(location, zoom_start):
+    """``folium.Map`` whose tiles come from the local tile cache."""
+    m = folium.Map(location=location, zoom_start=zoom_start, tiles=None)
+    folium.TileLayer(TILE_URL, attr=TILE_ATTRIBUTION, name="OpenStreetMap", max_zoom=MAX_ZOOM).add_to(m)
+    return m
+
+
+def render(m):
+    """Rendered HTML of a folium map with local asset references."""
+    return localize_html(m.get_root().render())
+
+
+def guess_mime(path):
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+def read_asset(path):
+    """Bytes of a vendored file (``<host>/<path>``), or None if it is not bundled."""
+    root = os.path.abspath(os.path.join(asset_dir(), "vendor"))
+    full = os.path.abspath(os.path.join(root, path.lstrip("/")))
+    if not full.startswith(root + os.sep) or not os.path.isfile(full):
+        return None
+    with open(full, "rb") as f:
+        return f.read()
+
+
+_mbtiles = {}
+
+
+def _mbtiles_connection():
+    path = os.path.join(asset_dir(), "tiles.mbtiles")
+    if not os.path.isfile(path):
+        return None
+    # Salt okunur bağlantı; dosya değişince yeniden açılır
+    key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+    if key not in _mbtiles:
+        _mbtiles.clear()
+        _mbtiles[key] = sqlite3.connect(f"file:{key[0]}?mode=ro", uri=True, check_same_thread=False)
+    return _mbtiles[key]
+
+
+def read_tile(z, x, y):
+    """PNG bytes of tile z/x/y from the MBTiles file or XYZ directory, or None."""
+    connection = _mbtiles_connection()
+    if connection is not None:
+        # MBTiles satırları TMS düzeninde (y ekseni ters)
+        row = connection.execute(
+            "SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+            (z, x, (1 << z) - 1 - y)).fetchone()
+        if row is not None:
+            return bytes(row[0])
+    path = os.path.join(asset_dir(), "tiles", str(z), str(x), f"{y}.png")
+    if os.path.isfile(path):
+        with open(path, "rb") as f:
+            return f.read()
+    return None
+
+
+def tile_range(bbox, zoom):
+    """``(x0, x1, y0, y1)`` inclusive tile indices covering ``bbox`` at ``zoom``."""
+    south, west, north, east = bbox
+    n = 1 << zoom
+
+    def tile_x(lon):
+        return min(n - 1, max(0, int((lon + 180.0) / 360.0 * n)))
+
+    def tile_y(lat):
+        lat = math.radians(lat)
+        y = (1.0 - math.asinh(math.tan(lat)) / math.pi) / 2.0 * n
+        return min(n - 1, max(0, int(y)))
+
+    return tile_x(west), tile_x(east), tile_y(north), tile_y(south)
+
+
+def _fetch(url):
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def vendor_assets(urls=None, progress=True):
+    """Download the CDN files used by the map pages (and the files their CSS refers to)."""
+    if urls is None:
+        urls = sorted(set(m.group(0) for m in _CDN_URL.finditer(_sample_page())))
+    root = os.path.join(asset_dir(), "vendor")
+    queue, seen, failed = list(urls), set(), 0
+    while queue:
+        url = queue.pop(0).split("#")[0].split("?")[0]
+        if url in seen or url.startswith("data:"):
+            continue
+        seen.add(url)
+        parts = urlsplit(url)
+        target = os.path.join(root, parts.netloc, parts.path.lstrip("/"))
+        try:
+            data = _fetch(url)
+        except Exception as e:
+            failed += 1
+            print(f"[WARN] Could not download {url}: {e}")
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as f:
+            f.write(data)
+        if progress:
+            print(f"⬇️ {url}")
+        if url.endswith(".css"):
+            css = data.decode("utf-8", errors="replace")
+            queue += [urljoin(url, ref) for ref in _CSS_URL.findall(css) if not ref.startswith("data:")]
+    return len(seen) - failed, failed
+
+
+def _sample_page():
+    # Haritaların kullandığı tüm eklentileri içeren örnek sayfa
+    from folium.plugins import MarkerCluster
+    m = folium.Map()
+    folium.Marker([0, 0], icon=folium.Icon()).add_to(MarkerCluster().add_to(m))
+    return m.get_root().render()
+
+
+def prefetch_tiles(url, bbox=TURKEY_BBOX, min_zoom=0, max_zoom=10, delay=0.05, progress=True):
+    """Download every tile of ``bbox`` for the zoom levels from ``url`` into the XYZ cache.
+
+    ``url`` must be a server that allows bulk downloads (self-hosted or
+    licensed); the OpenStreetMap tile servers are refused. Tiles already in
+    the cache are skipped, so an interrupted run resumes.
+    """
+    host = (urlsplit(url).hostname or "").lower()
+    if any(host == h or host.endswith("." + h) for h in BULK_FORBIDDEN_HOSTS):
+        raise ValueError(f"Bulk prefetching from {host} is forbidden by the OpenStreetMap tile usage policy; "
+                         "use a self-hosted or licensed tile server.")
+    jobs = []
+    for z in range(min_zoom, max_zoom + 1):
+        x0, x1, y0, y1 = tile_range(bbox, z)
+        jobs += [(z, x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+    fetched = failed = 0
+    for i, (z, x, y) in enumerate(jobs, 1):
+        path = os.path.join(asset_dir(), "tiles", str(z), str(x), f"{y}.png")
+        if not os.path.isfile(path):
+            try:
+                data = _fetch(url.format(z=z, x=x, y=y))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(data)
+                fetched += 1
+            except Exception as e:
+                failed += 1
+                print(f"\n[WARN] Tile {z}/{x}/{y} failed: {e}", file=sys.stderr)
+            time.sleep(delay)
+        if progress and (i % 50 == 0 or i == len(jobs)):
+            print(f"\r{i}/{len(jobs)} tiles", end="", file=sys.stderr, flush=True)
+    if progress and jobs:
+        print(file=sys.stderr)
+    return fetched, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bundle map assets and tiles for offline use.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("vendor", help="download Leaflet/jQuery/Bootstrap/... used by the map pages")
+    tiles = sub.add_parser("tiles", help="prefetch tiles for a bounding box (default: Turkey)")
+    tiles.add_argument("--min-zoom", type=int, default=0)
+    tiles.add_argument("--max-zoom", type=int, default=10)
+    tiles.add_argument("--bbox", type=float, nargs=4, metavar=("SOUTH", "WEST", "NORTH", "EAST"), default=TURKEY_BBOX)
+    tiles.add_argument("--url", default=os.environ.get(TILE_SERVER_ENV),
+                       help=f"tile URL template with {{z}}/{{x}}/{{y}} (default: ${TILE_SERVER_ENV}); must be a "
+                            "self-hosted or licensed server, since the OpenStreetMap tile usage policy forbids "
+                            "bulk downloads from tile.openstreetmap.org")
+    tiles.add_argument("--delay", type=float, default=0.05, help="seconds between downloads")
+    args = parser.parse_args(argv)
+
+    if args.command == "vendor":
+        done, failed = vendor_assets()
+        print(f"💾 {done} files bundled in {os.path.join(asset_dir(), 'vendor')}" + (f" ({failed} failed)" if failed else ""))
+    else:
+        if not args.url:
+            parser.error(f"tiles needs --url (or ${TILE_SERVER_ENV}): a tile server that allows bulk downloads")
+        try:
+            done, failed = prefetch_tiles(args.url, tuple(args.bbox), args.min_zoom, args.max_zoom, args.delay)
+        except ValueError as e:
+            print(f"[ERROR] {e}", file=sys.stderr)
+            return 2
+        print(f"💾 {done} tiles downloaded to {os.path.join(asset_dir(), 'tiles')}" + (f" ({failed} failed)" if failed else ""))
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""Persistent Leaflet map driven from Python over ``QWebChannel``.
+
+``MapView`` loads one small shell page (Leaflet + a marker cluster) the
+first time it is shown and never reloads it. Markers, the highlighted
+marker and the viewport are then pushed as compact JSON deltas through
+the signals of ``MapBridge``; selecting a station is a single signal with
+the station code, so it pans and highlights without parsing any HTML.
+
+Marker rows use the same layout as the folium maps in
+``generate_station_map`` (``[lat, lon, code, ...]``), and the browser
+builds each marker and popup from its row with the per-kind callbacks.
+The welcome map's event density bins are sent once and then only
+filtered (``set_density`` / ``filter_density``).
+"""
+
+import json
+import os
+import time
+
+from folium.plugins import MarkerCluster
+from folium.template import Template
+from PyQt5.QtCore import QObject, QUrl, pyqtSignal, pyqtSlot
+from PyQt5.QtWebChannel import QWebChannel
+from PyQt5.QtWebEngineWidgets import QWebEngineView
+
+from asset_scheme import install_handler
+from generate_station_map import MARKER_CALLBACK
+from generate_turkey_map import DENSITY_SCRIPT, TURKEY_CENTER, TURKEY_ZOOM
+from map_assets import base_map, render
+from profiling import record
+
+
+def _json(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class BridgeLayer(MarkerCluster):
+    """Empty marker cluster that is filled and updated from ``MapBridge`` signals."""
+
+    default_js = MarkerCluster.default_js + [("qwebchannel", "qrc:///qtwebchannel/qwebchannel.js")]
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function(){
+                var map = {{ this._parent.get_name() }};
+                var cluster = L.markerClusterGroup({{ this.options|tojavascript }});
+                var kinds = {
+                    station: {
+                        create: {{ this.station_callback }},
+                        highlight: function (marker, on) {
+                            marker.setIcon(L.AwesomeMarkers.icon(
+                                {icon: 'info-sign', markerColor: on ? 'red' : 'blue', prefix: 'glyphicon'}));
+                        }
+                    }
+                };
+                var markers = {};      // kod -> [tür, işaretçi]
+                var current = null;
+                var bridge = null;
+                var density = null;
+
+                {{ this.density_script }}
+
+                function add(groups) {
+                    var layers = [];
+                    groups.forEach(function (group) {
+                        var kind = kinds[group.kind];
+                        group.rows.forEach(function (row) {
+                            var code = String(row[2]);
+                            if (markers[code]) {
+                                cluster.removeLayer(markers[code][1]);
+                            }
+                            var marker = kind.create(row);
+                            marker.on('click', function () { if (bridge) bridge.clicked(code); });
+                            markers[code] = [group.kind, marker];
+                            layers.push(marker);
+                        });
+                    });
+                    cluster.addLayers(layers);
+                }
+
+                function remove(codes) {
+                    var layers = [];
+                    codes.forEach(function (code) {
+                        var entry = markers[code];
+                        if (!entry) return;
+                        if (current === entry) current = null;
+                        layers.push(entry[1]);
+                        delete markers[code];
+                    });
+                    cluster.removeLayers(layers);
+                }
+
+                function highlight(code, pan) {
+                    if (current) {
+                        kinds[current[0]].highlight(current[1], false);
+                        current = null;
+                    }
+                    var entry = markers[code];
+                    if (!entry) return;
+                    var marker = entry[1];
+                    kinds[entry[0]].highlight(marker, true);
+                    current = entry;
+                    if (!pan) return;
+                    if (marker instanceof L.Marker) {
+                        cluster.zoomToShowLayer(marker, function () { marker.openPopup(); });
+                    } else {
+                        map.panTo(marker.getLatLng());
+                        marker.openPopup();
+                    }
+                }
+
+                new QWebChannel(qt.webChannelTransport, function (channel) {
+                    bridge = channel.objects.{{ this.object_name }};
+                    bridge.markersSet.connect(function (payload) {
+                        cluster.clearLayers();
+                        markers = {};
+                        current = null;
+                        add(JSON.parse(payload));
+                    });
+                    bridge.markersAdded.connect(function (payload) { add(JSON.parse(payload)); });
+                    bridge.markersRemoved.connect(function (payload) { remove(JSON.parse(payload)); });
+                    bridge.highlighted.connect(highlight);
+                    bridge.viewChanged.connect(function (lat, lon, zoom) { map.setView([lat, lon], zoom); });
+                    bridge.boundsFitted.connect(function (south, west, north, east) {
+                        map.fitBounds([[south, west], [north, east]], {maxZoom: 10});
+                    });
+                    bridge.densitySet.connect(function (payload) {
+                        if (density) density.remove();
+                        density = QuakeDensity(map, JSON.parse(payload));
+                    });
+                    bridge.densityFiltered.connect(function (band, from, to) {
+                        if (density) density.setFilter(band, from, to);
+                    });
+                    bridge.ready();
+                });
+                return cluster;
+            })();
+        {% endmacro %}"""
+    )
+
+    def __init__(self, object_name="bridge", **kwargs):
+        super().__init__(**kwargs)
+        self._name = "BridgeLayer"
+        self.object_name = object_name
+        self.station_callback = MARKER_CALLBACK
+        self.density_script = DENSITY_SCRIPT
+
+
+_shell_html = None
+
+
+def shell_html():
+    """The map page loaded once by every ``MapView``; rendered once per process."""
+    global _shell_html
+    if _shell_html is None:
+        m = base_map(TURKEY_CENTER, TURKEY_ZOOM)
+        BridgeLayer(chunkedLoading=True).add_to(m)
+        _shell_html = render(m)
+    return _shell_html
+
+
+class MapBridge(QObject):
+    """Python side of the channel; the shell page connects to these signals."""
+
+    markersSet = pyqtSignal(str)          # [{"kind": ..., "rows": [...]}, ...]
+    markersAdded = pyqtSignal(str)
+    markersRemoved = pyqtSignal(str)      # ["code", ...]
+    highlighted = pyqtSignal(str, bool)   # code, pan
+    viewChanged = pyqtSignal(float, float, int)
+    boundsFitted = pyqtSignal(float, float, float, float)
+    densitySet = pyqtSignal(str)          # generate_turkey_map.build_density çıktısı
+    densityFiltered = pyqtSignal(int, int, int)   # min band, from year, to year
+
+    pageReady = pyqtSignal()
+    markerClicked = pyqtSignal(str)
+
+    @pyqtSlot()
+    def ready(self):
+        self.pageReady.emit()
+
+    @pyqtSlot(str)
+    def clicked(self, code):
+        self.markerClicked.emit(code)
+
+
+class MapView(QWebEngineView):
+    """Map widget that keeps its page and only receives deltas.
+
+    The view keeps the current markers, highlight and viewport itself, so
+    updates made before the page is ready (or after the render process
+    restarts) are replayed once the channel connects.
+    """
+
+    markerClicked = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        install_handler()
+        self.bridge = MapBridge(self)
+        self.bridge.pageReady.connect(self._replay)
+        self.bridge.markerClicked.connect(self.markerClicked)
+        self.channel = QWebChannel(self.page())
+        self.channel.registerObject("bridge", self.bridge)
+        self.page().setWebChannel(self.channel)
+
+        self._markers = {}        # code -> (kind, row)
+        self._highlight = None
+        self._view = None
+        self._density = None
+        self._density_filter = None
+        self._ready = False
+        self._loaded = False
+        self._load_started = None
+
+    def showEvent(self, event):
+        # Sayfa yalnızca ilk gösterimde bir kez yüklenir
+        if not self._loaded:
+            self._loaded = True
+            self._load_started = time.perf_counter()
+            self.setHtml(shell_html(), QUrl.fromLocalFile(os.path.abspath("map_shell.html")))
+        super().showEvent(event)
+
+    def _replay(self):
+        self._ready = True
+        if self._load_started is not None:
+            # Kabuk sayfası yüklenip kanal bağlanana kadar geçen süre
+            elapsed = time.perf_counter() - self._load_started
+            record("map page load", "map", elapsed, self._load_started)
+            self._load_started = None
+        self.bridge.markersSet.emit(_json(self._groups(self._markers.items())))
+        if self._view is not None:
+            self._emit_view(self._view)
+        if self._highlight is not None:
+            self.bridge.highlighted.emit(self._highlight, False)
+        if self._density is not None:
+            self.bridge.densitySet.emit(self._density)
+        if self._density_filter is not None:
+            self.bridge.densityFiltered.emit(*self._density_filter)
+
+    @staticmethod
+    def _groups(items):
+        groups = {}
+        for code, (kind, row) in items:
+            groups.setdefault(kind, []).append(row)
+        return [{"kind": kind, "rows": rows} for kind, rows in groups.items()]
+
+    def _emit_view(self, view):
+        if len(view) == 3:
+            self.bridge.viewChanged.emit(*view)
+        else:
+            self.bridge.boundsFitted.emit(*view)
+
+    def set_markers(self, kind, rows):
+        """Replace every marker with ``rows`` (``[lat, lon, code, ...]``) of ``kind``."""
+        self._markers = {str(row[2]): (kind, row) for row in rows}
+        self._highlight = None
+        if self._ready:
+            self.bridge.markersSet.emit(_json([{"kind": kind, "rows": list(rows)}]))
+
+    def add_markers(self, kind, rows):
+        """Add ``rows``; a row whose code is already on the map replaces that marker."""
+        for row in rows:
+            self._markers[str(row[2])] = (kind, row)
+        if self._ready:
+            self.bridge.markersAdded.emit(_json([{"kind": kind, "rows": list(rows)}]))
+
+    def remove_markers(self, codes):
+        codes = [str(code) for code in codes]
+        for code in codes:
+            self._markers.pop(code, None)
+        if self._highlight in codes:
+            self._highlight = None
+        if self._ready:
+            self.bridge.markersRemoved.emit(_json(codes))
+
+    def highlight(self, code, pan=True):
+        """Highlight the marker ``code`` and bring it into view; None clears the highlight."""
+        self._highlight = None if code is None else str(code)
+        if self._ready:
+            self.bridge.highlighted.emit(self._highlight or "", pan)
+
+    def set_view(self, lat, lon, zoom):
+        self._view = (float(lat), float(lon), int(zoom))
+        if self._ready:
+            self._emit_view(self._view)
+
+    def fit_markers(self):
+        """Fit the viewport to the current markers."""
+        if not self._markers:
+            return
+        lats = [row[0] for _, row in self._markers.values()]
+        lons = [row[1] for _, row in self._markers.values()]
+        self._view = (float(min(lats)), float(min(lons)), float(max(lats)), float(max(lons)))
+        if self._ready:
+            self._emit_view(self._view)
+
+    def set_density(self, payload):
+        """Show pre-aggregated density bins (see ``generate_turkey_map.load_density``)."""
+        self._density = _json({k: v for k, v in payload.items() if k != "source"})
+        self._density_filter = None
+        if self._ready:
+            self.bridge.densitySet.emit(self._density)
+
+    def filter_density(self, min_band, year_from, year_to):
+        self._density_filter = (int(min_band), int(year_from), int(year_to))
+        if self._ready:
+            self.bridge.densityFiltered.emit(*self._density_filter)
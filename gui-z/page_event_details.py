@@ -1,19 +1,16 @@
 from PyQt5.QtWidgets import QWidget, QLabel, QVBoxLayout, QPushButton, QFrame, QScrollArea, QSizePolicy, QHBoxLayout
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPixmap
 import os
+from asc_reader import DEFAULT_ASC_FILE
+from resources import logo_pixmap
+
+SPECTRAL_FEATURE = 7  # SpectralPage'de açılan özellik
 
 class EventDetailsPage(QWidget):
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
 
-        try:
-            with open("style.qss", "r") as file:
-                self.setStyleSheet(file.read())
-        except Exception as e:
-            print(f"Style load failed: {e}")
-
         self.init_ui()
 
     def init_ui(self):
@@ -28,9 +25,7 @@ class EventDetailsPage(QWidget):
         # ✅ Logo header
         header_layout = QHBoxLayout()
         logo_label = QLabel()
-        logo_path = os.path.abspath("quakesense_logo.png")
-        pixmap = QPixmap(logo_path).scaled(120, 120, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        logo_label.setPixmap(pixmap)
+        logo_label.setPixmap(logo_pixmap())
         logo_label.setFixedSize(120, 120)
         logo_label.setAlignment(Qt.AlignLeft | Qt.AlignTop)
         header_layout.addWidget(logo_label)
@@ -77,7 +72,9 @@ class EventDetailsPage(QWidget):
             ("6. Response Spectra",
              "Shows how different structures (with various natural periods) would respond to the earthquake."),
             ("7. P wave, S wave Annotation",
-             "Marks arrival times of fast P-waves and slower S-waves. Important for timing and location analysis.")
+             "Marks arrival times of fast P-waves and slower S-waves. Important for timing and location analysis."),
+            ("8. Spectrogram and Phase Spectrum",
+             "Spectrogram: How the frequency content changes over time (adjustable window and overlap).\nWelch PSD: Averaged power per frequency.\nPhase Spectrum: Fourier phase of the preprocessed signal.")
         ]
 
         for index, (title, tip) in enumerate(features):
@@ -107,7 +104,12 @@ class EventDetailsPage(QWidget):
         page_layout.addWidget(scroll_area)
 
     def open_graph(self, index):
-        self.main_window.page3.display_feature_graph(index)
+        if index == SPECTRAL_FEATURE:
+            # Zaman-frekans görünümü ayrı sayfada
+            self.main_window.page(5).show_record(os.path.abspath(DEFAULT_ASC_FILE))
+            self.main_window.go_to_page(5)
+            return
+        self.main_window.page(3).display_feature_graph(index)
         self.main_window.go_to_page(3)
 
     def create_info_box(self, title, items):
@@ -1,8 +1,60 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QSpacerItem, QSizePolicy, QFrame, QListWidget, QListWidgetItem, QHBoxLayout
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPixmap
-import os
-import pandas as pd
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QSpacerItem, QSizePolicy, QFrame, QListView, QHBoxLayout, QCompleter, QComboBox, QDoubleSpinBox, QDateEdit
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QDate
+from event_catalog import load_catalog
+from profiling import action, span
+from resources import logo_pixmap
+
+# Typeahead only ever shows the first matches in ID order
+MAX_COMPLETIONS = 50
+
+
+class EventListModel(QAbstractListModel):
+    """Read-only view over an array of catalog row positions.
+
+    Rows are exposed to the view in batches through ``fetchMore`` as it
+    scrolls, so resetting to a new filter result costs the same for ten
+    events as for the whole AFAD history.
+    """
+
+    BATCH_SIZE = 256
+
+    def __init__(self, catalog, parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+        self.positions = catalog.order
+        self.loaded = min(self.BATCH_SIZE, len(self.positions))
+
+    def set_positions(self, positions):
+        self.beginResetModel()
+        self.positions = positions
+        self.loaded = min(self.BATCH_SIZE, len(positions))
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.loaded < len(self.positions)
+
+    def fetchMore(self, parent=QModelIndex()):
+        count = min(self.BATCH_SIZE, len(self.positions) - self.loaded)
+        if parent.isValid() or count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self.loaded:
+            return None
+        pos = self.positions[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return str(self.catalog.ids[pos])
+        if role == Qt.ToolTipRole:
+            row = self.catalog.df.iloc[pos]
+            return f"{row['Date']}  M{row['Magnitude']}  {row['Province']} / {row['District']}"
+        return None
+
 
 class EventSelectPage(QWidget):
     def __init__(self, main_window):
@@ -19,9 +71,7 @@ class EventSelectPage(QWidget):
         # ✅ Logo Header
         header_layout = QHBoxLayout()
         logo_label = QLabel()
-        logo_path = os.path.abspath("quakesense_logo.png")
-        pixmap = QPixmap(logo_path).scaled(120, 120, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        logo_label.setPixmap(pixmap)
+        logo_label.setPixmap(logo_pixmap())
         logo_label.setFixedSize(120, 120)
         logo_label.setAlignment(Qt.AlignLeft | Qt.AlignTop)
         header_layout.addWidget(logo_label)
@@ -52,22 +102,71 @@ class EventSelectPage(QWidget):
         self.event_id_input.setPlaceholderText("e.g. 19990817_01")
         self.event_id_input.setFixedHeight(36)
         self.event_id_input.setObjectName("eventInput")
-        self.event_id_input.textEdited.connect(self.hide_id_list)
+        self.event_id_input.textEdited.connect(self.on_text_edited)
         self.event_id_input.mousePressEvent = self.show_event_id_list
         self.layout.addWidget(self.event_id_input)
 
-        # Load test IDs dynamically from CSV
-        self.test_ids = self.load_event_ids()
-
-        self.id_list_widget = QListWidget()
+        # Katalog bir kez yüklenir; liste ve typeahead aynı modeli paylaşır
+        with span("event catalog", "io"):
+            self.catalog = load_catalog()
+        self.event_model = EventListModel(self.catalog, self)
+        self.completion_model = EventListModel(self.catalog, self)
+        self.completion_model.set_positions(self.catalog.order[:MAX_COMPLETIONS])
+
+        # 🔎 Tarih / büyüklük / bölge filtreleri
+        filter_layout = QHBoxLayout()
+        first_date, last_date = self.catalog.date_range()
+        self.date_from = QDateEdit()
+        self.date_to = QDateEdit()
+        for edit, value in ((self.date_from, first_date), (self.date_to, last_date)):
+            edit.setCalendarPopup(True)
+            edit.setDisplayFormat("yyyy-MM-dd")
+            if value is not None:
+                edit.setDateRange(self.to_qdate(first_date), self.to_qdate(last_date))
+                edit.setDate(self.to_qdate(value))
+            edit.dateChanged.connect(self.apply_filters)
+        self.min_magnitude = QDoubleSpinBox()
+        self.min_magnitude.setRange(0.0, 10.0)
+        self.min_magnitude.setSingleStep(0.1)
+        self.min_magnitude.setDecimals(1)
+        self.min_magnitude.setSpecialValueText("Any")
+        self.min_magnitude.valueChanged.connect(self.apply_filters)
+        self.region_combo = QComboBox()
+        self.region_combo.addItem("All regions")
+        self.region_combo.addItems(self.catalog.regions())
+        self.region_combo.currentIndexChanged.connect(self.apply_filters)
+        filter_layout.addWidget(QLabel("From:"))
+        filter_layout.addWidget(self.date_from)
+        filter_layout.addWidget(QLabel("To:"))
+        filter_layout.addWidget(self.date_to)
+        filter_layout.addWidget(QLabel("Min. magnitude:"))
+        filter_layout.addWidget(self.min_magnitude)
+        filter_layout.addWidget(self.region_combo)
+        self.layout.addLayout(filter_layout)
+
+        # Sanal liste: yalnızca görünen satırlar çizilir
+        self.id_list_widget = QListView()
         self.id_list_widget.setObjectName("eventList")
+        self.id_list_widget.setUniformItemSizes(True)
+        self.id_list_widget.setModel(self.event_model)
         self.id_list_widget.setVisible(False)
-        for eid in self.test_ids:
-            item = QListWidgetItem(eid)
-            self.id_list_widget.addItem(item)
-        self.id_list_widget.itemClicked.connect(self.select_event_id)
+        self.id_list_widget.clicked.connect(self.select_event_id)
         self.layout.addWidget(self.id_list_widget)
 
+        # ⌨️ Typeahead: önek indeksinden gelen ilk eşleşmeler; completer yeniden süzmez
+        # (QCompleter tüm modeli okur, bu yüzden ona yalnızca kısa liste verilir)
+        popup = QListView()
+        popup.setObjectName("eventList")
+        popup.setUniformItemSizes(True)
+        self.completer = QCompleter(self.completion_model, self)
+        self.completer.setPopup(popup)
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.setModelSorting(QCompleter.CaseInsensitivelySortedModel)
+        self.completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self.completer.setMaxVisibleItems(12)
+        self.completer.activated[str].connect(self.select_completion)
+        self.event_id_input.setCompleter(self.completer)
+
         self.back_button = QPushButton("← Back to Welcome")
         self.back_button.setFixedHeight(36)
         self.back_button.setObjectName("backButton")
@@ -91,14 +190,39 @@ class EventSelectPage(QWidget):
 
         self.setLayout(page_layout)
 
-    def load_event_ids(self):
-        try:
-            df = pd.read_csv("events.csv", encoding="utf-8")
-            df['EventID'] = df['EventID'].astype(str).str.strip()
-            return df['EventID'].dropna().tolist()
-        except Exception as e:
-            print(f"[ERROR] Failed to load Event IDs: {e}")
-            return []
+    @staticmethod
+    def to_qdate(value):
+        year, month, day = (int(part) for part in str(value).split("-"))
+        return QDate(year, month, day)
+
+    def filter_options(self):
+        first_date, last_date = self.catalog.date_range()
+        options = {"prefix": self.event_id_input.text()}
+        # Tam aralık seçiliyse tarihi olmayan olaylar da listede kalır
+        if first_date is not None:
+            date_from = self.date_from.date().toString("yyyy-MM-dd")
+            date_to = self.date_to.date().toString("yyyy-MM-dd")
+            if date_from != str(first_date):
+                options["date_from"] = date_from
+            if date_to != str(last_date):
+                options["date_to"] = date_to
+        if self.min_magnitude.value() > self.min_magnitude.minimum():
+            options["min_magnitude"] = self.min_magnitude.value()
+        if self.region_combo.currentIndex() > 0:
+            options["region"] = self.region_combo.currentText()
+        return options
+
+    def apply_filters(self):
+        with action("Filter events"):
+            with span("catalog filter", "compute"):
+                positions = self.catalog.filter(**self.filter_options())
+            with span("event list", "ui"):
+                self.event_model.set_positions(positions)
+                self.completion_model.set_positions(positions[:MAX_COMPLETIONS])
+
+    def on_text_edited(self, text):
+        self.hide_id_list()
+        self.apply_filters()
 
     def show_event_id_list(self, event):
         self.id_list_widget.setVisible(True)
@@ -107,24 +231,24 @@ class EventSelectPage(QWidget):
     def hide_id_list(self):
         self.id_list_widget.setVisible(False)
 
-    def select_event_id(self, item):
-        self.event_id_input.setText(item.text())
+    def select_event_id(self, index):
+        self.event_id_input.setText(index.data())
         self.id_list_widget.setVisible(False)
         self.go_to_next_page()
 
+    def select_completion(self, event_id):
+        self.event_id_input.setText(event_id)
+        self.go_to_next_page()
+
     def go_to_next_page(self):
         event_id = self.event_id_input.text().strip()
         if event_id:
-            try:
-                df = pd.read_csv("events.csv", encoding="utf-8")
-                df['EventID'] = df['EventID'].astype(str).str.strip()
-                row = df[df['EventID'] == event_id]
-                if not row.empty:
-                    self.main_window.selected_event_id = event_id
-                    self.main_window.selected_event_row = row.iloc[0]
-                    self.main_window.page2.display_event_details(self.main_window.selected_event_row)
+            row = self.catalog.row(event_id)
+            if row is not None:
+                self.main_window.selected_event_id = event_id
+                self.main_window.selected_event_row = row
+                with action("Open event"):
+                    self.main_window.page(2).display_event_details(self.main_window.selected_event_row)
                     self.main_window.go_to_page(2)
-                else:
-                    print(f"[WARN] Event ID '{event_id}' not found in CSV.")
-            except Exception as e:
-                print(f"[ERROR] Cannot load events.csv: {e}")
+            else:
+                print(f"[WARN] Event ID '{event_id}' not found in CSV.")
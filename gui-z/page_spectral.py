@@ -0,0 +1,231 @@
+from PyQt5.QtWidgets import (QWidget, QLabel, QVBoxLayout, QPushButton, QHBoxLayout, QProgressBar, QDoubleSpinBox,
+                             QSlider, QComboBox)
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
+from matplotlib.figure import Figure
+from PyQt5.QtCore import Qt, QTimer
+import numpy as np
+from feature_compute import DEFAULT_OVERLAP, DEFAULT_STFT_WINDOW_S, compute_spectral_view
+from profiling import begin, finish, span
+from spectral_engine import DEFAULT_WINDOW, WINDOWS
+from worker_pool import WorkerPool
+from resources import logo_pixmap
+
+# Spektrogram renk aralığı (tepe değerin altında dB)
+DYNAMIC_RANGE_DB = 80.0
+SCRUB_DELAY_MS = 30
+
+
+class SpectralPage(QWidget):
+    """Spectrogram, Welch PSD and Fourier phase spectrum of one record.
+
+    Window length, overlap and taper re-run only the short-time part on the
+    worker pool; the phase spectrum is computed once per record.
+    """
+
+    def __init__(self, main_window):
+        super().__init__()
+        self.main_window = main_window
+        self.record_path = None
+        self.phase_pending = False
+        self.image = None
+
+        self.layout = QVBoxLayout()
+        self.setLayout(self.layout)
+
+        # ✅ LOGO ekle (sol üstte 120x120)
+        logo_layout = QHBoxLayout()
+        logo_label = QLabel()
+        logo_label.setPixmap(logo_pixmap())
+        logo_label.setFixedSize(120, 120)
+        logo_label.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        logo_layout.addWidget(logo_label)
+        logo_layout.addStretch()
+        self.layout.addLayout(logo_layout)
+
+        self.title = QLabel("Spectrogram & Phase Spectrum")
+        self.title.setObjectName("titleLabel")
+        self.layout.addWidget(self.title)
+
+        # ⏳ Hesaplama sürerken gösterilen meşgul çubuğu
+        self.busy_bar = QProgressBar()
+        self.busy_bar.setObjectName("busyBar")
+        self.busy_bar.setRange(0, 0)
+        self.busy_bar.setTextVisible(False)
+        self.busy_bar.setFixedHeight(6)
+        self.busy_bar.setVisible(False)
+        self.layout.addWidget(self.busy_bar)
+
+        # 🎚️ Pencere uzunluğu, örtüşme ve pencere tipi; değiştikçe spektrogram yenilenir
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Window (s):"))
+        self.window_spin = QDoubleSpinBox()
+        self.window_spin.setObjectName("windowSpin")
+        self.window_spin.setDecimals(2)
+        self.window_spin.setRange(0.05, 120.0)
+        self.window_spin.setSingleStep(0.25)
+        self.window_spin.setValue(DEFAULT_STFT_WINDOW_S)
+        controls.addWidget(self.window_spin)
+
+        controls.addWidget(QLabel("Overlap:"))
+        self.overlap_slider = QSlider(Qt.Horizontal)
+        self.overlap_slider.setObjectName("overlapSlider")
+        self.overlap_slider.setRange(0, 95)
+        self.overlap_slider.setValue(int(DEFAULT_OVERLAP * 100))
+        self.overlap_slider.setFixedWidth(200)
+        controls.addWidget(self.overlap_slider)
+        self.overlap_label = QLabel()
+        self.overlap_label.setFixedWidth(40)
+        controls.addWidget(self.overlap_label)
+
+        controls.addWidget(QLabel("Taper:"))
+        self.window_combo = QComboBox()
+        self.window_combo.addItems(list(WINDOWS))
+        self.window_combo.setCurrentText(DEFAULT_WINDOW)
+        controls.addWidget(self.window_combo)
+        controls.addStretch()
+        self.layout.addLayout(controls)
+
+        # Sürükleme sırasında art arda gelen değişiklikler tek işe toplanır
+        self.scrub_timer = QTimer(self)
+        self.scrub_timer.setSingleShot(True)
+        self.scrub_timer.setInterval(SCRUB_DELAY_MS)
+        self.scrub_timer.timeout.connect(self.run)
+        self.window_spin.valueChanged.connect(self.scrub_timer.start)
+        self.overlap_slider.valueChanged.connect(self.on_overlap_changed)
+        self.window_combo.currentTextChanged.connect(self.scrub_timer.start)
+        self.on_overlap_changed(self.overlap_slider.value())
+
+        self.figure = Figure(figsize=(10, 6))
+        self.canvas = FigureCanvas(self.figure)
+        self.toolbar = NavigationToolbar(self.canvas, self)
+        self.layout.addWidget(self.toolbar)
+        self.layout.addWidget(self.canvas)
+        self.build_axes()
+
+        self.back_button = QPushButton("← Back to Features")
+        self.back_button.setObjectName("backButton")
+        self.back_button.clicked.connect(self.leave_page)
+        self.layout.addWidget(self.back_button)
+
+        footer = QLabel("© 2025 QuakeSense | Developed at Kadir Has University")
+        footer.setObjectName("footerLabel")
+        footer.setAlignment(Qt.AlignCenter)
+        self.layout.addWidget(footer)
+
+        self.workers = WorkerPool(self)
+        self.workers.busy_changed.connect(self.set_busy)
+        self.workers.progress.connect(self.set_progress)
+        self.workers.finished.connect(self.on_result)
+        self.workers.failed.connect(self.on_failed)
+
+    def build_axes(self):
+        grid = self.figure.add_gridspec(2, 2, height_ratios=[3, 2], left=0.07, right=0.98, top=0.94, bottom=0.09,
+                                        hspace=0.45, wspace=0.2)
+        self.spec_ax = self.figure.add_subplot(grid[0, :])
+        self.psd_ax = self.figure.add_subplot(grid[1, 0])
+        self.phase_ax = self.figure.add_subplot(grid[1, 1])
+
+        # 🔠 Yazı boyutları
+        for ax, title, xlabel, ylabel in (
+                (self.spec_ax, "Spectrogram (PSD, dB)", "Time (s)", "Frequency (Hz)"),
+                (self.psd_ax, "Welch Power Spectral Density", "Frequency (Hz)", "PSD"),
+                (self.phase_ax, "Fourier Phase Spectrum", "Frequency (Hz)", "Phase (rad)")):
+            ax.set_title(title, fontsize=10, pad=6)
+            ax.set_xlabel(xlabel, fontsize=9)
+            ax.set_ylabel(ylabel, fontsize=9)
+            ax.tick_params(axis='both', labelsize=8)
+        self.psd_ax.set_yscale("log")
+        self.psd_ax.grid(True, linestyle="--", linewidth=0.5)
+        self.phase_ax.grid(True, linestyle="--", linewidth=0.5)
+        self.phase_ax.set_ylim(-np.pi, np.pi)
+        self.psd_line, = self.psd_ax.plot([], [], color="navy", linewidth=1)
+        self.phase_line, = self.phase_ax.plot([], [], color="red", linestyle="none", marker=".", markersize=1.5)
+
+    def show_record(self, path):
+        self.record_path = path
+        self.phase_pending = True
+        # Kurulumdaki kontrol değişikliklerinden kalan gecikmeli çalıştırma gereksiz
+        self.scrub_timer.stop()
+        self.run()
+
+    def options(self):
+        return {
+            "window_s": self.window_spin.value(),
+            "overlap": self.overlap_slider.value() / 100.0,
+            "window": self.window_combo.currentText(),
+        }
+
+    def run(self):
+        if self.record_path is None:
+            return
+        # Faz spektrumu kayıt başına bir kez; yeni iş öncekinin yerini alırsa yeniden istenir
+        begin("Spectrogram")
+        self.workers.submit(compute_spectral_view, self.record_path, with_progress=True,
+                            with_phase=self.phase_pending, **self.options())
+
+    def on_overlap_changed(self, value):
+        self.overlap_label.setText(f"{value}%")
+        self.scrub_timer.start()
+
+    def set_busy(self, busy):
+        self.busy_bar.setVisible(busy)
+        self.busy_bar.setRange(0, 0)
+
+    def set_progress(self, fraction):
+        if fraction >= 1.0:
+            self.busy_bar.setRange(0, 0)
+        else:
+            self.busy_bar.setRange(0, 1000)
+            self.busy_bar.setValue(int(fraction * 1000))
+
+    def on_failed(self, job_id, message):
+        self.spec_ax.set_title(f"Error: {message}", fontsize=10, pad=6)
+        self.canvas.draw_idle()
+        finish("failed")
+
+    def on_result(self, job_id, result):
+        with span("draw", "draw"):
+            self.draw_result(result)
+        finish()
+
+    def draw_result(self, result):
+        spec = result["spectrogram"]
+        with np.errstate(divide="ignore"):
+            db = 10 * np.log10(spec.power.T)
+        top = np.nanmax(db[np.isfinite(db)]) if np.isfinite(db).any() else 0.0
+        half_step = (spec.times[1] - spec.times[0]) / 2 if len(spec.times) > 1 else spec.times[0]
+        extent = [spec.times[0] - half_step, spec.times[-1] + half_step, spec.freqs[0], spec.freqs[-1]]
+        if self.image is None:
+            self.image = self.spec_ax.imshow(db, origin="lower", aspect="auto", extent=extent, cmap="viridis",
+                                             interpolation="nearest")
+            self.colorbar = self.figure.colorbar(self.image, ax=self.spec_ax, pad=0.01)
+            self.colorbar.ax.tick_params(labelsize=8)
+        else:
+            self.image.set_data(db)
+            self.image.set_extent(extent)
+        self.image.set_clim(top - DYNAMIC_RANGE_DB, top)
+        self.spec_ax.set_xlim(extent[0], extent[1])
+        self.spec_ax.set_ylim(extent[2], extent[3])
+        self.spec_ax.set_title(f"Spectrogram (PSD, dB) – {spec.nperseg} samples/segment, step {spec.step}",
+                               fontsize=10, pad=6)
+
+        freqs, psd = result["welch"]
+        self.psd_line.set_data(freqs[1:], psd[1:])
+        self.psd_ax.relim()
+        self.psd_ax.autoscale_view()
+
+        if "spectrum" in result:
+            self.phase_pending = False
+            phase = result["spectrum"]
+            self.phase_line.set_data(phase.freqs, phase.phase)
+            self.phase_ax.set_xlim(phase.freqs[0], phase.freqs[-1])
+        # Yalnızca en son işin sonucu gelir; hemen çizmek süre ölçümünü de kapsar
+        self.canvas.draw()
+
+    def leave_page(self):
+        if self.workers.is_busy():
+            finish("cancelled")
+        self.workers.cancel()
+        self.scrub_timer.stop()
+        self.main_window.go_to_page(2)
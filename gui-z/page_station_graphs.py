@@ -1,12 +1,50 @@
 
-from PyQt5.QtWidgets import QWidget, QLabel, QVBoxLayout, QPushButton, QComboBox, QHBoxLayout
-from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PyQt5.QtCore import QUrl, Qt
-from PyQt5.QtGui import QPixmap
-import pandas as pd
-import os
+from PyQt5.QtWidgets import (QWidget, QLabel, QVBoxLayout, QPushButton, QComboBox, QHBoxLayout, QProgressBar,
+                             QTableWidget, QTableWidgetItem, QAbstractItemView, QHeaderView)
+from PyQt5.QtCore import Qt
+import math
 import time
-from generate_station_map import generate_station_map
+import pandas as pd
+from event_catalog import load_catalog
+from generate_station_map import station_rows
+from intensity_measures import CM_PER_M, G
+from map_bridge import MapView
+from profiling import record, span
+from station_measures import STANDARD_PERIODS, measure_event, parse_origin
+from station_registry import DEFAULT_RADIUS_KM, load_registry
+from worker_pool import WorkerPool
+from resources import logo_pixmap
+
+STATION_ZOOM = 7
+COMPONENT_LABELS = {"N": "NS", "E": "EW", "Z": "UD"}
+
+# Tablo sütunları: (başlık, StationMeasures alanı); PSA sütunları periyot başına
+MEASURE_COLUMNS = [
+    ("PGA (cm/s²)", "pga_cm_s2"),
+    ("PGV (cm/s)", "pgv_cm_s"),
+    ("PGD (cm)", "pgd_cm"),
+    ("Arias (m/s)", "arias_m_s"),
+]
+
+
+class NumericItem(QTableWidgetItem):
+    """Table cell sorted by its value; missing values sort after every number."""
+
+    def __init__(self, value, digits=4):
+        missing = value is None or not math.isfinite(value)
+        super().__init__("–" if missing else f"{value:.{digits}g}")
+        self.value = math.inf if missing else float(value)
+        self.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+
+    def __lt__(self, other):
+        if not isinstance(other, NumericItem):
+            return super().__lt__(other)
+        if math.isinf(self.value) or math.isinf(other.value):
+            # Boş hücreler iki yönde de en altta kalır
+            table = self.tableWidget()
+            descending = table is not None and table.horizontalHeader().sortIndicatorOrder() == Qt.DescendingOrder
+            return math.isinf(self.value) == descending and math.isinf(self.value) != math.isinf(other.value)
+        return self.value < other.value
 
 
 class StationAnalysisPage(QWidget):
@@ -14,22 +52,23 @@ class StationAnalysisPage(QWidget):
         super().__init__()
         self.main_window = main_window
         self.event_id = None
+        self.measures = {}
+        self.measure_start = None
         self.init_ui()
 
+        self.workers = WorkerPool(self)
+        self.workers.busy_changed.connect(self.set_busy)
+        self.workers.progress.connect(self.set_progress)
+        self.workers.partial.connect(self.add_measures)
+        self.workers.finished.connect(self.on_measures_done)
+        self.workers.failed.connect(self.on_measures_failed)
+
     def init_ui(self):
         main_layout = QVBoxLayout(self)
 
-        try:
-            with open("style.qss", "r") as file:
-                self.setStyleSheet(file.read())
-        except Exception as e:
-            print(f"Style load failed: {e}")
-
         logo_layout = QHBoxLayout()
         logo_label = QLabel()
-        logo_path = os.path.abspath("quakesense_logo.png")
-        pixmap = QPixmap(logo_path).scaled(120, 120, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        logo_label.setPixmap(pixmap)
+        logo_label.setPixmap(logo_pixmap())
         logo_label.setFixedSize(120, 120)
         logo_label.setAlignment(Qt.AlignLeft | Qt.AlignTop)
         logo_layout.addWidget(logo_label)
@@ -39,14 +78,14 @@ class StationAnalysisPage(QWidget):
         top_bar = QHBoxLayout()
         self.back_btn = QPushButton("← Back")
         self.back_btn.setObjectName("smallBackButton")
-        self.back_btn.clicked.connect(lambda: self.main_window.go_to_page(3))
+        self.back_btn.clicked.connect(lambda: self.leave_page(3))
         top_bar.addWidget(self.back_btn)
 
         top_bar.addStretch()
 
         self.home_btn = QPushButton("⏮ Home")
         self.home_btn.setObjectName("smallHomeButton")
-        self.home_btn.clicked.connect(lambda: self.main_window.go_to_page(1))
+        self.home_btn.clicked.connect(lambda: self.leave_page(1))
         top_bar.addWidget(self.home_btn)
         main_layout.addLayout(top_bar)
 
@@ -68,8 +107,42 @@ class StationAnalysisPage(QWidget):
         self.info_label.setObjectName("infoBox")
         main_layout.addWidget(self.info_label)
 
-        self.map_view = QWebEngineView()
+        # Kayıtlardan hesaplanan ölçüler; istasyonlar bittikçe satır eklenir
+        self.measure_label = QLabel("")
+        self.measure_label.setObjectName("measureLabel")
+        main_layout.addWidget(self.measure_label)
+
+        self.busy_bar = QProgressBar()
+        self.busy_bar.setObjectName("busyBar")
+        self.busy_bar.setRange(0, 0)
+        self.busy_bar.setTextVisible(False)
+        self.busy_bar.setFixedHeight(6)
+        self.busy_bar.setVisible(False)
+        main_layout.addWidget(self.busy_bar)
+
+        headers = ["Station", "Distance (km)"] + [title for title, _ in MEASURE_COLUMNS]
+        headers += [f"PSA {period:g} s (cm/s²)" for period in STANDARD_PERIODS]
+        self.measure_table = QTableWidget(0, len(headers))
+        self.measure_table.setObjectName("measureTable")
+        self.measure_table.setHorizontalHeaderLabels(headers)
+        for column in range(2, len(headers)):
+            self.measure_table.horizontalHeaderItem(column).setToolTip("Larger horizontal component, 5 % damping.")
+        self.measure_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.measure_table.verticalHeader().setVisible(False)
+        self.measure_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.measure_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.measure_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.measure_table.setSortingEnabled(True)
+        self.measure_table.sortByColumn(1, Qt.AscendingOrder)
+        self.measure_table.setMinimumHeight(180)
+        self.measure_table.cellClicked.connect(
+            lambda row, column: self.select_station(self.measure_table.item(row, 0).text()))
+        main_layout.addWidget(self.measure_table)
+
+        # Harita sayfası bir kez yüklenir; istasyonlar ve seçim QWebChannel ile gönderilir
+        self.map_view = MapView()
         self.map_view.setMinimumHeight(400)
+        self.map_view.markerClicked.connect(self.select_station)
         main_layout.addWidget(self.map_view)
 
         footer = QLabel("© 2025 QuakeSense | Developed at Kadir Has University")
@@ -78,22 +151,102 @@ class StationAnalysisPage(QWidget):
         main_layout.addWidget(footer)
 
     def set_event_id(self, event_id):
-        from PyQt5.QtCore import QUrl
-        import time
-
         self.event_id = event_id
-        html_path = os.path.abspath("station_map.html")
-        if os.path.exists(html_path):
-            try:
-                os.remove(html_path)
-            except Exception as e:
-                print("Harita silinemedi:", e)
+        with span("stations for event", "io"):
+            self.load_station_data(event_id=event_id)
+
+        with span("station markers", "map"):
+            if not self.station_df.empty:
+                first = self.station_df.iloc[0]
+                self.map_view.set_markers("station", station_rows(self.station_df))
+                self.map_view.set_view(first['Latitude'], first['Longitude'], STATION_ZOOM)
+            else:
+                self.map_view.set_markers("station", [])
+
+        with span("station list", "ui"):
+            self.fill_station_list()
+
+        self.measure_records()
 
-        generate_station_map(event_id)
-        time.sleep(0.2)
+    def measure_records(self):
+        # Her istasyonun kaydı arka planda paralel ölçülür; sonuçlar geldikçe tabloya eklenir
+        self.measures = {}
+        self.measure_table.setRowCount(0)
+        self.measure_label.setText("🔎 Looking for the records of this event...")
+        origin = None
+        event = load_catalog().row(self.event_id)
+        if event is not None:
+            origin = parse_origin(event.get("Date"), event.get("Time"))
+        self.measure_start = time.perf_counter()
+        self.workers.submit(measure_event, self.event_id, origin, with_progress=True, with_partial=True)
 
-        self.load_station_data(event_id=event_id)
+    def station_distance(self, result):
+        if not self.station_df.empty and "Distance_km" in self.station_df.columns:
+            row = self.station_df[self.station_df['Code'].astype(str) == result.station_code]
+            if not row.empty:
+                return float(row.iloc[0]['Distance_km'])
+        return result.epicentral_distance_km
 
+    def add_measures(self, result):
+        self.measures[result.station_code] = result
+        table = self.measure_table
+        # Sıralama ekleme sırasında kapalı; yoksa satır, hücreler dolarken yer değiştirir
+        table.setSortingEnabled(False)
+        row = table.rowCount()
+        table.insertRow(row)
+        code_item = QTableWidgetItem(result.station_code)
+        table.setItem(row, 0, code_item)
+        table.setItem(row, 1, NumericItem(self.station_distance(result)))
+        if result.error:
+            code_item.setToolTip(result.error)
+            for column in range(2, table.columnCount()):
+                table.setItem(row, column, NumericItem(None))
+        else:
+            for column, (_, name) in enumerate(MEASURE_COLUMNS, start=2):
+                table.setItem(row, column, NumericItem(result.horizontal(name)))
+            psa = result.horizontal("psa_cm_s2")
+            for column, value in enumerate(psa, start=2 + len(MEASURE_COLUMNS)):
+                table.setItem(row, column, NumericItem(value))
+        table.setSortingEnabled(True)
+
+        if self.station_combo.findText(result.station_code) < 0:
+            self.station_combo.addItem(result.station_code)
+        if result.station_code == self.station_combo.currentText():
+            self.display_station_info()
+        self.show_measure_count()
+
+    def show_measure_count(self, done=False):
+        failed = sum(1 for r in self.measures.values() if r.error)
+        text = f"📈 Measured {len(self.measures) - failed} station record(s)"
+        if not done:
+            text += " so far..."
+        if failed:
+            text += f" · {failed} failed (hover the station code for the error)"
+        self.measure_label.setText(text)
+
+    def set_busy(self, busy):
+        self.busy_bar.setVisible(busy)
+        self.busy_bar.setRange(0, 0)
+
+    def set_progress(self, fraction):
+        self.busy_bar.setRange(0, 1000)
+        self.busy_bar.setValue(int(fraction * 1000))
+
+    def on_measures_done(self, job_id, results):
+        record("station measures", "compute", time.perf_counter() - self.measure_start, self.measure_start)
+        if not results:
+            self.measure_label.setText("No waveform records found for this event.")
+            return
+        self.show_measure_count(done=True)
+
+    def on_measures_failed(self, job_id, message):
+        self.measure_label.setText(f"Error measuring station records: {message}")
+
+    def leave_page(self, index):
+        self.workers.cancel()
+        self.main_window.go_to_page(index)
+
+    def fill_station_list(self):
         self.station_combo.blockSignals(True)
         self.station_combo.clear()
 
@@ -105,19 +258,17 @@ class StationAnalysisPage(QWidget):
             self.station_combo.setCurrentIndex(0)
             self.display_station_info()
         else:
+            self.station_combo.blockSignals(False)
             self.info_label.setText("No station data found for this event.")
-            self.map_view.setHtml("<h3>No map available</h3>")
-
-        self.map_view.setUrl(QUrl.fromLocalFile(html_path))
-        self.map_view.reload()
 
-    def load_station_data(self, event_id=None, path='stations.csv'):
+    def load_station_data(self, event_id=None, path='stations.csv', radius_km=DEFAULT_RADIUS_KM):
         try:
-            self.station_df = pd.read_csv(path)
-            self.station_df.dropna(subset=['Code'], inplace=True)
-
+            registry = load_registry(path)
             if event_id:
-                self.station_df = self.station_df[self.station_df['EventID'].astype(str) == str(event_id)]
+                # Merkez üssüne radius_km içindeki istasyonlar, en yakından başlayarak
+                self.station_df = registry.for_event(event_id, radius_km)
+            else:
+                self.station_df = registry.station_table(range(len(registry)))
 
         except Exception as e:
             self.info_label.setText(f"Error loading station data: {e}")
@@ -128,23 +279,65 @@ class StationAnalysisPage(QWidget):
             return
 
         current_code = self.station_combo.currentText()
-        row = self.station_df[self.station_df['Code'].astype(str) == current_code]
-        if not row.empty:
+        measures = self.measures.get(current_code)
+        row = self.station_df[self.station_df['Code'].astype(str) == current_code] if not self.station_df.empty else []
+        if len(row) == 0 and measures is not None:
+            # Kaydı olan ama istasyon listesinde bulunmayan istasyon
+            self.info_label.setText(f"<b>Station Code:</b> {current_code}<br><br>" + self.format_measures(measures))
+            self.info_label.setTextFormat(1)
+            self.map_view.highlight(current_code)
+        elif len(row) > 0:
             info = row.iloc[0]
             text = (
                 f"<b>Station Code:</b> {info['Code']}<br>"
                 f"<b>Location:</b> {info['Latitude']}°N, {info['Longitude']}°E<br>"
-                f"<b>Province/District:</b> {info['Province']}, {info['District']}<br><br>"
+                f"<b>Province/District:</b> {info['Province']}, {info['District']}<br>"
+                f"<b>Epicentral distance:</b> {info.get('Distance_km', '-')} km<br><br>"
                 f"<b>Geological Info:</b><br>"
                 f"• Lithology: {info['Litology']}<br>"
                 f"• Vs30: {info['Vs30']} m/s<br>"
                 f"• Morphology: {info['Morphology']}<br><br>"
-                f"<b>Peak Ground Accelerations:</b><br>"
-                f"• PGA_NS: {info['PGA_NS']} g<br>"
-                f"• PGA_EW: {info['PGA_EW']} g<br>"
-                f"• PGA_UD: {info['PGA_UD']} g"
             )
+            if measures is not None:
+                text += self.format_measures(measures)
+            else:
+                text += (
+                    f"<b>Peak Ground Accelerations (stations.csv):</b><br>"
+                    f"• PGA_NS: {self.format_pga(info.get('PGA_NS'))}<br>"
+                    f"• PGA_EW: {self.format_pga(info.get('PGA_EW'))}<br>"
+                    f"• PGA_UD: {self.format_pga(info.get('PGA_UD'))}"
+                )
             self.info_label.setText(text)
             self.info_label.setTextFormat(1)
+            self.map_view.highlight(current_code)
         else:
             self.info_label.setText("No data available for the selected station.")
+
+    def select_station(self, code):
+        # Haritada tıklanan istasyon listede de seçilir
+        index = self.station_combo.findText(code)
+        if index >= 0:
+            self.station_combo.setCurrentIndex(index)
+
+    @staticmethod
+    def format_measures(result):
+        if result.error:
+            return f"<b>Ground motion (from records):</b><br>Could not be computed: {result.error}"
+        lines = ["<b>Ground motion (from records):</b>"]
+        for i, component in enumerate(result.components):
+            pga = result.pga_cm_s2[i]
+            label = COMPONENT_LABELS.get(component, component)
+            lines.append(
+                f"• {label}: PGA {pga:.4g} cm/s² ({pga / (G * CM_PER_M):.3g} g), "
+                f"PGV {result.pgv_cm_s[i]:.4g} cm/s, PGD {result.pgd_cm[i]:.4g} cm, "
+                f"Arias {result.arias_m_s[i]:.4g} m/s"
+            )
+        psa = result.horizontal("psa_cm_s2")
+        values = ", ".join(f"{period:g} s: {value:.4g}" for period, value in zip(result.periods, psa))
+        lines.append(f"• PSA (larger horizontal, 5 %): {values} cm/s²")
+        return "<br>".join(lines)
+
+    @staticmethod
+    def format_pga(value):
+        # Yarıçap içindeki ama bu olay için kaydı olmayan istasyonlar
+        return "not recorded" if pd.isna(value) else f"{value} g"
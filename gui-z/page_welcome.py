@@ -1,67 +1,111 @@
-from PyQt5.QtWidgets import QWidget, QLabel, QVBoxLayout, QPushButton
-from PyQt5.QtCore import Qt, QUrl
-from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PyQt5.QtGui import QPixmap
-import os
-
-class WelcomePage(QWidget):
-    def __init__(self, main_window):
-        super().__init__()
-        self.main_window = main_window
-        self.init_ui()
-
-    def init_ui(self):
-        outer_layout = QVBoxLayout()
-        outer_layout.setContentsMargins(100, 40, 100, 60)
-        outer_layout.setSpacing(0)
-
-        # 🟦 LOGO (BÜYÜK VE ŞEFFAF)
-        logo_label = QLabel()
-        logo_path = os.path.abspath("quakesense_logo.png")
-        pixmap = QPixmap(logo_path).scaled(120, 120, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        logo_label.setPixmap(pixmap)
-        logo_label.setAlignment(Qt.AlignCenter)
-        logo_label.setStyleSheet("background: transparent; margin-bottom: 6px;")
-
-        # 🟦 BAŞLIK
-        title = QLabel("👋 Welcome to QuakeSense")
-        title.setObjectName("titleLabel")
-        title.setAlignment(Qt.AlignCenter)
-        title.setStyleSheet("font-size: 26px; font-weight: bold; background: transparent;")
-
-        outer_layout.addWidget(logo_label)
-        outer_layout.addWidget(title)
-
-        # 📋 AÇIKLAMA
-        desc = QLabel("""<b>This application helps you analyze earthquake records using event IDs from the Turkish AFAD database.</b><br><br>
-• View peak ground motion parameters<br>
-• Explore Fourier spectra, response, duration and station data<br>
-• Get graphs & interpretations<br><br>
-Below is a dynamic earthquake activity map of Turkey.
-""")
-        desc.setWordWrap(True)
-        desc.setAlignment(Qt.AlignTop)
-        desc.setObjectName("descLabel")
-        outer_layout.addWidget(desc)
-
-        # 🗺️ HARİTA
-        map_view = QWebEngineView()
-        html_path = os.path.abspath("turkey_earthquake_map.html")
-        map_view.setUrl(QUrl.fromLocalFile(html_path))
-        map_view.setMinimumHeight(400)
-        outer_layout.addWidget(map_view)
-
-        # 🔘 BAŞLAT BUTONU
-        start_button = QPushButton("→ Get Started")
-        start_button.setObjectName("nextButton")
-        start_button.clicked.connect(lambda: self.main_window.go_to_page(1))
-        outer_layout.addWidget(start_button)
-
-        # 🔻 FOOTER
-        outer_layout.addStretch()
-        footer = QLabel("© 2025 QuakeSense | Developed at Kadir Has University")
-        footer.setObjectName("footerLabel")
-        footer.setAlignment(Qt.AlignCenter)
-        outer_layout.addWidget(footer)
-
-        self.setLayout(outer_layout)
+from PyQt5.QtWidgets import QWidget, QLabel, QVBoxLayout, QHBoxLayout, QPushButton, QSlider, QComboBox
+from PyQt5.QtCore import Qt, QTimer
+from profiling import action, span
+from resources import logo_pixmap
+
+class WelcomePage(QWidget):
+    def __init__(self, main_window):
+        super().__init__()
+        self.main_window = main_window
+        self.init_ui()
+
+    def init_ui(self):
+        outer_layout = QVBoxLayout()
+        outer_layout.setContentsMargins(100, 40, 100, 60)
+        outer_layout.setSpacing(0)
+
+        # 🟦 LOGO (BÜYÜK VE ŞEFFAF)
+        logo_label = QLabel()
+        logo_label.setPixmap(logo_pixmap())
+        logo_label.setAlignment(Qt.AlignCenter)
+        logo_label.setStyleSheet("background: transparent; margin-bottom: 6px;")
+
+        # 🟦 BAŞLIK
+        title = QLabel("👋 Welcome to QuakeSense")
+        title.setObjectName("titleLabel")
+        title.setAlignment(Qt.AlignCenter)
+        title.setStyleSheet("font-size: 26px; font-weight: bold; background: transparent;")
+
+        outer_layout.addWidget(logo_label)
+        outer_layout.addWidget(title)
+
+        # 📋 AÇIKLAMA
+        desc = QLabel("""<b>This application helps you analyze earthquake records using event IDs from the Turkish AFAD database.</b><br><br>
+• View peak ground motion parameters<br>
+• Explore Fourier spectra, response, duration and station data<br>
+• Get graphs & interpretations<br><br>
+Below is a dynamic earthquake activity map of Turkey.
+""")
+        desc.setWordWrap(True)
+        desc.setAlignment(Qt.AlignTop)
+        desc.setObjectName("descLabel")
+        outer_layout.addWidget(desc)
+
+        # 🗺️ HARİTA (ilk çizimden sonra kurulur; folium/pandas açılışı geciktirmez)
+        self.map_area = QVBoxLayout()
+        self.map_placeholder = QLabel("Loading map…")
+        self.map_placeholder.setAlignment(Qt.AlignCenter)
+        self.map_placeholder.setMinimumHeight(400)
+        self.map_area.addWidget(self.map_placeholder)
+        outer_layout.addLayout(self.map_area)
+        QTimer.singleShot(0, self.load_map)
+
+        # 🔘 BAŞLAT BUTONU
+        start_button = QPushButton("→ Get Started")
+        start_button.setObjectName("nextButton")
+        start_button.clicked.connect(lambda: self.main_window.go_to_page(1))
+        outer_layout.addWidget(start_button)
+
+        # 🔻 FOOTER
+        outer_layout.addStretch()
+        footer = QLabel("© 2025 QuakeSense | Developed at Kadir Has University")
+        footer.setObjectName("footerLabel")
+        footer.setAlignment(Qt.AlignCenter)
+        outer_layout.addWidget(footer)
+
+        self.setLayout(outer_layout)
+
+    def load_map(self):
+        with action("Welcome map"):
+            self.build_map()
+
+    def build_map(self):
+        with span("import map modules", "map"):
+            from generate_turkey_map import MAG_EDGES, load_density
+            from map_bridge import MapView
+
+        # Tüm katalog önceden hücrelere toplanır; harita yalnızca hücreleri çizer
+        with span("density bins", "io"):
+            density = load_density()
+        with span("map view", "map"):
+            self.map_view = MapView()
+            self.map_view.set_density(density)
+            self.map_view.setMinimumHeight(400)
+            self.map_area.replaceWidget(self.map_placeholder, self.map_view)
+            self.map_placeholder.deleteLater()
+
+        # ⏳ ZAMAN VE BÜYÜKLÜK SÜZGECİ (hazır hücreler üzerinde)
+        filter_row = QHBoxLayout()
+        year_min, year_max = density["years"]
+        self.year_from = QSlider(Qt.Horizontal)
+        self.year_to = QSlider(Qt.Horizontal)
+        for slider, value in ((self.year_from, year_min), (self.year_to, year_max)):
+            slider.setRange(year_min, year_max)
+            slider.setValue(value)
+            slider.valueChanged.connect(self.apply_map_filter)
+        self.year_label = QLabel()
+        self.magnitude_combo = QComboBox()
+        self.magnitude_combo.addItems(["All magnitudes"] + [f"M ≥ {edge:g}" for edge in MAG_EDGES])
+        self.magnitude_combo.currentIndexChanged.connect(self.apply_map_filter)
+        filter_row.addWidget(QLabel("Years:"))
+        filter_row.addWidget(self.year_from)
+        filter_row.addWidget(self.year_to)
+        filter_row.addWidget(self.year_label)
+        filter_row.addWidget(self.magnitude_combo)
+        self.map_area.addLayout(filter_row)
+        self.apply_map_filter()
+
+    def apply_map_filter(self):
+        year_from, year_to = sorted((self.year_from.value(), self.year_to.value()))
+        self.year_label.setText(f"{year_from} – {year_to}")
+        self.map_view.filter_density(self.magnitude_combo.currentIndex(), year_from, year_to)
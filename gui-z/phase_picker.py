@@ -0,0 +1,128 @@
+"""Automatic P/S arrival picking (STA/LTA trigger + AIC refinement).
+
+Both stages are O(n) per trace: the STA/LTA windows come from one
+cumulative sum of the squared signal and the AIC function from cumulative
+sums of x and x^2. Everything works on the last axis of an ``(..., n)``
+array, so all records and components of an event are picked in one call.
+
+Picking strategy:
+
+* P: first sample where STA/LTA >= ``on_ratio``; refined to the AIC
+  minimum in a window around that trigger.
+* S: AIC minimum between ``P + min_sp`` and shortly after the peak
+  absolute amplitude (the S phase carries the strong shaking on
+  accelerograms).
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+DEFAULT_STA_S = 0.5
+DEFAULT_LTA_S = 10.0
+DEFAULT_ON_RATIO = 3.0
+
+
+@dataclass
+class PhasePicks:
+    p_index: np.ndarray  # -1 where no pick
+    s_index: np.ndarray
+    p_time: np.ndarray   # NaN where no pick
+    s_time: np.ndarray
+    ratio: np.ndarray    # STA/LTA characteristic function, same shape as the input
+
+
+def sta_lta(data, n_sta, n_lta):
+    """Trailing-window STA/LTA of ``data ** 2``; zero until the LTA window is full."""
+    data = np.asarray(data, dtype=np.float64)
+    n = data.shape[-1]
+    energy = np.zeros(data.shape[:-1] + (n + 1,))
+    np.cumsum(data ** 2, axis=-1, out=energy[..., 1:])
+
+    ratio = np.zeros(data.shape)
+    if n_lta > n or n_sta < 1:
+        return ratio
+    end = np.arange(n_lta, n + 1)                       # window ends (exclusive)
+    sta = (energy[..., end] - energy[..., end - n_sta]) / n_sta
+    lta = (energy[..., end] - energy[..., end - n_lta]) / n_lta
+    ratio[..., n_lta - 1:] = np.divide(sta, lta, out=np.zeros_like(sta), where=lta > 0)
+    return ratio
+
+
+def aic_pick(data, start, stop):
+    """Index of the AIC minimum of every trace within ``[start, stop)``.
+
+    ``start``/``stop`` broadcast against the leading axes of ``data``.
+    Returns -1 where the window is too short to split.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    lead = data.shape[:-1]
+    n = data.shape[-1]
+    start = np.broadcast_to(np.clip(start, 0, n), lead).astype(np.int64)
+    stop = np.broadcast_to(np.clip(stop, 0, n), lead).astype(np.int64)
+    width = int((stop - start).max(initial=0))
+    if width < 4:
+        return np.full(lead, -1, dtype=np.int64)
+
+    s1 = np.zeros(lead + (n + 1,))
+    s2 = np.zeros(lead + (n + 1,))
+    np.cumsum(data, axis=-1, out=s1[..., 1:])
+    np.cumsum(data ** 2, axis=-1, out=s2[..., 1:])
+
+    # Candidate split points k; left = [start, k), right = [k, stop). A small
+    # margin keeps the one-sample variances at the window edges out of it;
+    # it follows each trace's own window, so batching does not change picks.
+    margin = np.maximum(3, (stop - start) // 10)[..., None]
+    k = start[..., None] + np.arange(1, width)
+    valid = (k - start[..., None] >= margin) & (stop[..., None] - k >= margin)
+    k = np.minimum(k, n)
+
+    def gather(cum, idx):
+        return np.take_along_axis(cum, idx, axis=-1)
+
+    a = start[..., None]
+    b = stop[..., None]
+    n_left = (k - a).astype(float)
+    n_right = np.maximum(b - k, 1).astype(float)
+    left_sum = gather(s1, k) - gather(s1, a)
+    left_sq = gather(s2, k) - gather(s2, a)
+    right_sum = gather(s1, b) - gather(s1, k)
+    right_sq = gather(s2, b) - gather(s2, k)
+    var_left = np.maximum(left_sq / n_left - (left_sum / n_left) ** 2, 1e-300)
+    var_right = np.maximum(right_sq / n_right - (right_sum / n_right) ** 2, 1e-300)
+
+    aic = n_left * np.log(var_left) + (n_right - 1) * np.log(var_right)
+    aic = np.where(valid, aic, np.inf)
+    best = start + 1 + np.argmin(aic, axis=-1)
+    return np.where(np.isfinite(aic.min(axis=-1)), best, -1)
+
+
+def pick_phases(data, dt, sta_s=DEFAULT_STA_S, lta_s=DEFAULT_LTA_S, on_ratio=DEFAULT_ON_RATIO,
+                aic_window_s=2.0, min_sp_s=0.5):
+    """P and S picks for every trace of ``data`` (shape ``(..., n)``)."""
+    data = np.asarray(data, dtype=np.float64)
+    n_sta = max(1, int(round(sta_s / dt)))
+    n_lta = max(n_sta + 1, int(round(lta_s / dt)))
+    half = max(2, int(round(aic_window_s / dt)))
+
+    # Demeaned copy so the picker does not trigger on an offset
+    centred = data - data.mean(axis=-1, keepdims=True)
+    ratio = sta_lta(centred, n_sta, n_lta)
+
+    triggered = ratio >= on_ratio
+    has_trigger = triggered.any(axis=-1)
+    trigger = np.argmax(triggered, axis=-1)
+
+    p_index = aic_pick(centred, trigger - half, trigger + half)
+    p_index = np.where(has_trigger & (p_index >= 0), p_index, -1)
+
+    peak = np.argmax(np.abs(centred), axis=-1)
+    s_start = p_index + max(1, int(round(min_sp_s / dt)))
+    s_index = aic_pick(centred, s_start, peak + half)
+    s_index = np.where((p_index >= 0) & (s_index > p_index), s_index, -1)
+
+    def to_time(index):
+        return np.where(index >= 0, index * dt, np.nan)
+
+    return PhasePicks(p_index=p_index, s_index=s_index, p_time=to_time(p_index),
+                      s_time=to_time(s_index), ratio=ratio)
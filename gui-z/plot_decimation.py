@@ -0,0 +1,134 @@
+"""Display decimation for long time-series lines.
+
+A line only needs about two points per horizontal pixel to look exactly
+like the full trace, provided each pixel column keeps its minimum and
+maximum. :class:`MinMaxPyramid` precomputes the min/max sample indices for
+bins of 8, 16, 32, ... samples once; any view is then served from the
+coarsest level that still has at least one bin per pixel, so a 10M-sample
+record costs the same to draw as a 10k one. :class:`DecimationManager`
+binds pyramids to matplotlib lines and re-slices them on zoom, pan and
+canvas resize.
+"""
+
+import numpy as np
+
+BASE_LEVEL = 3            # first stored bin size is 2**BASE_LEVEL samples
+
+
+class MinMaxPyramid:
+    def __init__(self, x, y):
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        index_dtype = np.int32 if self.y.size < 2 ** 31 else np.int64
+        self.levels = []   # (bin_size, imin, imax)
+
+        n = self.y.size
+        bin_size = 2 ** BASE_LEVEL
+        n_bins = n // bin_size
+        if n_bins < 2:
+            return
+        blocks = self.y[:n_bins * bin_size].reshape(n_bins, bin_size)
+        offsets = np.arange(n_bins, dtype=index_dtype) * bin_size
+        imin = offsets + np.argmin(blocks, axis=1).astype(index_dtype)
+        imax = offsets + np.argmax(blocks, axis=1).astype(index_dtype)
+        self.levels.append((bin_size, imin, imax))
+
+        while imin.size >= 4:
+            pairs = imin.size // 2
+            a_min, b_min = imin[0:2 * pairs:2], imin[1:2 * pairs:2]
+            a_max, b_max = imax[0:2 * pairs:2], imax[1:2 * pairs:2]
+            imin = np.where(self.y[b_min] < self.y[a_min], b_min, a_min)
+            imax = np.where(self.y[b_max] > self.y[a_max], b_max, a_max)
+            bin_size *= 2
+            self.levels.append((bin_size, imin, imax))
+
+    def query(self, x0, x1, pixels):
+        """Decimated ``(x, y)`` covering ``[x0, x1]`` for a ``pixels``-wide axes.
+
+        Each bin contributes its min and max in time order, i.e. roughly
+        two points per pixel; the first and last visible samples are always
+        kept so the line spans the whole view.
+        """
+        n = self.y.size
+        i0 = max(int(np.searchsorted(self.x, x0, side="left")) - 1, 0)
+        i1 = min(int(np.searchsorted(self.x, x1, side="right")) + 1, n)
+        pixels = max(int(pixels), 1)
+
+        span = i1 - i0
+        level = None
+        for bin_size, imin, imax in self.levels:
+            if span / bin_size >= pixels:
+                level = (bin_size, imin, imax)
+            else:
+                break
+        if level is None:
+            return self.x[i0:i1], self.y[i0:i1]
+
+        bin_size, imin, imax = level
+        b0 = i0 // bin_size
+        b1 = min(-(-i1 // bin_size), imin.size)
+        lo = np.minimum(imin[b0:b1], imax[b0:b1])
+        hi = np.maximum(imin[b0:b1], imax[b0:b1])
+        idx = np.empty(2 * lo.size + 2, dtype=lo.dtype)
+        idx[0] = i0
+        idx[1:-1:2] = lo
+        idx[2:-1:2] = hi
+        idx[-1] = i1 - 1
+        # Edge bins may reach outside the view; keep the indices monotonic
+        np.clip(idx, i0, i1 - 1, out=idx)
+
+        # Samples past the last full bin are appended raw
+        tail_start = imin.size * bin_size
+        if b1 == imin.size and tail_start < i1:
+            idx = np.concatenate([idx[:-1], np.arange(tail_start, i1, dtype=idx.dtype)])
+        return self.x[idx], self.y[idx]
+
+
+class DecimationManager:
+    """Keeps every registered line decimated to the current view and canvas size."""
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self._lines = {}          # line -> (ax, pyramid)
+        self._callbacks = []      # (ax, cid)
+        self._resize_cid = canvas.mpl_connect("resize_event", lambda event: self.refresh())
+
+    def plot(self, ax, x, y, **kwargs):
+        line, = ax.plot([], [], **kwargs)
+        self.attach(ax, line, x, y)
+        return line
+
+    def attach(self, ax, line, x, y):
+        """Serve ``line`` from a pyramid of ``(x, y)``, replacing whatever it showed before."""
+        pyramid = MinMaxPyramid(x, y)
+        self._lines[line] = (ax, pyramid)
+        if not any(registered is ax for registered, _ in self._callbacks):
+            cid = ax.callbacks.connect("xlim_changed", self._on_xlim_changed)
+            self._callbacks.append((ax, cid))
+        if ax.get_autoscalex_on():
+            x0, x1 = pyramid.x[0], pyramid.x[-1]
+        else:
+            x0, x1 = sorted(ax.get_xlim())
+        line.set_data(*pyramid.query(x0, x1, self._pixels(ax)))
+        return line
+
+    def clear(self):
+        for ax, cid in self._callbacks:
+            ax.callbacks.disconnect(cid)
+        self._callbacks = []
+        self._lines = {}
+
+    def refresh(self, axes=None):
+        for line, (ax, pyramid) in self._lines.items():
+            if axes is not None and ax not in axes:
+                continue
+            x0, x1 = sorted(ax.get_xlim())
+            line.set_data(*pyramid.query(x0, x1, self._pixels(ax)))
+
+    def _on_xlim_changed(self, ax):
+        # Shared-x siblings follow silently (no xlim_changed), so refresh them too
+        self.refresh(ax.get_shared_x_axes().get_siblings(ax))
+
+    @staticmethod
+    def _pixels(ax):
+        return max(int(ax.get_window_extent().width), 100)
@@ -0,0 +1,448 @@
+"""Persistent plot layouts for ``GraphsPage``.
+
+Every feature gets one :class:`PlotLayout` whose axes, lines, legends and
+hover cursor are created the first time it is shown and kept for the
+lifetime of the figure. Showing a feature again only hides the other
+layouts' axes and pushes the new arrays into the existing artists with
+``set_data``.
+
+:class:`FigureLayouts` blits the artists that change between updates
+(traces, pick/bracket markers, value-carrying titles and legends) over a
+cached background of each layout. A full ``canvas.draw()`` is only needed
+when the view limits or other static parts change, the canvas is resized,
+or something else (zoom, pan) redrew the figure. Hover readouts are drawn
+on top by :class:`crosshair.Crosshair`.
+"""
+
+from abc import ABC, abstractmethod
+
+import matplotlib.gridspec as gridspec
+import numpy as np
+
+# Current view limits are kept while the new data fills at least this
+# fraction of them, so reruns with similar amplitudes can be blitted.
+KEEP_FRACTION = 0.6
+MARGIN = 0.05
+
+
+def _data_range(values):
+    lo = min(float(np.nanmin(v)) for v in values)
+    hi = max(float(np.nanmax(v)) for v in values)
+    return lo, hi
+
+
+def _fit_axis(current, values, keep_fraction=KEEP_FRACTION, margin=MARGIN):
+    """New ``(lo, hi)`` limits for ``values``, or None when ``current`` still fits."""
+    lo, hi = _data_range(values)
+    c0, c1 = sorted(current)
+    if c0 <= lo and hi <= c1 and hi - lo >= keep_fraction * (c1 - c0):
+        return None
+    pad = (hi - lo) * margin or max(abs(lo) * margin, 1e-12)
+    return lo - pad, hi + pad
+
+
+def fit_view(ax, xs=None, ys=None):
+    """Fit the x/y limits of ``ax`` to the given arrays; True if they changed."""
+    changed = False
+    if xs is not None:
+        limits = _fit_axis(ax.get_xlim(), xs)
+        if limits is not None:
+            ax.set_xlim(*limits)
+            changed = True
+    if ys is not None:
+        limits = _fit_axis(ax.get_ylim(), ys)
+        if limits is not None:
+            ax.set_ylim(*limits)
+            changed = True
+    return changed
+
+
+class PlotLayout(ABC):
+    """Axes and artists of one feature plot, built once and then only updated."""
+
+    hover_xname = "time"
+
+    def __init__(self, figure, decimator):
+        self.figure = figure
+        self.decimator = decimator
+        self.axes = []
+        self.moving = []      # artists that are blitted on every update
+        self.hover_lines = []
+        self.hover_data = {}  # line -> full-resolution (x, y) for crosshair readouts
+        self.built = False
+
+    @abstractmethod
+    def build(self):
+        """Create the axes and artists (once)."""
+
+    @abstractmethod
+    def update(self, result):
+        """Push ``result`` into the artists; True when the static background changed."""
+
+    def ensure_built(self):
+        if not self.built:
+            self.build()
+            self.built = True
+            self.set_visible(False)
+
+    def set_visible(self, visible):
+        for ax in self.axes:
+            ax.set_visible(visible)
+
+    def hover(self, lines):
+        self.hover_lines = list(lines) if isinstance(lines, (list, tuple)) else [lines]
+
+    def set_trace(self, line, x, y, decimate=True):
+        """Point ``line`` at ``(x, y)``, decimated for display unless ``decimate`` is False."""
+        if decimate:
+            self.decimator.attach(line.axes, line, x, y)
+        else:
+            line.set_data(x, y)
+        self.hover_data[line] = (np.asarray(x), np.asarray(y))
+
+    def add_axes(self, spec, **kwargs):
+        ax = self.figure.add_subplot(spec, **kwargs)
+        self.axes.append(ax)
+        return ax
+
+    def line(self, ax, **kwargs):
+        line, = ax.plot([], [], **kwargs)
+        self.moving.append(line)
+        return line
+
+
+class MessageLayout(PlotLayout):
+    """Single axes with a centred message (errors, invalid feature index)."""
+
+    def build(self):
+        ax = self.add_axes(gridspec.GridSpec(1, 1, figure=self.figure)[0])
+        self.text = ax.text(0.5, 0.5, "", ha="center", va="center", fontsize=10, transform=ax.transAxes)
+
+    def update(self, message):
+        self.text.set_text(message)
+        return True
+
+
+class MotionLayout(PlotLayout):
+    """Raw vs preprocessed acceleration, velocity and displacement."""
+
+    def build(self):
+        grid = gridspec.GridSpec(3, 1, figure=self.figure, hspace=0.55, left=0.13, right=0.97, top=0.93, bottom=0.1)
+        ax1 = self.add_axes(grid[0])
+        ax2 = self.add_axes(grid[1], sharex=ax1)
+        ax3 = self.add_axes(grid[2], sharex=ax1)
+
+        # FONT ayarı değişkeni (tek yerde kontrol et)
+        label_fs = 8
+        tick_fs = 7
+        legend_fs = 7
+        title_fs = 9
+
+        panels = [
+            (ax1, "Acceleration", "Time vs Acceleration", "cm/s²"),
+            (ax2, "Velocity", "Time vs Velocity", "cm/s"),
+            (ax3, "Displacement", "Time vs Displacement", "cm"),
+        ]
+        self.lines = []
+        for ax, ylabel, title, unit in panels:
+            raw = self.line(ax, label="Raw", color="blue", linewidth=1)
+            pre = self.line(ax, label="Preprocessed", color="red", linewidth=1)
+            self.lines.append((ax, raw, pre))
+            ax.set_ylabel(ylabel, fontsize=label_fs)
+            ax.set_title(title, fontsize=title_fs, pad=6)
+            ax.tick_params(axis='both', labelsize=tick_fs)
+            ax.legend(fontsize=legend_fs, loc="upper right")
+            ax.grid(True)
+            ax.annotate(unit, xy=(-0.08, 0.5), xycoords='axes fraction', rotation=90, fontsize=6, va='center')
+        ax3.set_xlabel("Time (s)", fontsize=label_fs)
+
+        self.hover([line for _, raw, pre in self.lines for line in (raw, pre)])
+
+    def update(self, result):
+        t = result["t"]
+        changed = False
+        for (ax, raw_line, pre_line), key in zip(self.lines, ("acc", "vel", "disp")):
+            raw, pre = result[key]
+            self.set_trace(raw_line, t, raw)
+            self.set_trace(pre_line, t, pre)
+            changed |= fit_view(ax, [t] if ax is self.axes[0] else None, [raw, pre])
+        return changed
+
+
+class FourierLayout(PlotLayout):
+    hover_xname = "freq"
+
+    def build(self):
+        ax = self.add_axes(gridspec.GridSpec(1, 1, figure=self.figure)[0])
+        self.spectrum = self.line(ax, color='black', linewidth=1.4)
+        ax.set_title("Fourier Amplitude Spectrum", fontsize=14)
+        ax.set_xlabel("Frequency (Hz)", fontsize=12)
+        ax.set_ylabel("Amplitude", fontsize=12)
+        ax.set_xlim(0, 50)
+        ax.set_ylim(0, 1.5)
+        ax.set_xticks(np.arange(0, 55, 5))
+        ax.set_yticks(np.arange(0, 1.6, 0.5))
+        ax.grid(True, linestyle='--', linewidth=0.5)
+        self.hover(self.spectrum)
+
+    def update(self, result):
+        # Eksen sınırları sabit; yalnızca çizgi güncellenir
+        self.set_trace(self.spectrum, result["freq"], result["amplitude"], decimate=False)
+        return False
+
+
+class BracketedDurationLayout(PlotLayout):
+    def build(self):
+        grid = gridspec.GridSpec(1, 1, figure=self.figure, left=0.1, right=0.98, top=0.9, bottom=0.12)
+        ax = self.add_axes(grid[0])
+        self.ax = ax
+        self.start_line = self.line(ax, color="green", linestyle="--", label="Start", linewidth=1,
+                                    transform=ax.get_xaxis_transform())
+        self.end_line = self.line(ax, color="red", linestyle="--", label="End", linewidth=1,
+                                  transform=ax.get_xaxis_transform())
+        self.trace = self.line(ax, color="black", linewidth=1)
+
+        # 🔠 Yazı boyutları
+        ax.set_title(" ", fontsize=10, pad=6)
+        ax.set_xlabel("Time (s)", fontsize=9)
+        ax.set_ylabel("Amplitude", fontsize=9)
+        ax.tick_params(axis='both', labelsize=8)
+        ax.legend(fontsize=8)
+        ax.grid(True, linestyle='--', linewidth=0.5)
+        self.moving.append(ax.title)
+        self.hover(self.trace)
+
+    def update(self, result):
+        start, end = result["start"], result["end"]
+        self.set_trace(self.trace, result["t"], result["acc"])
+        changed = fit_view(self.ax, [result["t"]], [result["acc"]])
+
+        found = start is not None
+        for marker, value in ((self.start_line, start), (self.end_line, end)):
+            marker.set_visible(found)
+            if found:
+                marker.set_data([value, value], [0, 1])
+        if found:
+            self.ax.title.set_text(f"Bracketed Duration: {end - start:.2f} s")
+        else:
+            self.ax.title.set_text("No threshold exceedance")
+        return changed
+
+
+class SiteFrequencyLayout(PlotLayout):
+    hover_xname = "freq"
+
+    def build(self):
+        grid = gridspec.GridSpec(1, 1, figure=self.figure, left=0.1, right=0.98, top=0.9, bottom=0.12)
+        ax = self.add_axes(grid[0])
+        self.ax = ax
+        self.spectrum = self.line(ax, color="black", linewidth=1)
+        self.peak_line = self.line(ax, color="purple", linestyle="--", linewidth=1, label="Site Frequency",
+                                   transform=ax.get_xaxis_transform())
+        self.kind = None
+
+        # 🔠 Yazı boyutları
+        ax.set_title("Site Frequency Estimate", fontsize=10, pad=6)
+        ax.set_xscale("log")
+        ax.set_xlabel("Frequency (Hz)", fontsize=9)
+        ax.set_ylabel("Amplitude", fontsize=9)
+        ax.tick_params(axis='both', labelsize=8)
+        self.legend = ax.legend(fontsize=8, loc="upper right")
+        ax.grid(True, linestyle='--', linewidth=0.5)
+        self.moving.append(self.legend)
+        self.hover(self.spectrum)
+
+    def update(self, result):
+        peak_freq = result["peak_freq"]
+        kind = result.get("kind")
+        kind_changed = kind != self.kind
+        if kind_changed:
+            # H/V oranı üç bileşen varsa; yoksa tek bileşenin yumuşatılmış spektrumu
+            self.kind = kind
+            hv = kind == "hvsr"
+            self.ax.set_title("H/V Spectral Ratio" if hv else "Site Frequency Estimate", fontsize=10, pad=6)
+            self.ax.set_ylabel("H/V" if hv else "Smoothed Amplitude", fontsize=9)
+        self.set_trace(self.spectrum, result["freq"], result["amplitude"], decimate=False)
+        self.peak_line.set_data([peak_freq, peak_freq], [0, 1])
+        self.legend.get_texts()[0].set_text(f"Site Frequency: {peak_freq:.2f} Hz")
+        # Logaritmik eksen: x sınırları doğrudan frekans aralığı (kenar payı negatif olamaz)
+        freq = result["freq"]
+        limits = (float(freq[0]), float(freq[-1]))
+        x_changed = tuple(self.ax.get_xlim()) != limits
+        if x_changed:
+            self.ax.set_xlim(*limits)
+        return fit_view(self.ax, ys=[result["amplitude"]]) or x_changed or kind_changed
+
+
+class AriasLayout(PlotLayout):
+    def build(self):
+        grid = gridspec.GridSpec(1, 1, figure=self.figure, left=0.1, right=0.98, top=0.9, bottom=0.12)
+        ax = self.add_axes(grid[0])
+        self.ax = ax
+        self.trace = self.line(ax, color="darkred", linewidth=1.4)
+
+        # 🔠 Yazı boyutları
+        ax.set_title("Arias Intensity", fontsize=10, pad=6)
+        ax.set_xlabel("Time (s)", fontsize=9)
+        ax.set_ylabel("Arias intensity (m/s)", fontsize=9)
+        ax.tick_params(axis='both', labelsize=8)
+        ax.grid(True, linestyle="--", linewidth=0.5)
+        self.hover(self.trace)
+
+    def update(self, result):
+        self.set_trace(self.trace, result["t"], result["arias"])
+        return fit_view(self.ax, [result["t"]], [result["arias"]])
+
+
+class ResponseSpectrumLayout(PlotLayout):
+    hover_xname = "period"
+
+    def build(self):
+        grid = gridspec.GridSpec(1, 1, figure=self.figure, left=0.1, right=0.98, top=0.9, bottom=0.12)
+        ax = self.add_axes(grid[0])
+        self.ax = ax
+        self.spectrum = self.line(ax, color="darkblue", linewidth=1.4)
+
+        # ✏️ Font boyutları
+        ax.set_title("Response Spectrum (PSA, 5% damping)", fontsize=10, pad=6)
+        ax.set_xlabel("Period (s)", fontsize=9)
+        ax.set_ylabel("Spectral Acceleration (cm/s²)", fontsize=9)
+        ax.tick_params(axis='both', labelsize=8)
+        ax.grid(True, linestyle="--", linewidth=0.5)
+        self.hover(self.spectrum)
+
+    def update(self, result):
+        self.set_trace(self.spectrum, result["periods"], result["response"], decimate=False)
+        return fit_view(self.ax, [result["periods"]], [result["response"]])
+
+
+class PhaseArrivalsLayout(PlotLayout):
+    def build(self):
+        grid = gridspec.GridSpec(1, 1, figure=self.figure, left=0.1, right=0.97, top=0.9, bottom=0.12)
+        ax = self.add_axes(grid[0])
+        self.ax = ax
+        self.trace = self.line(ax, color="darkblue", linewidth=1)
+        self.p_line = self.line(ax, color="blue", linestyle="--", linewidth=1.2, label="P-wave",
+                                transform=ax.get_xaxis_transform())
+        self.s_line = self.line(ax, color="orange", linestyle="--", linewidth=1.2, label="S-wave",
+                                transform=ax.get_xaxis_transform())
+
+        # ✏️ Font ayarları
+        ax.set_title("P and S Wave Annotation (STA/LTA + AIC)", fontsize=10, pad=6)
+        ax.set_xlabel("Time (s)", fontsize=9)
+        ax.set_ylabel("Acceleration", fontsize=9)
+        ax.tick_params(axis='both', labelsize=8)
+        self.legend = ax.legend(fontsize=8, loc="upper right")
+        ax.grid(True, linestyle="--", linewidth=0.5)
+        self.moving.append(self.legend)
+        self.hover(self.trace)
+
+    def update(self, result):
+        self.set_trace(self.trace, result["t"], result["acc"])
+        # Otomatik STA/LTA + AIC seçimleri; seçim yoksa çizgi gizlenir
+        texts = self.legend.get_texts()
+        for marker, text, name, value in ((self.p_line, texts[0], "P-wave", result["p_time"]),
+                                          (self.s_line, texts[1], "S-wave", result["s_time"])):
+            picked = bool(np.isfinite(value))
+            marker.set_visible(picked)
+            if picked:
+                marker.set_data([value, value], [0, 1])
+                text.set_text(f"{name}: {value:.2f} s")
+            else:
+                text.set_text(f"{name}: no pick")
+        return fit_view(self.ax, [result["t"]], [result["acc"]])
+
+
+FEATURE_LAYOUTS = {
+    0: MotionLayout,
+    1: FourierLayout,
+    2: BracketedDurationLayout,
+    3: SiteFrequencyLayout,
+    4: AriasLayout,
+    5: ResponseSpectrumLayout,
+    6: PhaseArrivalsLayout,
+}
+
+
+class FigureLayouts:
+    """Switches between persistent layouts on one canvas and blits their updates."""
+
+    def __init__(self, canvas, decimator, layouts=FEATURE_LAYOUTS):
+        self.canvas = canvas
+        self.figure = canvas.figure
+        self.layouts = {key: cls(self.figure, decimator) for key, cls in layouts.items()}
+        self.message = MessageLayout(self.figure, decimator)
+        self.active = None
+        self.capturing = False    # True while drawing the background without moving artists
+        self.rendered = []        # callbacks(layout) after every full draw or blit
+        self._backgrounds = {}    # layout -> (canvas size, background without moving artists)
+        canvas.mpl_connect("draw_event", self._on_draw)
+
+    def show(self, key, result):
+        """Show feature ``key`` with ``result``; returns True if a full redraw was needed."""
+        if key not in self.layouts:
+            return self.show_message("Invalid Feature Index")
+        return self._show(self.layouts[key], result)
+
+    def show_message(self, message):
+        return self._show(self.message, message)
+
+    def _show(self, layout, result):
+        layout.ensure_built()
+        if layout is not self.active:
+            if self.active is not None:
+                self.active.set_visible(False)
+            layout.set_visible(True)
+            self.active = layout
+
+        if layout.update(result):
+            self._backgrounds.pop(layout, None)
+
+        cached = self._backgrounds.get(layout)
+        full = cached is None or cached[0] != self._size()
+        if full:
+            self._full_draw(layout)
+        else:
+            self._blit(layout, cached[1])
+        for callback in self.rendered:
+            callback(layout)
+        return full
+
+    def _size(self):
+        return tuple(self.figure.bbox.size)
+
+    def _full_draw(self, layout):
+        # Draw once without the moving artists to get a clean background,
+        # then put them back on top of it
+        states = [(artist, artist.get_visible()) for artist in layout.moving]
+        for artist, _ in states:
+            artist.set_visible(False)
+        self.capturing = True
+        try:
+            self.canvas.draw()
+        finally:
+            self.capturing = False
+            for artist, visible in states:
+                artist.set_visible(visible)
+        self._draw_moving(layout)
+        self.canvas.blit(self.figure.bbox)
+
+    def _blit(self, layout, background):
+        self.canvas.restore_region(background)
+        self._draw_moving(layout)
+        self.canvas.blit(self.figure.bbox)
+
+    def _draw_moving(self, layout):
+        for artist in layout.moving:
+            if artist.get_visible():
+                self.figure.draw_artist(artist)
+
+    def _on_draw(self, event):
+        if self.active is None:
+            return
+        if self.capturing:
+            self._backgrounds[self.active] = (self._size(), self.canvas.copy_from_bbox(self.figure.bbox))
+        else:
+            # Zoom, pan or resize: the background now includes the moving
+            # artists and has to be recaptured
+            self._backgrounds.pop(self.active, None)
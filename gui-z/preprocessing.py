@@ -0,0 +1,141 @@
+"""NumPy port of the preprocessing in ``ensonpreprocessed.m``.
+
+``preprocess_boore`` ports MATLAB's ``preprocessboore`` (linear detrend,
+FFT high-pass at a corner frequency with a symmetric filter, inverse FFT)
+and ``cumtrapz`` matches MATLAB's ``cumtrapz``. Every function works on the
+last axis of an ``(..., n)`` array, so a whole event (stations x components
+x samples) is processed in one call.
+
+With ``pad=False`` the filter matches MATLAB to rounding (1e-14 on the
+sample record). The default ``pad=True`` runs the FFT at a fast,
+zero-padded length, which moves the filter's bin grid: results differ from
+MATLAB by about 0.01 cm/s^2 on the sample record.
+
+Traces of different lengths can be stacked into one zero-padded array with
+:func:`stack_traces`; passing the returned ``lengths`` keeps the padding
+out of the detrend fit, and every row is filtered at its own length, so a
+stacked trace gives the same result as the trace alone.
+"""
+
+import numpy as np
+
+DEFAULT_CORNER_FREQ = 0.05
+
+
+def next_fast_len(n):
+    """Smallest 5-smooth number (2^a 3^b 5^c) >= ``n``."""
+    n = int(n)
+    if n <= 1:
+        return 1
+    best = 1 << (n - 1).bit_length()
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            # Smallest power-of-two multiple of p35 that reaches n
+            quotient = -(-n // p35)
+            best = min(best, p35 * (1 << (quotient - 1).bit_length()))
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+def stack_traces(traces):
+    """Zero-pad 1-D traces into one ``(len(traces), n_max)`` array.
+
+    Returns ``(data, lengths)``.
+    """
+    lengths = np.array([len(trace) for trace in traces], dtype=np.int64)
+    data = np.zeros((len(traces), int(lengths.max(initial=0))))
+    for row, trace in zip(data, traces):
+        row[:len(trace)] = trace
+    return data, lengths
+
+
+def _valid_mask(shape, lengths):
+    if lengths is None:
+        return None
+    lengths = np.asarray(lengths)
+    return np.arange(shape[-1]) < lengths[..., None]
+
+
+def detrend(data, lengths=None):
+    """Remove the least-squares line from every trace (MATLAB ``detrend``)."""
+    data = np.asarray(data, dtype=np.float64)
+    n = data.shape[-1]
+    idx = np.arange(n, dtype=np.float64)
+    mask = _valid_mask(data.shape, lengths)
+
+    if mask is None:
+        count = np.full(data.shape[:-1], float(n))
+        y = data
+    else:
+        count = np.asarray(lengths, dtype=np.float64) * np.ones(data.shape[:-1])
+        y = np.where(mask, data, 0.0)
+
+    # Closed-form normal equations for y ~ a + b*i over i = 0..count-1
+    s1 = count * (count - 1) / 2
+    s2 = (count - 1) * count * (2 * count - 1) / 6
+    sy = y.sum(axis=-1)
+    sxy = y @ idx
+    denom = count * s2 - s1 ** 2
+    safe = np.where(denom == 0, 1.0, denom)
+    slope = np.where(denom == 0, 0.0, (count * sxy - s1 * sy) / safe)
+    intercept = (sy - slope * s1) / np.maximum(count, 1)
+
+    out = data - (intercept[..., None] + slope[..., None] * idx)
+    if mask is not None:
+        out[~mask] = 0.0
+    return out
+
+
+def highpass_fft(data, fs, corner_freq=DEFAULT_CORNER_FREQ, lengths=None, pad=True):
+    """Zero every Fourier bin below ``corner_freq`` and transform back.
+
+    Using ``rfft``/``irfft`` gives MATLAB's symmetrised filter for free.
+    With ``pad`` the transform runs at :func:`next_fast_len` of the trace
+    length instead of an arbitrary (possibly prime) length; see the module
+    docstring for what that changes. With ``lengths`` the rows are filtered
+    in groups of equal length, each at its own transform length.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    if lengths is None:
+        return _highpass(data, fs, corner_freq, pad)
+
+    lengths = np.broadcast_to(np.asarray(lengths, dtype=np.int64), data.shape[:-1])
+    out = np.zeros_like(data)
+    for length in np.unique(lengths):
+        if length <= 0:
+            continue
+        rows = lengths == length
+        out[rows, :length] = _highpass(data[rows, :length], fs, corner_freq, pad)
+    return out
+
+
+def _highpass(data, fs, corner_freq, pad):
+    n = data.shape[-1]
+    nfft = next_fast_len(n) if pad else n
+    spectrum = np.fft.rfft(data, n=nfft, axis=-1)
+    freqs = np.fft.rfftfreq(nfft, d=1.0 / fs)
+    spectrum[..., freqs < corner_freq] = 0.0
+    return np.fft.irfft(spectrum, n=nfft, axis=-1)[..., :n]
+
+
+def preprocess_boore(data, fs, corner_freq=DEFAULT_CORNER_FREQ, lengths=None, pad=True):
+    """Detrend + FFT high-pass, batched over all leading axes of ``data``."""
+    return highpass_fft(detrend(data, lengths), fs, corner_freq, lengths=lengths, pad=pad)
+
+
+def cumtrapz(y, dt, axis=-1):
+    """Cumulative trapezoidal integral starting at 0 (MATLAB ``cumtrapz``)."""
+    y = np.asarray(y, dtype=np.float64)
+    y = np.moveaxis(y, axis, -1)
+    out = np.zeros_like(y)
+    np.cumsum((y[..., 1:] + y[..., :-1]) * (dt / 2.0), axis=-1, out=out[..., 1:])
+    return np.moveaxis(out, -1, axis)
+
+
+def integrate_motion(acc, dt):
+    """Velocity and displacement from acceleration by repeated ``cumtrapz``."""
+    velocity = cumtrapz(acc, dt)
+    return velocity, cumtrapz(velocity, dt)
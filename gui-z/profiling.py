@@ -0,0 +1,302 @@
+"""Per-stage timing of user actions.
+
+A user action (open a feature, select an event, load the station map)
+is an :class:`ActionTrace`; work done on its behalf is timed with
+``span(name, category)`` context managers around I/O, compute, map
+generation and drawing, on the GUI thread or in worker jobs. The
+breakdown counts every span's own time (minus nested spans) per category,
+so "Station Analysis is slow" can be pinned on the CSV, the map or the
+web view.
+
+Only one action is open at a time, like the pages' single live job:
+``begin`` finishes the previous one as superseded. Synchronous handlers
+use ``with action(name)``; asynchronous ones call ``begin`` when the user
+acts and ``finish`` once the result is drawn. Spans outside an action
+record nothing.
+
+Environment switches (all off by default):
+
+* ``QUAKESENSE_TIMING=1``: timing overlay in the main window status bar
+  (also toggled with Ctrl+Shift+T);
+* ``QUAKESENSE_TRACE=trace.jsonl``: append every finished action as one
+  JSON line with all its spans;
+* ``QUAKESENSE_PROFILE=profiles/``: run every action under cProfile
+  (worker jobs included) and dump the merged stats there as ``.prof``.
+
+The analysis modules time themselves through this module, so it stays
+Qt-free and imports cProfile only when profiling is switched on.
+"""
+
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+import json
+import os
+import re
+import threading
+import time
+
+OVERLAY_ENV = "QUAKESENSE_TIMING"
+TRACE_ENV = "QUAKESENSE_TRACE"
+PROFILE_ENV = "QUAKESENSE_PROFILE"
+
+CATEGORIES = ("io", "compute", "map", "draw", "ui")
+HISTORY_SIZE = 100
+PROFILE_TOP = 15
+
+
+@dataclass
+class Span:
+    name: str
+    category: str
+    thread: str
+    start_ms: float       # from the start of the action
+    duration_ms: float
+    self_ms: float        # duration minus nested spans on the same thread
+    depth: int
+
+
+@dataclass
+class ActionTrace:
+    name: str
+    started: datetime
+    start: float                          # perf_counter at begin
+    spans: list = field(default_factory=list)
+    total_ms: float = 0.0
+    outcome: str = "open"                 # open, done, failed, superseded
+    profiles: list = field(default_factory=list)
+
+    def breakdown(self):
+        """``{category: ms}`` of the spans' own time, in ``CATEGORIES`` order."""
+        totals = {}
+        for span in self.spans:
+            totals[span.category] = totals.get(span.category, 0.0) + span.self_ms
+        order = {c: i for i, c in enumerate(CATEGORIES)}
+        return dict(sorted(totals.items(), key=lambda item: order.get(item[0], len(order))))
+
+    def summary(self):
+        """One line: ``name: total — io 12 ms · compute 80 ms · ... · other 3 ms``.
+
+        ``other`` is the time no span covered (imports, event loop, queueing).
+        """
+        breakdown = self.breakdown()
+        parts = [f"{category} {ms:.0f} ms" for category, ms in breakdown.items()]
+        other = self.total_ms - sum(breakdown.values())
+        if other >= 1.0:
+            parts.append(f"other {other:.0f} ms")
+        tail = f" — {' · '.join(parts)}" if parts else ""
+        status = "" if self.outcome == "done" else f" ({self.outcome})"
+        return f"{self.name}: {self.total_ms:.0f} ms{status}{tail}"
+
+    def to_dict(self):
+        return {
+            "action": self.name,
+            "started": self.started.isoformat(timespec="milliseconds"),
+            "total_ms": round(self.total_ms, 3),
+            "outcome": self.outcome,
+            "breakdown": {c: round(ms, 3) for c, ms in self.breakdown().items()},
+            "spans": [{
+                "name": s.name, "category": s.category, "thread": s.thread, "start_ms": round(s.start_ms, 3),
+                "duration_ms": round(s.duration_ms, 3), "self_ms": round(s.self_ms, 3), "depth": s.depth,
+            } for s in self.spans],
+        }
+
+
+class Profiler:
+    def __init__(self, trace_path=None, profile_dir=None):
+        self.trace_path = trace_path
+        self.profile_dir = profile_dir
+        self.current = None
+        self.history = deque(maxlen=HISTORY_SIZE)
+        self.listeners = []            # callbacks(ActionTrace), called from the finishing thread
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._gui_profile = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(trace_path=os.environ.get(TRACE_ENV) or None, profile_dir=os.environ.get(PROFILE_ENV) or None)
+
+    # --- Eylemler ---
+
+    def begin(self, name):
+        """Open a new action; an unfinished previous one is finished as superseded."""
+        if self.current is not None:
+            self.finish("superseded")
+        trace = ActionTrace(name=name, started=datetime.now(), start=time.perf_counter())
+        if self.profile_dir:
+            import cProfile
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Python 3.12+ allows only one active profiler at a time
+                profile = None
+            if profile is not None:
+                self._gui_profile = profile
+                trace.profiles.append(profile)
+        self.current = trace
+        return trace
+
+    def finish(self, outcome="done"):
+        """Close the open action (if any) and hand it to the trace file, profile dump and listeners."""
+        with self._lock:
+            trace, self.current = self.current, None
+        if trace is None:
+            return None
+        if self._gui_profile is not None:
+            self._gui_profile.disable()
+            self._gui_profile = None
+        trace.total_ms = (time.perf_counter() - trace.start) * 1000.0
+        trace.outcome = outcome
+        self.history.append(trace)
+        if self.trace_path:
+            self._append_trace(trace)
+        if self.profile_dir and trace.profiles:
+            self._dump_profile(trace)
+        trace.profiles = []
+        for callback in list(self.listeners):
+            callback(trace)
+        return trace
+
+    @contextmanager
+    def action(self, name):
+        self.begin(name)
+        try:
+            yield
+        except Exception:
+            self.finish("failed")
+            raise
+        self.finish()
+
+    # --- Aralıklar ---
+
+    @contextmanager
+    def span(self, name, category="compute"):
+        trace = self.current
+        if trace is None:
+            yield
+            return
+        stack = self._stack()
+        frame = [0.0]                        # time spent in nested spans
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = (time.perf_counter() - start) * 1000.0
+            stack.pop()
+            if stack:
+                stack[-1][0] += duration
+            self._add(trace, Span(name, category, threading.current_thread().name,
+                                  (start - trace.start) * 1000.0, duration, duration - frame[0], len(stack)))
+
+    def record(self, name, category, seconds, start=None):
+        """Add an interval timed elsewhere (e.g. a web page load finished by a signal).
+
+        Outside an action it is kept as an action of its own.
+        """
+        if start is None:
+            start = time.perf_counter() - seconds
+        trace = self.current
+        standalone = trace is None
+        if standalone:
+            trace = self.begin(name)
+            trace.start = start
+        ms = seconds * 1000.0
+        self._add(trace, Span(name, category, threading.current_thread().name, (start - trace.start) * 1000.0,
+                              ms, ms, 0))
+        if standalone:
+            self.finish()
+
+    @contextmanager
+    def job(self):
+        """Worker-thread side of an action: profiled with the action when cProfile is on."""
+        trace = self.current
+        if trace is None or not self.profile_dir:
+            yield
+            return
+        import cProfile
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            yield
+            return
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._lock:
+                trace.profiles.append(profile)
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _add(self, trace, span):
+        with self._lock:
+            trace.spans.append(span)
+
+    # --- Dışa aktarma ---
+
+    def _append_trace(self, trace):
+        try:
+            with open(self.trace_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(trace.to_dict(), ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"[WARN] Could not write trace {self.trace_path}: {e}")
+
+    def _dump_profile(self, trace):
+        import pstats
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", trace.name).strip("_") or "action"
+        path = os.path.join(self.profile_dir, f"{trace.started:%Y%m%d-%H%M%S-%f}-{slug}.prof")
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            stats = pstats.Stats(trace.profiles[0])
+            for profile in trace.profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(path)
+        except (OSError, TypeError) as e:
+            print(f"[WARN] Could not write profile for '{trace.name}': {e}")
+            return
+        print(f"[PROFILE] {trace.summary()} -> {path}")
+        stats.sort_stats("cumulative").print_stats(PROFILE_TOP)
+
+    def export(self, path, traces=None):
+        """Write ``traces`` (default: the recent history) as JSONL; returns the count."""
+        traces = list(self.history) if traces is None else traces
+        with open(path, "w", encoding="utf-8") as f:
+            for trace in traces:
+                f.write(json.dumps(trace.to_dict(), ensure_ascii=False) + "\n")
+        return len(traces)
+
+
+profiler = Profiler.from_env()
+
+
+def overlay_enabled():
+    return os.environ.get(OVERLAY_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def begin(name):
+    return profiler.begin(name)
+
+
+def finish(outcome="done"):
+    return profiler.finish(outcome)
+
+
+def action(name):
+    return profiler.action(name)
+
+
+def span(name, category="compute"):
+    return profiler.span(name, category)
+
+
+def record(name, category, seconds, start=None):
+    profiler.record(name, category, seconds, start)
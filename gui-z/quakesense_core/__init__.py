@@ -0,0 +1,98 @@
+"""Qt-free analysis core of QuakeSense: records, preprocessing, intensity
+measures, spectra and catalogs.
+
+    import quakesense_core as qs
+
+    record = qs.read_asc("20250423094910_3416_ap_RawAcc_N.asc")
+    im = qs.intensity_measures(record.data, record.dt)        # IntensityMeasures
+    pre = qs.preprocess_boore(record.data, 1.0 / record.dt)
+    rs = qs.response_spectrum(pre, record.dt)                 # ResponseSpectrum
+    hv = qs.hvsr(qs.group_of(record.path).load().data, record.dt)
+
+The functions are plain NumPy and return the dataclasses listed in
+``EXPORTS``; the GUI pages only draw them. Names resolve lazily (PEP 562):
+``import quakesense_core`` loads none of the analysis modules, and the
+first use of a name imports just the module that defines it, so the signal
+functions cost a NumPy import and only the catalogs pull in pandas.
+Nothing here imports PyQt5, matplotlib or folium; ``python -m
+quakesense_core`` checks that and reports the import times.
+"""
+
+import importlib
+
+# Ad -> tanımlandığı modül (gui-z altındaki düz modüller)
+EXPORTS = {
+    # Kayıtlar
+    "AscHeader": "asc_reader",
+    "AscRecord": "asc_reader",
+    "AscStream": "asc_reader",
+    "RecordStore": "asc_reader",
+    "SidecarCache": "asc_reader",
+    "read_asc": "asc_reader",
+    "load_record": "asc_reader",
+    "RecordGroup": "record_groups",
+    "AlignedRecords": "record_groups",
+    "find_groups": "record_groups",
+    "group_of": "record_groups",
+    "stream_measures": "streaming",
+    "stream_motion": "streaming",
+    # Ön işleme
+    "DEFAULT_CORNER_FREQ": "preprocessing",
+    "detrend": "preprocessing",
+    "highpass_fft": "preprocessing",
+    "preprocess_boore": "preprocessing",
+    "cumtrapz": "preprocessing",
+    "integrate_motion": "preprocessing",
+    "stack_traces": "preprocessing",
+    # Şiddet ölçüleri
+    "IntensityMeasures": "intensity_measures",
+    "intensity_measures": "intensity_measures",
+    "peak": "intensity_measures",
+    "bracketed_duration": "intensity_measures",
+    "site_frequency": "intensity_measures",
+    "arias_intensity": "intensity_measures",
+    "rotd_measures": "rotd",
+    "ResponseSpectrum": "response_spectrum",
+    "response_spectrum": "response_spectrum",
+    "DEFAULT_PERIODS": "response_spectrum",
+    "DEFAULT_DAMPING": "response_spectrum",
+    "PhasePicks": "phase_picker",
+    "pick_phases": "phase_picker",
+    "StationMeasures": "station_measures",
+    "STANDARD_PERIODS": "station_measures",
+    "event_groups": "station_measures",
+    "measure_station": "station_measures",
+    "measure_event": "station_measures",
+    # Spektrumlar
+    "Spectrum": "spectral_engine",
+    "Spectrogram": "spectral_engine",
+    "spectrum": "spectral_engine",
+    "stft": "spectral_engine",
+    "welch": "spectral_engine",
+    "HvsrResult": "hvsr",
+    "hvsr": "hvsr",
+    "smoothed_spectrum": "hvsr",
+    # Kataloglar
+    "EventCatalog": "event_catalog",
+    "load_catalog": "event_catalog",
+    "StationRegistry": "station_registry",
+    "load_registry": "station_registry",
+    # Sayfa özellikleri (GraphsPage'in çizdiği sonuçlar)
+    "FEATURES": "feature_compute",
+    "compute_feature": "feature_compute",
+}
+
+__all__ = sorted(EXPORTS)
+
+
+def __getattr__(name):
+    module_name = EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(EXPORTS))
@@ -0,0 +1,96 @@
+"""Import-time and isolation check of the core package.
+
+    python -m quakesense_core                 # from gui-z; exit 1 on a violation
+    python -m quakesense_core --budget 80     # ms allowed on top of NumPy
+
+Every group is imported in a fresh interpreter; a group fails if it loads
+a GUI module or, except for the catalogs, adds more than the budget to the
+time NumPy alone takes to import on the same machine (measured the same
+way), so the check does not depend on how fast the machine is.
+``$QUAKESENSE_IMPORT_BUDGET_MS`` sets the default budget.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from . import EXPORTS
+
+IMPORT_BUDGET_MS = 50.0           # on top of the NumPy import
+BUDGET_ENV = "QUAKESENSE_IMPORT_BUDGET_MS"
+GUI_MODULES = ("PyQt5", "matplotlib", "folium", "branca", "jinja2")
+RUNS = 5
+
+# Grup -> ilk kullanımda çözülen adlar; kataloglar pandas yüklediği için bütçe dışı
+GROUPS = {
+    "package": [],
+    "records": ["read_asc", "find_groups", "stream_measures"],
+    "signal": ["preprocess_boore", "intensity_measures", "response_spectrum", "pick_phases", "rotd_measures"],
+    "spectra": ["spectrum", "stft", "hvsr"],
+    "stations": ["measure_event"],
+    "features": ["compute_feature"],
+    "catalogs": ["load_catalog", "load_registry"],
+}
+UNBUDGETED = {"catalogs"}
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{imports}
+ms = (time.perf_counter() - start) * 1000.0
+loaded = sorted({{m.split(".")[0] for m in sys.modules}} & set({gui!r}))
+print(json.dumps({{"ms": ms, "gui": loaded, "pandas": "pandas" in sys.modules}}))
+"""
+
+
+def probe(names=None):
+    """Best of ``RUNS`` fresh-interpreter imports of ``names`` (None: NumPy alone, for reference)."""
+    if names is None:
+        imports = "import numpy"
+    else:
+        imports = "import quakesense_core as qs\n" + "".join(f"qs.{name}\n" for name in names)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    best = None
+    for _ in range(RUNS):
+        out = subprocess.run([sys.executable, "-c", PROBE.format(imports=imports, gui=GUI_MODULES)],
+                             capture_output=True, text=True, cwd=root, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        if best is None or result["ms"] < best["ms"]:
+            best = result
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m quakesense_core", description="Core package import check.")
+    parser.add_argument("--budget", type=float, default=float(os.environ.get(BUDGET_ENV) or IMPORT_BUDGET_MS),
+                        help=f"ms a group may add to the NumPy import (default: ${BUDGET_ENV} or %(default)s)")
+    args = parser.parse_args(argv)
+
+    unknown = [name for names in GROUPS.values() for name in names if name not in EXPORTS]
+    if unknown:
+        print(f"[ERROR] Not exported: {', '.join(unknown)}")
+        return 1
+    numpy_ms = probe()["ms"]
+    print(f"{'numpy':<10} {numpy_ms:7.1f} ms  (baseline; budget {args.budget:.0f} ms on top of it)")
+    failed = False
+    for group, names in GROUPS.items():
+        result = probe(names)
+        # 'package' NumPy yüklemez; ondan düşülecek bir taban yok
+        extra = result["ms"] - numpy_ms if names else result["ms"]
+        problems = []
+        if result["gui"]:
+            problems.append(f"imports {', '.join(result['gui'])}")
+        if group not in UNBUDGETED and extra > args.budget:
+            problems.append(f"over the {args.budget:.0f} ms budget")
+        if group not in UNBUDGETED and result["pandas"]:
+            problems.append("imports pandas")
+        failed = failed or bool(problems)
+        status = "; ".join(problems) if problems else "ok"
+        print(f"{group:<10} {result['ms']:7.1f} ms  {extra:+7.1f} ms  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
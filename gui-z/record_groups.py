@@ -0,0 +1,169 @@
+"""Three-component record groups: the N/E/Z files of one station and event.
+
+AFAD exports every component as its own ``.asc`` file. ``find_groups``
+pairs them by the header's event and station (falling back to the file
+name without its component suffix) from the headers alone; ``load`` reads
+the samples through the shared record store and aligns them on the first
+sample time into one ``(components, n)`` array.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+import glob
+import os
+
+import numpy as np
+
+from asc_reader import AscStream, load_record
+
+COMPONENTS = ("N", "E", "Z")
+HORIZONTAL = ("N", "E")
+
+# Kanal harfi -> bileşen (HN1/HN2 yatay, U düşey için)
+COMPONENT_ALIASES = {"N": "N", "1": "N", "E": "E", "2": "E", "Z": "Z", "U": "Z", "3": "Z"}
+
+# Örnekleme aralığının bu oranı kadar fark aynı kabul edilir
+DT_TOLERANCE = 1e-6
+
+
+def component_of(path, header):
+    """Component letter from the stream code (``HNN`` -> ``N``) or ``_N.asc`` suffix."""
+    if header.stream:
+        return header.stream[-1].upper()
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return stem.rsplit("_", 1)[-1].upper() if "_" in stem else ""
+
+
+def group_key(path, header):
+    """``(event, station)`` identifying the group a component file belongs to."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    prefix = stem.rsplit("_", 1)[0] if "_" in stem else stem
+    return (header.event_id or header.event_name or prefix,
+            header.station_code or prefix)
+
+
+def first_sample_time(header):
+    """Start time of the record as ``datetime``, or None if the header has none."""
+    value = (header.first_sample_time or "").strip()
+    for fmt in ("%Y%m%d_%H%M%S.%f", "%Y%m%d_%H%M%S"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    return None
+
+
+@dataclass
+class AlignedRecords:
+    event_id: str
+    station_code: str
+    components: tuple   # component letter of every row of ``data``
+    data: np.ndarray    # (components, n), common time window
+    dt: float
+    headers: dict       # component -> AscHeader
+    offsets: dict       # component -> samples dropped from the start
+
+    @property
+    def n_samples(self):
+        return int(self.data.shape[-1])
+
+    @property
+    def time(self):
+        return np.arange(self.n_samples) * self.dt
+
+    def component(self, name):
+        return self.data[self.components.index(name)]
+
+    @property
+    def horizontal(self):
+        """``(2, n)`` N and E rows, for RotD measures."""
+        missing = [c for c in HORIZONTAL if c not in self.components]
+        if missing:
+            raise ValueError(f"{self.station_code}: missing horizontal component(s) {', '.join(missing)}.")
+        return self.data[[self.components.index(c) for c in HORIZONTAL]]
+
+
+@dataclass
+class RecordGroup:
+    event_id: str
+    station_code: str
+    paths: dict = field(default_factory=dict)   # component -> path
+
+    @property
+    def components(self):
+        return tuple(c for c in COMPONENTS if c in self.paths)
+
+    @property
+    def complete(self):
+        return all(c in self.paths for c in COMPONENTS)
+
+    def load(self, loader=load_record):
+        """Read the components and cut them to their common time window."""
+        if not self.paths:
+            raise ValueError(f"{self.station_code}: no component files.")
+        components = self.components
+        records = [loader(self.paths[c]) for c in components]
+
+        dt = records[0].dt
+        for c, record in zip(components, records):
+            if abs(record.dt - dt) > DT_TOLERANCE * dt:
+                raise ValueError(f"{self.station_code}: component {c} has dt={record.dt} s, expected {dt} s.")
+
+        # Geç başlayan bileşene göre hizala; başlangıç zamanı yoksa ilk örnekten
+        starts = [first_sample_time(r.header) for r in records]
+        if all(s is not None for s in starts):
+            latest = max(starts)
+            shifts = [int(round((latest - s).total_seconds() / dt)) for s in starts]
+        else:
+            shifts = [0] * len(records)
+        n = min(r.n_samples - shift for r, shift in zip(records, shifts))
+        if n <= 0:
+            raise ValueError(f"{self.station_code}: components do not overlap in time.")
+
+        data = np.empty((len(records), n))
+        for row, record, shift in zip(data, records, shifts):
+            row[:] = record.data[shift:shift + n]
+        return AlignedRecords(
+            event_id=self.event_id,
+            station_code=self.station_code,
+            components=components,
+            data=data,
+            dt=dt,
+            headers={c: r.header for c, r in zip(components, records)},
+            offsets=dict(zip(components, shifts)),
+        )
+
+
+def find_groups(paths):
+    """Group component files by event and station; files with an unknown component are skipped."""
+    groups = {}
+    for path in paths:
+        try:
+            header = AscStream(path).header
+        except OSError as e:
+            print(f"[WARN] Could not read {path}: {e}")
+            continue
+        component = COMPONENT_ALIASES.get(component_of(path, header))
+        if component is None:
+            print(f"[WARN] {os.path.basename(path)}: unknown component, skipped.")
+            continue
+        key = group_key(path, header)
+        group = groups.setdefault(key, RecordGroup(*key))
+        if component in group.paths:
+            print(f"[WARN] {os.path.basename(path)}: duplicate {component} component for {key[1]}, skipped.")
+            continue
+        group.paths[component] = path
+    return sorted(groups.values(), key=lambda g: (str(g.event_id), str(g.station_code)))
+
+
+def group_of(path):
+    """The group of ``path`` together with its sibling component files."""
+    path = os.path.abspath(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    prefix = stem.rsplit("_", 1)[0] if "_" in stem else stem
+    siblings = glob.glob(os.path.join(os.path.dirname(path), glob.escape(prefix) + "_*.asc"))
+    key = group_key(path, AscStream(path).header)
+    for group in find_groups(sorted(set(siblings) | {path})):
+        if (group.event_id, group.station_code) == key:
+            return group
+    return RecordGroup(*key)
@@ -0,0 +1,32 @@
+"""Resources shared by every page (stylesheet, scaled logo), loaded once per process."""
+
+import os
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmap
+
+STYLE_FILE = "style.qss"
+LOGO_FILE = "quakesense_logo.png"
+LOGO_SIZE = 120
+
+_stylesheet = None
+_logos = {}
+
+
+def stylesheet():
+    global _stylesheet
+    if _stylesheet is None:
+        try:
+            with open(STYLE_FILE, "r") as f:
+                _stylesheet = f.read()
+        except Exception as e:
+            print(f"Style load failed: {e}")
+            _stylesheet = ""
+    return _stylesheet
+
+
+def logo_pixmap(size=LOGO_SIZE):
+    """The logo decoded once and scaled once per size."""
+    if size not in _logos:
+        _logos[size] = QPixmap(os.path.abspath(LOGO_FILE)).scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    return _logos[size]
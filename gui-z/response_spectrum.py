@@ -0,0 +1,215 @@
+"""Elastic SDOF response spectra (SD, PSV, PSA).
+
+Replaces the per-period, per-sample Newmark loop of ``ensonpreprocessed.m``
+(Step 16). The oscillator is integrated with the exact recurrence for a
+piecewise-linear ground acceleration (Nigam & Jennings, 1969). For an
+underdamped oscillator that 2x2 recurrence diagonalises into one complex
+first-order recurrence per period,
+
+    w[k+1] = lam * w[k] + F[k],    u[k] = Re(w[k]),
+
+so each time step is a single complex multiply-add over *all* periods and
+damping ratios at once. The time recurrence itself is evaluated blockwise
+(see :func:`_scan`) so the Python-level loops are O(sqrt(n)), not O(n).
+
+Run ``python response_spectrum.py`` for a timing against the naive loop
+(best of several runs, with the machine it ran on).
+"""
+
+from dataclasses import dataclass
+import os
+import time
+
+import numpy as np
+
+DEFAULT_DAMPING = 0.05
+DEFAULT_PERIODS = np.linspace(0.01, 4, 200)
+
+# Time steps whose forcing terms are materialised at once; bounds memory
+# to a few BLOCK_SIZE * n_oscillators complex arrays.
+BLOCK_SIZE = 16384
+
+
+@dataclass
+class ResponseSpectrum:
+    periods: np.ndarray
+    damping: np.ndarray
+    sd: np.ndarray   # spectral displacement, input units * s^2
+    psv: np.ndarray  # pseudo-spectral velocity, omega * SD
+    psa: np.ndarray  # pseudo-spectral acceleration, omega^2 * SD
+
+
+def _modal_coefficients(omega, zeta, dt):
+    """Per-oscillator ``lam`` and the forcing weights for a[k] and a[k+1]."""
+    omega_d = omega * np.sqrt(1.0 - zeta ** 2)
+    s = -zeta * omega + 1j * omega_d
+    lam = np.exp(s * dt)
+
+    # Exact integrals of exp(s(dt - tau)) against the two linear hat
+    # functions (1 - tau/dt) and tau/dt over one step.
+    c1 = (lam - 1.0) / (s ** 2 * dt) - 1.0 / s
+    c0 = (lam - 1.0) / s - c1
+
+    # u'' + 2 zeta omega u' + omega^2 u = -a_g, in modal form with
+    # u = Re(w): the input weight is -1 / (i omega_d).
+    scale = 1j / omega_d
+    return lam, -scale * c0, -scale * c1
+
+
+def _scan(w0, lam, forcing):
+    """All states of ``w[k+1] = lam * w[k] + forcing[k]`` starting from ``w0``.
+
+    The steps are cut into ~sqrt(n) blocks: the in-block partial sums are
+    built for every block at once, then the block start states are carried
+    forward, so the Python loops run O(sqrt(n)) times instead of n times.
+    Only non-negative powers of ``lam`` (|lam| < 1) are used.
+    """
+    steps = forcing.shape[0]
+    width = max(1, int(np.sqrt(steps)))
+    n_blocks = -(-steps // width)
+    padded = np.zeros((n_blocks * width,) + forcing.shape[1:], dtype=np.complex128)
+    padded[:steps] = forcing
+    blocks = padded.reshape((n_blocks, width) + forcing.shape[1:])
+
+    partial = np.empty_like(blocks)
+    acc = np.zeros_like(blocks[:, 0])
+    for j in range(width):
+        acc *= lam
+        acc += blocks[:, j]
+        partial[:, j] = acc
+
+    lam_width = lam ** width
+    starts = np.empty_like(partial[:, 0])
+    state = w0
+    for b in range(n_blocks):
+        starts[b] = state
+        state = lam_width * state + partial[b, -1]
+
+    exponents = np.arange(1, width + 1).reshape((width,) + (1,) * (forcing.ndim - 1))
+    powers = lam ** exponents
+    states = starts[:, None] * powers + partial
+    return states.reshape((-1,) + forcing.shape[1:])[:steps]
+
+
+def displacement_blocks(acc, dt, omega, zeta):
+    """Oscillator displacements ``u[1:]`` of ``acc`` in blocks of time steps.
+
+    ``acc`` has shape ``(traces, n)``; every yielded block has shape
+    ``(steps, traces, len(omega))``. ``u[0]`` is zero and not yielded.
+    """
+    lam, f0, f1 = _modal_coefficients(np.asarray(omega, float), np.asarray(zeta, float), dt)
+    n = acc.shape[-1]
+    w = np.zeros((acc.shape[0], lam.size), dtype=np.complex128)
+    for start in range(0, n - 1, BLOCK_SIZE):
+        stop = min(start + BLOCK_SIZE, n - 1)
+        forcing = np.multiply.outer(acc[:, start:stop].T, f0)   # (steps, traces, n_osc)
+        forcing += np.multiply.outer(acc[:, start + 1:stop + 1].T, f1)
+        states = _scan(w, lam, forcing)
+        w = states[-1]
+        yield states.real
+
+
+def peak_displacement(acc, dt, omega, zeta):
+    """Max |u| of every oscillator, vectorised over the trailing oscillator axis.
+
+    ``acc`` has shape ``(..., n)``; ``omega`` and ``zeta`` are 1-D and equal
+    length. The result has shape ``(..., len(omega))``.
+    """
+    acc = np.asarray(acc, dtype=np.float64)
+    lead = acc.shape[:-1]
+    a = acc.reshape(-1, acc.shape[-1])          # (traces, n)
+    peak = np.zeros((a.shape[0], np.size(omega)))
+    for u in displacement_blocks(a, dt, omega, zeta):
+        np.maximum(peak, np.abs(u).max(axis=0), out=peak)
+    return peak.reshape(lead + (np.size(omega),))
+
+
+def response_spectrum(acc, dt, periods=DEFAULT_PERIODS, damping=DEFAULT_DAMPING):
+    """SD, PSV and PSA of ``acc`` for every period and damping ratio.
+
+    ``acc`` may be 1-D or ``(..., n)``. Output arrays have shape
+    ``(..., len(periods))`` for a scalar ``damping`` and
+    ``(..., len(damping), len(periods))`` for a sequence of ratios.
+    """
+    periods = np.atleast_1d(np.asarray(periods, dtype=np.float64))
+    zetas = np.atleast_1d(np.asarray(damping, dtype=np.float64))
+    if np.any(periods <= 0):
+        raise ValueError("Periods must be positive.")
+    if np.any((zetas < 0) | (zetas >= 1)):
+        raise ValueError("Damping ratios must be in [0, 1).")
+
+    omega = 2 * np.pi / periods
+    omega_grid = np.broadcast_to(omega, (zetas.size, periods.size)).ravel()
+    zeta_grid = np.repeat(zetas, periods.size)
+
+    sd = peak_displacement(acc, dt, omega_grid, zeta_grid)
+    sd = sd.reshape(sd.shape[:-1] + (zetas.size, periods.size))
+    if np.ndim(damping) == 0:
+        sd = sd[..., 0, :]
+    return ResponseSpectrum(periods=periods, damping=zetas, sd=sd, psv=omega * sd, psa=omega ** 2 * sd)
+
+
+def naive_response_spectrum(acc, dt, periods=DEFAULT_PERIODS, damping=DEFAULT_DAMPING):
+    """Reference implementation: classic real Nigam-Jennings, one period at a time."""
+    acc = [float(v) for v in acc]
+    sd = []
+    for period in periods:
+        w = 2 * np.pi / period
+        z = damping
+        wd = w * np.sqrt(1 - z ** 2)
+        e = np.exp(-z * w * dt)
+        sn, cs = np.sin(wd * dt), np.cos(wd * dt)
+        q = z / np.sqrt(1 - z ** 2)
+        k1 = (2 * z ** 2 - 1) / (w ** 2 * dt)
+        k2 = 2 * z / (w ** 3 * dt)
+
+        a11 = e * (q * sn + cs)
+        a12 = e * sn / wd
+        a21 = -w / np.sqrt(1 - z ** 2) * e * sn
+        a22 = e * (cs - q * sn)
+        b11 = e * ((k1 + z / w) * sn / wd + (k2 + 1 / w ** 2) * cs) - k2
+        b12 = -e * (k1 * sn / wd + k2 * cs) - 1 / w ** 2 + k2
+        b21 = (e * ((k1 + z / w) * (cs - q * sn) - (k2 + 1 / w ** 2) * (wd * sn + z * w * cs))
+               + 1 / (w ** 2 * dt))
+        b22 = -e * (k1 * (cs - q * sn) - k2 * (wd * sn + z * w * cs)) - 1 / (w ** 2 * dt)
+
+        u = v = 0.0
+        peak = 0.0
+        for j in range(len(acc) - 1):
+            u, v = (a11 * u + a12 * v + b11 * acc[j] + b12 * acc[j + 1],
+                    a21 * u + a22 * v + b21 * acc[j] + b22 * acc[j + 1])
+            peak = max(peak, abs(u))
+        sd.append(peak)
+    return np.array(sd)
+
+
+def _best_time(func, repeats):
+    best, result = None, None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def benchmark(n_samples=10000, n_periods=200, dt=0.01, seed=0, repeats=5):
+    """Best-of-``repeats`` timing of the vectorised engine against the naive loop (best of 2)."""
+    import platform
+    rng = np.random.default_rng(seed)
+    acc = rng.standard_normal(n_samples) * np.exp(-np.linspace(0, 5, n_samples))
+    periods = np.linspace(0.01, 4, n_periods)
+
+    fast_s, fast = _best_time(lambda: response_spectrum(acc, dt, periods), repeats)
+    slow_s, slow = _best_time(lambda: naive_response_spectrum(acc, dt, periods), min(repeats, 2))
+
+    err = np.max(np.abs(fast.sd - slow) / np.maximum(np.abs(slow), 1e-300))
+    print(f"{n_periods} periods x {n_samples} samples  ({platform.machine()}, {os.cpu_count()} CPU,"
+          f" Python {platform.python_version()}, NumPy {np.__version__})")
+    print(f"  vectorised : {fast_s * 1000:9.1f} ms")
+    print(f"  naive loop : {slow_s * 1000:9.1f} ms  ({slow_s / fast_s:.0f}x slower)")
+    print(f"  max rel. SD difference: {err:.2e}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,78 @@
+"""Orientation-independent horizontal measures (RotD50, RotD100).
+
+The two horizontal components are rotated through ``ROTD_ANGLES`` angles
+in [0, 180) degrees (Boore, 2010). All rotations come out of one matrix
+product of the ``(angles, 2)`` rotation matrix with the ``(2, ...)``
+component stack, for the acceleration traces as well as for the SDOF
+displacement histories (rotating the ground motion rotates the linear
+oscillator response). RotDnn is the nn-th percentile over angles of the
+peak of each rotated trace.
+"""
+
+import numpy as np
+
+from preprocessing import DEFAULT_CORNER_FREQ, preprocess_boore
+from response_spectrum import DEFAULT_DAMPING, DEFAULT_PERIODS, displacement_blocks
+
+ROTD_ANGLES = 180
+ROTD_PERCENTILES = (50, 100)
+
+# Elements of one rotated block (angles x samples x oscillators)
+BLOCK_ELEMENTS = 1 << 22
+
+
+def rotation_matrix(n_angles=ROTD_ANGLES):
+    """``(n_angles, 2)``: row ``i`` projects (H1, H2) onto angle ``i * 180 / n_angles`` degrees."""
+    theta = np.arange(n_angles) * (np.pi / n_angles)
+    return np.column_stack([np.cos(theta), np.sin(theta)])
+
+
+def rotated_peaks(horizontal, n_angles=ROTD_ANGLES):
+    """Peak |x| of the rotated trace for every angle; ``horizontal`` is ``(2, n)``."""
+    horizontal = np.asarray(horizontal, dtype=np.float64)
+    rotation = rotation_matrix(n_angles)
+    step = max(1, BLOCK_ELEMENTS // n_angles)
+    peaks = np.zeros(n_angles)
+    for start in range(0, horizontal.shape[-1], step):
+        rotated = rotation @ horizontal[:, start:start + step]
+        np.maximum(peaks, np.abs(rotated).max(axis=-1), out=peaks)
+    return peaks
+
+
+def rotated_spectral_peaks(horizontal, dt, periods=DEFAULT_PERIODS, damping=DEFAULT_DAMPING, n_angles=ROTD_ANGLES):
+    """Peak SDOF displacement for every angle and period, shape ``(n_angles, len(periods))``."""
+    horizontal = np.asarray(horizontal, dtype=np.float64)
+    periods = np.atleast_1d(np.asarray(periods, dtype=np.float64))
+    omega = 2 * np.pi / periods
+    rotation = rotation_matrix(n_angles)
+    step = max(1, BLOCK_ELEMENTS // (n_angles * periods.size))
+    peaks = np.zeros((n_angles, periods.size))
+    for u in displacement_blocks(horizontal, dt, omega, np.full(periods.size, damping)):
+        # (adım, 2, periyot) -> (adım, açı, periyot)
+        for start in range(0, len(u), step):
+            rotated = rotation @ u[start:start + step]
+            np.maximum(peaks, np.abs(rotated).max(axis=0), out=peaks)
+    return peaks
+
+
+def rotd_measures(horizontal, dt, periods=DEFAULT_PERIODS, damping=DEFAULT_DAMPING,
+                  corner_freq=DEFAULT_CORNER_FREQ, percentiles=ROTD_PERCENTILES, n_angles=ROTD_ANGLES):
+    """RotDnn PGA (cm/s^2) and PSA of two raw horizontal components.
+
+    Both components are preprocessed as in ``compute_intensity_measures``.
+    Returns ``pga_rotdNN`` scalars and ``sa_rotdNN`` arrays over ``periods``.
+    """
+    horizontal = np.asarray(horizontal, dtype=np.float64)
+    if horizontal.ndim != 2 or horizontal.shape[0] != 2:
+        raise ValueError(f"Expected two horizontal components, got shape {horizontal.shape}.")
+    pre = preprocess_boore(horizontal, 1.0 / dt, corner_freq)
+    periods = np.atleast_1d(np.asarray(periods, dtype=np.float64))
+
+    pga = np.percentile(rotated_peaks(pre, n_angles), percentiles)
+    sa = (2 * np.pi / periods) ** 2 * np.percentile(
+        rotated_spectral_peaks(pre, dt, periods, damping, n_angles), percentiles, axis=0)
+    result = {"periods": periods}
+    for i, nn in enumerate(percentiles):
+        result[f"pga_rotd{nn}"] = float(pga[i])
+        result[f"sa_rotd{nn}"] = sa[i]
+    return result
@@ -0,0 +1,151 @@
+"""Shared FFT engine for the spectral features and the spectrogram page.
+
+Every transform is padded to a 5-smooth length (``next_fast_len``), so
+NumPy's pocketfft reuses its cached twiddle factors ("plan") for the
+handful of lengths a session actually sees instead of factoring a fresh,
+possibly prime, length on every call. Windows and frequency axes are
+cached per length as read-only arrays. Short-time transforms take all
+segments of a trace as one strided 2-D view and run a single batched
+``rfft`` per block of segments.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from preprocessing import next_fast_len
+
+WINDOWS = {
+    "hann": np.hanning,
+    "hamming": np.hamming,
+    "blackman": np.blackman,
+    "boxcar": np.ones,
+}
+DEFAULT_WINDOW = "hann"
+CACHE_SIZE = 32
+MAX_COLUMNS = 2000           # spectrogram columns returned at most
+SEGMENT_BLOCK = 1 << 21      # samples transformed per batched FFT
+
+
+def _cached(cache, key, build):
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        value.setflags(write=False)
+        cache[key] = value
+        while len(cache) > CACHE_SIZE:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(key)
+    return value
+
+
+_windows = OrderedDict()
+_freqs = OrderedDict()
+
+
+def get_window(name, n):
+    """Periodic (DFT-even) window ``name`` of length ``n``, as used for spectral analysis (cached)."""
+    if name not in WINDOWS:
+        raise ValueError(f"Unknown window '{name}' (choose from {', '.join(WINDOWS)}).")
+    return _cached(_windows, (name, n), lambda: np.asarray(WINDOWS[name](n + 1)[:-1], dtype=np.float64))
+
+
+def rfft_freqs(n_fft, dt):
+    return _cached(_freqs, (n_fft, dt), lambda: np.fft.rfftfreq(n_fft, dt))
+
+
+def padded_rfft(data, n=None):
+    """``(n_fft, rfft)`` of the last axis zero-padded to a fast length >= ``n``."""
+    data = np.asarray(data, dtype=np.float64)
+    n_fft = next_fast_len(n or data.shape[-1])
+    return n_fft, np.fft.rfft(data, n_fft, axis=-1)
+
+
+@dataclass
+class Spectrum:
+    freqs: np.ndarray
+    amplitude: np.ndarray   # single-sided, MATLAB Step 12 scaling
+    phase: np.ndarray       # radians, wrapped to (-pi, pi]
+
+
+def spectrum(signal, dt):
+    """Single-sided amplitude and phase spectrum of one trace."""
+    signal = np.asarray(signal, dtype=np.float64)
+    n = signal.shape[-1]
+    n_fft, values = padded_rfft(signal)
+    amplitude = np.abs(values) / n
+    amplitude[..., 1:] *= 2  # Tek taraflı spektrum ölçekleme
+    if n_fft % 2 == 0:
+        amplitude[..., -1] /= 2
+    return Spectrum(freqs=rfft_freqs(n_fft, dt), amplitude=amplitude, phase=np.angle(values))
+
+
+@dataclass
+class Spectrogram:
+    times: np.ndarray    # centre of every column, s
+    freqs: np.ndarray    # Hz
+    power: np.ndarray    # (columns, freqs) one-sided PSD, units^2/Hz
+    counts: np.ndarray   # segments averaged into every column
+    nperseg: int
+    step: int
+
+
+def segment_layout(n, dt, window_s, overlap):
+    """``(nperseg, step, segments)`` for a window in seconds and an overlap fraction."""
+    nperseg = int(min(max(2, round(window_s / dt)), n))
+    step = max(1, int(round(nperseg * (1.0 - min(max(overlap, 0.0), 0.99)))))
+    segments = 1 + (n - nperseg) // step if n >= nperseg else 0
+    return nperseg, step, segments
+
+
+def stft(signal, dt, window_s, overlap=0.5, window=DEFAULT_WINDOW, max_columns=MAX_COLUMNS):
+    """Short-time power spectral density of ``signal``.
+
+    Segments are detrended by their mean, windowed and transformed in
+    batches. When there are more segments than ``max_columns``, adjacent
+    ones are averaged (Welch style) into ``max_columns`` columns, so memory
+    stays bounded for long records.
+    """
+    signal = np.asarray(signal, dtype=np.float64)
+    nperseg, step, segments = segment_layout(signal.size, dt, window_s, overlap)
+    if segments == 0:
+        raise ValueError("Record is shorter than the analysis window.")
+    w = get_window(window, nperseg)
+    n_fft = next_fast_len(nperseg)
+    freqs = rfft_freqs(n_fft, dt)
+    scale = np.full(freqs.size, 2.0 * dt / np.sum(w ** 2))
+    scale[0] /= 2
+    if n_fft % 2 == 0:
+        scale[-1] /= 2
+
+    columns = min(segments, max_columns)
+    group = -(-segments // columns)
+    columns = -(-segments // group)
+    power = np.empty((columns, freqs.size))
+    view = np.lib.stride_tricks.sliding_window_view(signal, nperseg)[::step]
+    # Parça blokları sütun sınırlarında başlar (group'un katı)
+    batch = max(1, SEGMENT_BLOCK // nperseg // group) * group
+    for start in range(0, segments, batch):
+        seg = view[start:start + batch]
+        seg = (seg - seg.mean(axis=1, keepdims=True)) * w
+        p = np.abs(np.fft.rfft(seg, n_fft, axis=1)) ** 2 * scale
+        first = start // group
+        power[first:first + -(-len(seg) // group)] = np.add.reduceat(p, np.arange(0, len(seg), group), axis=0)
+
+    counts = np.bincount(np.arange(segments) // group, minlength=columns)
+    power /= counts[:, None]
+    centres = (np.arange(segments) * step + nperseg / 2.0) * dt
+    times = np.bincount(np.arange(segments) // group, centres, columns) / counts
+    return Spectrogram(times=times, freqs=freqs, power=power, counts=counts, nperseg=nperseg, step=step)
+
+
+def welch(signal, dt, window_s, overlap=0.5, window=DEFAULT_WINDOW):
+    """``(freqs, psd)``: Welch average of the short-time spectra."""
+    spec = stft(signal, dt, window_s, overlap, window)
+    return spec.freqs, welch_average(spec)
+
+
+def welch_average(spec):
+    return spec.counts @ spec.power / spec.counts.sum()
@@ -0,0 +1,34 @@
+"""Per-phase startup timing, printed once the first window has been painted."""
+
+import os
+import time
+
+TARGET_ENV = "QUAKESENSE_STARTUP_TARGET_MS"
+DEFAULT_TARGET_MS = 1500
+
+
+class StartupTimer:
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.phases = []          # (name, ms)
+        self._last = self.start
+
+    def mark(self, name):
+        """Close the phase that started at the previous mark."""
+        now = time.perf_counter()
+        self.phases.append((name, (now - self._last) * 1000.0))
+        self._last = now
+
+    def total_ms(self):
+        return (self._last - self.start) * 1000.0
+
+    def report(self, target_ms=None):
+        if target_ms is None:
+            target_ms = float(os.environ.get(TARGET_ENV) or DEFAULT_TARGET_MS)
+        total = self.total_ms()
+        breakdown = " | ".join(f"{name} {ms:.0f} ms" for name, ms in self.phases)
+        print(f"[STARTUP] {breakdown} | total {total:.0f} ms")
+        if total > target_ms:
+            slowest = max(self.phases, key=lambda phase: phase[1])[0] if self.phases else "-"
+            print(f"[WARN] Time to first window {total:.0f} ms exceeds the {target_ms:.0f} ms target (slowest: {slowest}).")
+        return total
@@ -0,0 +1,196 @@
+"""Ground-motion measures of every station that recorded an event.
+
+``event_groups`` finds the event's N/E/Z files under the record folders:
+``$QUAKESENSE_RECORDS_DIR`` (``os.pathsep``-separated, searched
+recursively), else ``records/`` recursively and the ``.asc`` files next to
+the app. A file belongs to the event when its EVENT_ID or EVENT_NAME is the
+catalog ID, when it sits in a folder named after the ID, or when its origin
+time is within ``ORIGIN_TOLERANCE_S`` of the catalog's. Headers are read
+once per file version.
+
+``measure_event`` computes PGA, PGV, PGD, Arias intensity and PSA at
+``STANDARD_PERIODS`` for every station on a thread pool and hands over each
+:class:`StationMeasures` as soon as it is done, so the station page fills
+its table progressively. Threads rather than processes: the filters and the
+response-spectrum recurrence are NumPy array work that releases the GIL,
+and spawned workers would re-import the Qt main module.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+import glob
+import os
+
+import numpy as np
+
+from asc_reader import AscStream, record_store
+from intensity_measures import intensity_measures
+from preprocessing import DEFAULT_CORNER_FREQ, preprocess_boore
+from profiling import span
+from record_groups import HORIZONTAL, find_groups
+from response_spectrum import DEFAULT_DAMPING, response_spectrum
+
+RECORDS_DIR_ENV = "QUAKESENSE_RECORDS_DIR"
+DEFAULT_RECORD_PATTERNS = (os.path.join("records", "**", "*.asc"), "*.asc")
+STANDARD_PERIODS = (0.1, 0.2, 0.3, 0.5, 1.0, 2.0, 3.0)
+ORIGIN_TOLERANCE_S = 60.0
+MAX_WORKERS = 8
+
+# Dosya yolu -> (mtime, başlık); olay değiştikçe başlıklar yeniden okunmaz
+_headers = {}
+
+
+@dataclass
+class StationMeasures:
+    """Measures of one station; arrays have one row per entry of ``components``."""
+    station_code: str
+    components: tuple = ()
+    periods: np.ndarray = None
+    pga_cm_s2: np.ndarray = None
+    pgv_cm_s: np.ndarray = None
+    pgd_cm: np.ndarray = None
+    arias_m_s: np.ndarray = None
+    psa_cm_s2: np.ndarray = None          # (components, periods), 5 % damping
+    epicentral_distance_km: float = None
+    error: str = None
+
+    def horizontal(self, name):
+        """Larger horizontal value of measure ``name`` (of all components if N/E are missing)."""
+        values = getattr(self, name)
+        rows = [i for i, c in enumerate(self.components) if c in HORIZONTAL] or list(range(len(self.components)))
+        return np.max(values[rows], axis=0)
+
+
+def record_patterns():
+    value = os.environ.get(RECORDS_DIR_ENV)
+    if not value:
+        return DEFAULT_RECORD_PATTERNS
+    return tuple(os.path.join(d, "**", "*.asc") for d in value.split(os.pathsep) if d)
+
+
+def record_paths(patterns=None):
+    paths = set()
+    for pattern in patterns or record_patterns():
+        paths.update(os.path.abspath(p) for p in glob.glob(pattern, recursive=True))
+    return sorted(paths)
+
+
+def parse_origin(date, time):
+    """Origin ``datetime`` from catalog (``2023-02-06``, ``04:17:35``) or header (``20230206``, ``041735``) fields."""
+    text = f"{str(date or '').strip()} {str(time or '').strip().split('.')[0]}"
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y%m%d %H%M%S"):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            pass
+    return None
+
+
+def _header(path):
+    mtime = os.stat(path).st_mtime_ns
+    cached = _headers.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = _headers[path] = (mtime, AscStream(path).header)
+    return cached[1]
+
+
+def _belongs(path, header, event_id, origin):
+    if event_id in (header.event_id, header.event_name):
+        return True
+    if event_id in os.path.dirname(path).split(os.sep):
+        return True
+    if origin is None:
+        return False
+    recorded = parse_origin(header.event_date, header.event_time)
+    return recorded is not None and abs((recorded - origin).total_seconds()) <= ORIGIN_TOLERANCE_S
+
+
+def event_groups(event_id, origin=None, patterns=None):
+    """``{station code: RecordGroup}`` of the records of ``event_id`` (see the module docstring)."""
+    event_id = str(event_id).strip()
+    paths = []
+    for path in record_paths(patterns):
+        try:
+            header = _header(path)
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Could not read {path}: {e}")
+            continue
+        if _belongs(path, header, event_id, origin):
+            paths.append(path)
+
+    groups = {}
+    for group in find_groups(paths):
+        code = str(group.station_code).strip()
+        if code in groups:
+            print(f"[WARN] {code}: more than one record set for event {event_id}, keeping the first.")
+            continue
+        groups[code] = group
+    return groups
+
+
+def measure_station(group, periods=STANDARD_PERIODS, corner_freq=DEFAULT_CORNER_FREQ):
+    """:class:`StationMeasures` of one record group; failures are kept in ``error``."""
+    result = StationMeasures(str(group.station_code).strip(), group.components)
+    try:
+        with span("read station records", "io"):
+            # Okuma LRU'yu atlar; yüzlerce istasyon sayfaların kayıtlarını silmesin
+            records = group.load(record_store.read)
+        with span("station measures", "compute"):
+            # Filtre bir kez; ölçüler ve spektrum aynı işlenmiş kaydı kullanır
+            pre = preprocess_boore(records.data, 1.0 / records.dt, corner_freq)
+            measures = intensity_measures(pre, records.dt, preprocessed=True)
+            spectrum = response_spectrum(pre, records.dt, periods, DEFAULT_DAMPING)
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+        return result
+
+    result.components = records.components
+    result.periods = spectrum.periods
+    result.pga_cm_s2 = measures.pga_cm_s2
+    result.pgv_cm_s = measures.pgv_cm_s
+    result.pgd_cm = measures.pgd_cm
+    result.arias_m_s = measures.arias_intensity_m_s
+    result.psa_cm_s2 = spectrum.psa
+    distances = [h.epicentral_distance_km for h in records.headers.values() if h.epicentral_distance_km is not None]
+    result.epicentral_distance_km = distances[0] if distances else None
+    return result
+
+
+def measure_stations(groups, periods=STANDARD_PERIODS, corner_freq=DEFAULT_CORNER_FREQ, workers=None):
+    """Yield the :class:`StationMeasures` of ``groups`` in completion order.
+
+    Closing the generator early drops the stations not started yet.
+    """
+    groups = list(groups)
+    if not groups:
+        return
+    workers = min(len(groups), workers or min(MAX_WORKERS, os.cpu_count() or 1))
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="station")
+    try:
+        futures = [pool.submit(measure_station, group, periods, corner_freq) for group in groups]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def measure_event(event_id, origin=None, periods=STANDARD_PERIODS, corner_freq=DEFAULT_CORNER_FREQ, workers=None,
+                  patterns=None, progress=None, partial=None):
+    """Measures of every station that recorded ``event_id``, in completion order.
+
+    ``partial(result)`` is called as each station finishes and
+    ``progress(fraction)`` after it; either may raise to stop the run.
+    """
+    with span("locate records", "io"):
+        groups = event_groups(event_id, origin, patterns)
+    results = []
+    with closing(measure_stations(groups.values(), periods, corner_freq, workers)) as stations:
+        for result in stations:
+            results.append(result)
+            if partial is not None:
+                partial(result)
+            if progress is not None:
+                progress(len(results) / len(groups))
+    return results
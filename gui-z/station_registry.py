@@ -0,0 +1,168 @@
+"""Station registry with a spatial index (``stations.csv``).
+
+Stations are deduplicated by code and bucketed into a regular lat/lon
+grid stored CSR-style (cell ids sorted once, one ``searchsorted`` per grid
+row of a query). Radius, k-nearest and bounding-box queries only touch
+the cells around the query point and finish with an exact haversine
+distance, so they stay well under a millisecond for national networks.
+
+The ``EventID`` column of ``stations.csv`` is only used for the per-event
+PGA values; which stations belong to an event follows from its epicentre
+in ``events.csv``. Longitudes are not wrapped at the antimeridian.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from event_catalog import load_catalog
+
+DEFAULT_STATIONS_FILE = "stations.csv"
+DEFAULT_RADIUS_KM = 200.0
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = np.pi * EARTH_RADIUS_KM / 180.0
+CELL_DEG = 0.5
+
+STATION_COLUMNS = ["Code", "Latitude", "Longitude", "Province", "District", "Litology", "Vs30", "Morphology"]
+RECORDING_COLUMNS = ["PGA_NS", "PGA_EW", "PGA_UD"]
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class StationRegistry:
+    def __init__(self, df, cell_deg=CELL_DEG):
+        df = df.dropna(subset=["Code"]).copy()
+        df["Code"] = df["Code"].astype(str).str.strip()
+        df = df[df["Code"] != ""]
+
+        # Istasyon bilgisi kod başına bir kez; olay başına PGA ayrı tabloda
+        columns = [c for c in STATION_COLUMNS if c in df.columns]
+        stations = df[columns].drop_duplicates("Code", keep="last")
+        stations = stations.dropna(subset=["Latitude", "Longitude"]).reset_index(drop=True)
+        self.stations = stations
+        self.codes = stations["Code"].to_numpy(dtype=str)
+        self.lat = stations["Latitude"].to_numpy(dtype=float)
+        self.lon = stations["Longitude"].to_numpy(dtype=float)
+
+        if "EventID" in df.columns:
+            rec = df[["EventID", "Code"] + [c for c in RECORDING_COLUMNS if c in df.columns]].copy()
+            rec["EventID"] = rec["EventID"].astype(str).str.strip()
+            self.recordings = rec.drop_duplicates(["EventID", "Code"], keep="last").set_index(["EventID", "Code"])
+        else:
+            self.recordings = pd.DataFrame(columns=["EventID", "Code"]).set_index(["EventID", "Code"])
+
+        # Grid index: stations sorted by flat cell id
+        self.cell_deg = cell_deg
+        self._n_cols = int(np.ceil(360.0 / cell_deg)) + 1
+        rows, cols = self._cell(self.lat, self.lon)
+        flat = rows * self._n_cols + cols
+        self._order = np.argsort(flat, kind="stable")
+        self._flat = flat[self._order]
+
+    @classmethod
+    def from_csv(cls, path=DEFAULT_STATIONS_FILE):
+        return cls(pd.read_csv(path))
+
+    def __len__(self):
+        return len(self.codes)
+
+    def _cell(self, lat, lon):
+        rows = np.floor((np.asarray(lat) + 90.0) / self.cell_deg).astype(np.int64)
+        cols = np.floor((np.asarray(lon) + 180.0) / self.cell_deg).astype(np.int64)
+        return rows, cols
+
+    def _candidates(self, lat_min, lat_max, lon_min, lon_max):
+        """Positions of every station in the grid cells overlapping the box."""
+        (r0, r1), (c0, c1) = self._cell([lat_min, lat_max], [lon_min, lon_max])
+        slices = []
+        for row in range(int(r0), int(r1) + 1):
+            lo = np.searchsorted(self._flat, row * self._n_cols + c0, side="left")
+            hi = np.searchsorted(self._flat, row * self._n_cols + c1, side="right")
+            if hi > lo:
+                slices.append(self._order[lo:hi])
+        return np.concatenate(slices) if slices else np.empty(0, dtype=np.int64)
+
+    def in_bbox(self, lat_min, lat_max, lon_min, lon_max):
+        """Positions of the stations inside the lat/lon box."""
+        pos = self._candidates(lat_min, lat_max, lon_min, lon_max)
+        inside = ((self.lat[pos] >= lat_min) & (self.lat[pos] <= lat_max)
+                  & (self.lon[pos] >= lon_min) & (self.lon[pos] <= lon_max))
+        return np.sort(pos[inside])
+
+    def within_radius(self, lat, lon, radius_km):
+        """``(positions, distances_km)`` of the stations within ``radius_km``, nearest first."""
+        dlat = radius_km / KM_PER_DEG_LAT
+        # Widest longitude span of the circle is at the latitude closest to a pole
+        cos_lat = np.cos(np.radians(min(abs(lat) + dlat, 89.9)))
+        dlon = min(radius_km / (KM_PER_DEG_LAT * cos_lat), 180.0)
+        pos = self._candidates(lat - dlat, lat + dlat, lon - dlon, lon + dlon)
+        dist = haversine_km(lat, lon, self.lat[pos], self.lon[pos])
+        keep = dist <= radius_km
+        pos, dist = pos[keep], dist[keep]
+        order = np.argsort(dist, kind="stable")
+        return pos[order], dist[order]
+
+    def nearest(self, lat, lon, k=1):
+        """``(positions, distances_km)`` of the ``k`` nearest stations, nearest first."""
+        k = min(int(k), len(self))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        # Grow the search circle until it holds k stations
+        radius = self.cell_deg * KM_PER_DEG_LAT
+        while True:
+            pos, dist = self.within_radius(lat, lon, radius)
+            if len(pos) >= k or radius > np.pi * EARTH_RADIUS_KM:
+                break
+            radius *= 2
+        if len(pos) < k:
+            dist = haversine_km(lat, lon, self.lat, self.lon)
+            pos = np.argsort(dist, kind="stable")
+            dist = dist[pos]
+        return pos[:k], dist[:k]
+
+    def station_table(self, positions, distances=None, event_id=None):
+        """Station rows for ``positions``, with distance and the event's PGA values if known."""
+        table = self.stations.iloc[positions].reset_index(drop=True)
+        if distances is not None:
+            table["Distance_km"] = np.round(distances, 1)
+        if event_id is not None:
+            event_id = str(event_id).strip()
+            if event_id in self.recordings.index.get_level_values("EventID"):
+                values = self.recordings.xs(event_id, level="EventID").reindex(table["Code"])
+            else:
+                values = pd.DataFrame(index=table["Code"], columns=self.recordings.columns, dtype=float)
+            for column in self.recordings.columns:
+                table[column] = values[column].to_numpy()
+        return table
+
+    def for_event(self, event_id, radius_km=DEFAULT_RADIUS_KM, catalog=None):
+        """Stations within ``radius_km`` of the epicentre of ``event_id``, nearest first."""
+        if catalog is None:
+            catalog = load_catalog()
+        event = catalog.row(event_id)
+        if event is None:
+            print(f"[WARN] Event '{event_id}' has no epicentre in the catalog.")
+            return self.station_table(np.empty(0, dtype=np.int64), np.empty(0), event_id)
+        pos, dist = self.within_radius(float(event["Latitude"]), float(event["Longitude"]), radius_km)
+        return self.station_table(pos, dist, event_id)
+
+
+_registries = {}
+
+
+def load_registry(path=DEFAULT_STATIONS_FILE):
+    """Shared registry for ``path``; re-read only when the file changes on disk."""
+    key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+    if key not in _registries:
+        _registries.clear()
+        _registries[key] = StationRegistry.from_csv(path)
+    return _registries[key]
+
+
+def stations_for_event(event_id, radius_km=DEFAULT_RADIUS_KM, path=DEFAULT_STATIONS_FILE):
+    return load_registry(path).for_event(event_id, radius_km)
@@ -0,0 +1,296 @@
+"""Bounded-memory processing of arbitrarily long records.
+
+Records are consumed as a sequence of sample blocks (``AscStream`` for
+text files, :func:`array_blocks` for arrays already in memory or memory
+mapped). Every stage keeps only a small carry-over state between blocks:
+
+* :class:`OverlapSaveFilter`: linear-phase FIR high-pass by overlap-save
+  FFT convolution, aligned like ``np.convolve(x, taps, "same")``;
+* :class:`RunningMotion`: velocity, displacement (MATLAB ``cumtrapz``) and
+  Arias intensity as running sums, with running peaks;
+* :class:`PeakRecords`: first/last sample reaching any level, so bracketed
+  durations can use a threshold relative to the final PGA;
+* :class:`Envelope`: min/max per bucket for plotting, at most a fixed
+  number of points.
+
+The FIR high-pass stands in for the whole-record detrend + FFT filter of
+``preprocessing.preprocess_boore``, which cannot run block by block; its
+zero DC gain and symmetry also remove constant offsets and linear trends.
+"""
+
+import numpy as np
+
+from asc_reader import AscStream
+from intensity_measures import CM_PER_M, G
+from preprocessing import DEFAULT_CORNER_FREQ, next_fast_len
+
+BLOCK_SAMPLES = 1 << 18
+ENVELOPE_POINTS = 100_000
+MIN_FFT_LEN = 1 << 16
+
+
+def array_blocks(data, block_samples=BLOCK_SAMPLES):
+    """Consecutive blocks of a 1-D array (views, so memory maps stay on disk)."""
+    for start in range(0, len(data), block_samples):
+        yield np.asarray(data[start:start + block_samples], dtype=np.float64)
+
+
+def fir_highpass(fs, corner_freq=DEFAULT_CORNER_FREQ, transition=None):
+    """Odd-length windowed-sinc (Blackman) high-pass taps.
+
+    The stopband ends at ``corner_freq`` and the passband starts one
+    ``transition`` width (default: ``corner_freq``) above it.
+    """
+    transition = transition or corner_freq
+    n = int(np.ceil(5.5 * fs / transition)) | 1
+    m = np.arange(n) - (n - 1) / 2
+    cutoff = (corner_freq + transition / 2) / fs
+    taps = -2 * cutoff * np.sinc(2 * cutoff * m) * np.blackman(n)
+    taps *= 1.0 / -taps.sum()
+    taps[(n - 1) // 2] += 1.0
+    return taps
+
+
+class OverlapSaveFilter:
+    """Block-wise FIR filtering with output aligned to the input.
+
+    ``process`` returns as many output samples as are final so far and
+    ``flush`` the rest; together they equal ``np.convolve(x, taps, "same")``.
+    """
+
+    def __init__(self, taps, fft_len=None):
+        self.n_taps = len(taps)
+        self.fft_len = fft_len or next_fast_len(max(4 * self.n_taps, MIN_FFT_LEN))
+        self.step = self.fft_len - self.n_taps + 1
+        self._spectrum = np.fft.rfft(taps, self.fft_len)
+        self._history = np.zeros(self.n_taps - 1)
+        self._pending = np.empty(0)
+        self._delay = (self.n_taps - 1) // 2     # group delay still to drop
+        self._n_in = 0
+        self._n_out = 0
+
+    def _run(self, data):
+        data = np.concatenate([self._pending, data])
+        k = len(data) // self.step * self.step
+        self._pending = data[k:]
+        if not k:
+            return np.empty(0)
+        buffer = np.concatenate([self._history, data[:k]])
+        self._history = buffer[len(buffer) - (self.n_taps - 1):]
+        # Tüm parçalar tek bir 2-B FFT ile işlenir
+        segments = np.lib.stride_tricks.sliding_window_view(buffer, self.fft_len)[::self.step]
+        out = np.fft.irfft(np.fft.rfft(segments, axis=-1) * self._spectrum, self.fft_len, axis=-1)
+        out = out[:, self.n_taps - 1:].ravel()
+        drop = min(self._delay, len(out))
+        self._delay -= drop
+        return out[drop:]
+
+    def process(self, block):
+        self._n_in += len(block)
+        out = self._run(np.asarray(block, dtype=np.float64))
+        self._n_out += len(out)
+        return out
+
+    def flush(self):
+        # Kalan örnekler sıfırlarla dışarı itilir: bekleyen girdi + tam grup
+        # gecikmesi her zaman en az bir tam adımı daha doldurur
+        out = self._run(np.zeros((self.n_taps - 1) // 2 + self.step))
+        out = out[:self._n_in - self._n_out]
+        self._n_out += len(out)
+        return out
+
+
+class PeakRecords:
+    """First and last sample index where ``|x|`` reaches any level.
+
+    Keeps the strict running-maximum records (for the first crossing) and a
+    stack of strict suffix maxima (for the last one); both stay tiny for
+    real records.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self._first_idx = np.empty(0, dtype=np.int64)
+        self._first_val = np.empty(0)            # increasing
+        self._last_idx = np.empty(0, dtype=np.int64)
+        self._last_val = np.empty(0)             # decreasing
+
+    @property
+    def peak(self):
+        return float(self._first_val[-1]) if len(self._first_val) else 0.0
+
+    def update(self, x):
+        a = np.abs(np.asarray(x, dtype=np.float64))
+        if not a.size:
+            return
+        before = self._first_val[-1] if len(self._first_val) else -np.inf
+        running_before = np.maximum.accumulate(np.r_[before, a[:-1]])
+        new = np.flatnonzero(a > running_before)
+        self._first_idx = np.r_[self._first_idx, new + self.n]
+        self._first_val = np.r_[self._first_val, a[new]]
+
+        later = np.r_[np.maximum.accumulate(a[::-1])[::-1][1:], -np.inf]
+        candidates = np.flatnonzero(a > later)
+        keep = np.searchsorted(-self._last_val, -a.max(), side="left")
+        self._last_idx = np.r_[self._last_idx[:keep], candidates + self.n]
+        self._last_val = np.r_[self._last_val[:keep], a[candidates]]
+        self.n += len(a)
+
+    def first_at_or_above(self, level):
+        i = np.searchsorted(self._first_val, level, side="left")
+        return int(self._first_idx[i]) if i < len(self._first_idx) else None
+
+    def last_at_or_above(self, level):
+        count = np.searchsorted(-self._last_val, -level, side="right")
+        return int(self._last_idx[count - 1]) if count else None
+
+
+class RunningMotion:
+    """Velocity, displacement and Arias intensity carried across blocks.
+
+    Each ``update(acc)`` returns that block's ``(vel, disp, arias)``, with
+    Arias intensity in m/s for acceleration in cm/s^2.
+    """
+
+    def __init__(self, dt):
+        self.dt = dt
+        self.n = 0
+        self._acc = self._vel = self._disp = self._arias = 0.0
+        self.pga = self.pgv = self.pgd = 0.0
+        self.peaks = PeakRecords()
+
+    def _cumtrapz(self, y, y_last, start):
+        steps = (y + np.r_[y_last, y[:-1]]) * (self.dt / 2.0)
+        if not self.n:
+            steps[0] = 0.0
+        return start + np.cumsum(steps)
+
+    def update(self, acc):
+        acc = np.asarray(acc, dtype=np.float64)
+        if not acc.size:
+            return acc, acc, acc
+        acc_m = acc / CM_PER_M
+        vel = self._cumtrapz(acc, self._acc, self._vel)
+        disp = self._cumtrapz(vel, self._vel, self._disp)
+        arias = self._cumtrapz(acc_m ** 2, (self._acc / CM_PER_M) ** 2, self._arias / (np.pi / (2 * G)))
+        arias *= np.pi / (2 * G)
+
+        self._acc, self._vel, self._disp, self._arias = acc[-1], vel[-1], disp[-1], arias[-1]
+        self.pga = max(self.pga, float(np.abs(acc).max()))
+        self.pgv = max(self.pgv, float(np.abs(vel).max()))
+        self.pgd = max(self.pgd, float(np.abs(disp).max()))
+        self.peaks.update(acc)
+        self.n += len(acc)
+        return vel, disp, arias
+
+    def bracketed_duration(self, threshold):
+        """``(duration, start, end)`` in seconds for ``|acc| >= threshold``, NaN start/end if never reached."""
+        first = self.peaks.first_at_or_above(threshold)
+        if first is None:
+            return 0.0, np.nan, np.nan
+        last = self.peaks.last_at_or_above(threshold)
+        return (last - first) * self.dt, first * self.dt, last * self.dt
+
+    def measures(self, bracket_fraction=0.05):
+        duration, start, end = self.bracketed_duration(bracket_fraction * self.pga)
+        return {
+            "pga_cm_s2": self.pga,
+            "pgv_cm_s": self.pgv,
+            "pgd_cm": self.pgd,
+            "bracketed_duration_s": duration,
+            "bracket_start_s": start,
+            "bracket_end_s": end,
+            "arias_intensity_m_s": float(self._arias),
+        }
+
+
+class Envelope:
+    """Min/max of every ``width`` samples, interleaved for plotting."""
+
+    def __init__(self, width):
+        self.width = max(1, int(width))
+        self._mins = []
+        self._maxs = []
+        self._partial = np.empty(0)
+
+    @classmethod
+    def for_length(cls, n_samples, max_points=ENVELOPE_POINTS):
+        return cls(-(-n_samples // max(1, max_points // 2)) if n_samples else 1)
+
+    def update(self, x):
+        data = np.concatenate([self._partial, np.asarray(x, dtype=np.float64)])
+        full = len(data) // self.width * self.width
+        buckets = data[:full].reshape(-1, self.width)
+        self._mins.append(buckets.min(axis=1))
+        self._maxs.append(buckets.max(axis=1))
+        self._partial = data[full:]
+
+    def result(self, dt):
+        """``(t, y)``: the raw samples for width 1, else min/max pairs per bucket."""
+        mins = np.concatenate(self._mins + ([[self._partial.min()]] if self._partial.size else []))
+        maxs = np.concatenate(self._maxs + ([[self._partial.max()]] if self._partial.size else []))
+        starts = np.arange(len(mins)) * self.width * dt
+        if self.width == 1:
+            return starts, mins
+        t = np.column_stack([starts, starts + self.width * dt / 2]).ravel()
+        y = np.column_stack([mins, maxs]).ravel()
+        return t, y
+
+
+def expected_samples(stream):
+    """NDATA from the header, else an estimate from the size of the sample text."""
+    if stream.header.ndata:
+        return stream.header.ndata
+    return max(1, (stream.size - stream.data_offset) // 12)
+
+
+def stream_motion(path, corner_freq=DEFAULT_CORNER_FREQ, envelope_points=ENVELOPE_POINTS, progress=None,
+                  bracket_fraction=0.05):
+    """Raw and high-passed acceleration, velocity, displacement and Arias intensity of a long record.
+
+    Traces come back as :class:`Envelope` pairs, together with the scalar
+    measures of the filtered trace (see :meth:`RunningMotion.measures`).
+    ``result["t", kind]`` is the time axis of the ``kind`` envelopes;
+    ``result["t"]`` is the raw one, which the filtered traces share.
+    """
+    stream = AscStream(path)
+    dt = stream.header.sampling_interval_s
+    width = Envelope.for_length(expected_samples(stream), envelope_points).width
+    hp = OverlapSaveFilter(fir_highpass(1.0 / dt, corner_freq))
+    motions = {"raw": RunningMotion(dt), "pre": RunningMotion(dt)}
+    traces = {(kind, name): Envelope(width) for kind in motions for name in ("acc", "vel", "disp", "arias")}
+
+    def feed(kind, acc):
+        vel, disp, arias = motions[kind].update(acc)
+        for name, values in (("acc", acc), ("vel", vel), ("disp", disp), ("arias", arias)):
+            traces[kind, name].update(values)
+
+    for block in stream:
+        feed("raw", block)
+        feed("pre", hp.process(block))
+        if progress is not None:
+            progress(stream.fraction)
+    feed("pre", hp.flush())
+
+    result = {"dt": dt, "n_samples": motions["raw"].n, "measures": motions["pre"].measures(bracket_fraction)}
+    for (kind, name), envelope in traces.items():
+        t, result[kind, name] = envelope.result(dt)
+        if name == "acc":
+            result["t", kind] = t
+    # Filtre çıktısı girdiyle aynı uzunlukta, yani iki zaman ekseni aynı
+    result["t"] = result["t", "raw"]
+    return result
+
+
+def stream_measures(path, corner_freq=DEFAULT_CORNER_FREQ, bracket_fraction=0.05, progress=None):
+    """Scalar intensity measures of a record of any length, in bounded memory."""
+    stream = AscStream(path)
+    dt = stream.header.sampling_interval_s
+    hp = OverlapSaveFilter(fir_highpass(1.0 / dt, corner_freq))
+    motion = RunningMotion(dt)
+    for block in stream:
+        motion.update(hp.process(block))
+        if progress is not None:
+            progress(stream.fraction)
+    motion.update(hp.flush())
+    return motion.measures(bracket_fraction)
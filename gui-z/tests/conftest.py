@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Modüller gui-z altında düz duruyor; testler oradan içe aktarır
+GUI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GUI_DIR)
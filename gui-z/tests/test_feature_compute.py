@@ -0,0 +1,43 @@
+import os
+
+import numpy as np
+
+from asc_reader import read_asc
+from feature_compute import compute_arias, compute_bracketed_duration, stream_arias, stream_bracketed_duration
+from intensity_measures import intensity_measures
+from streaming import stream_measures
+
+from conftest import GUI_DIR
+
+SAMPLE = os.path.join(GUI_DIR, "20250423094910_3416_ap_RawAcc_N.asc")
+
+
+def test_page_features_match_intensity_measures():
+    record = read_asc(SAMPLE)
+    measures = intensity_measures(record.data, record.dt)
+
+    arias = compute_arias(record)
+    assert arias["arias"].shape == arias["t"].shape
+    np.testing.assert_allclose(arias["arias"][-1], measures.arias_intensity_m_s, rtol=1e-12)
+
+    bracket = compute_bracketed_duration(record)
+    assert bracket["start"] == measures.bracket_start_s
+    assert bracket["end"] == measures.bracket_end_s
+    np.testing.assert_allclose(bracket["end"] - bracket["start"], measures.bracketed_duration_s)
+
+
+def test_streamed_features_match_stream_measures():
+    record = read_asc(SAMPLE)
+    measures = stream_measures(SAMPLE)
+
+    arias = stream_arias(SAMPLE)
+    assert arias["arias"].shape == arias["t"].shape
+    assert arias["arias"][-1] == measures["arias_intensity_m_s"]
+    # FIR ve FFT filtreleri aynı ölçüyü vermeli
+    np.testing.assert_allclose(arias["arias"][-1], compute_arias(record)["arias"][-1], rtol=1e-3)
+
+    bracket = stream_bracketed_duration(SAMPLE)
+    assert (bracket["start"], bracket["end"]) == (measures["bracket_start_s"], measures["bracket_end_s"])
+    in_memory = compute_bracketed_duration(record)
+    assert abs(bracket["start"] - in_memory["start"]) <= 2 * record.dt
+    assert abs(bracket["end"] - in_memory["end"]) <= 2 * record.dt
@@ -0,0 +1,36 @@
+import os
+
+import numpy as np
+
+from asc_reader import DEFAULT_ASC_FILE, read_asc
+from phase_picker import aic_pick, pick_phases
+from preprocessing import preprocess_boore
+
+GUI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def sample_trace():
+    record = read_asc(os.path.join(GUI_DIR, DEFAULT_ASC_FILE))
+    return preprocess_boore(record.data, 1.0 / record.dt), record.dt
+
+
+def test_batched_picks_equal_single_trace_picks():
+    x, dt = sample_trace()
+    rng = np.random.default_rng(0)
+    traces = [x, np.roll(x, 3000), np.roll(x, -2000), 0.5 * x + rng.standard_normal(x.size)]
+    batch = pick_phases(np.stack(traces), dt)
+    for i, trace in enumerate(traces):
+        single = pick_phases(trace, dt)
+        assert batch.p_index[i] == single.p_index
+        assert batch.s_index[i] == single.s_index
+    assert batch.s_index[0] >= 0
+
+
+def test_aic_window_widths_do_not_interact():
+    x, _ = sample_trace()
+    data = np.stack([x, x])
+    start = np.array([2000, 2000])
+    stop = np.array([3000, 9000])
+    batch = aic_pick(data, start, stop)
+    assert batch[0] == aic_pick(x, 2000, 3000)
+    assert batch[1] == aic_pick(x, 2000, 9000)
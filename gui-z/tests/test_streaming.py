@@ -0,0 +1,52 @@
+import numpy as np
+
+from streaming import OverlapSaveFilter, array_blocks, fir_highpass, stream_motion
+
+FS = 100.0
+
+
+def blockwise(x, taps, fft_len=None, block_samples=1000):
+    hp = OverlapSaveFilter(taps, fft_len)
+    return np.concatenate([hp.process(block) for block in array_blocks(x, block_samples)] + [hp.flush()])
+
+
+def lengths_near_steps(step, delay):
+    # Leftover + group delay below, at and above one step
+    offsets = [-delay - 1, -delay, -delay + 1, -1, 0, 1, delay - 1, delay, delay + 1, step // 2]
+    return sorted({k * step + off for k in (1, 2, 3) for off in offsets if k * step + off > 0})
+
+
+def test_overlap_save_equals_convolve_near_step_multiples():
+    taps = fir_highpass(FS, corner_freq=1.0)
+    hp = OverlapSaveFilter(taps, fft_len=4096)
+    rng = np.random.default_rng(0)
+    for n in lengths_near_steps(hp.step, (len(taps) - 1) // 2):
+        x = rng.standard_normal(n)
+        out = blockwise(x, taps, fft_len=4096, block_samples=777)
+        assert out.shape == x.shape, n
+        np.testing.assert_allclose(out, np.convolve(x, taps, "same"), atol=1e-10)
+
+
+def test_default_filter_keeps_the_tail():
+    # 159 072 samples used to lose up to 2 571 filtered samples with the 0.05 Hz filter
+    taps = fir_highpass(FS)
+    x = np.random.default_rng(1).standard_normal(159_072)
+    out = blockwise(x, taps, block_samples=50_000)
+    assert out.shape == x.shape
+    n_fft = 1 << (len(x) + len(taps) - 2).bit_length()
+    full = np.fft.irfft(np.fft.rfft(x, n_fft) * np.fft.rfft(taps, n_fft), n_fft)
+    same = full[(len(taps) - 1) // 2:][:len(x)]
+    np.testing.assert_allclose(out, same, atol=1e-9)
+
+
+def test_stream_motion_traces_share_the_time_axis(tmp_path):
+    n = 159_072
+    path = tmp_path / "long_N.asc"
+    x = 10.0 * np.random.default_rng(2).standard_normal(n)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"SAMPLING_INTERVAL_S: {1 / FS}\nNDATA: {n}\nSTREAM: HNN\nUNITS: cm/s^2\n")
+        f.write("\n".join(f"{v:.6f}" for v in x) + "\n")
+    result = stream_motion(str(path), envelope_points=2 * n)
+    assert len(result["t", "raw"]) == len(result["t", "pre"]) == n
+    for name in ("acc", "vel", "disp", "arias"):
+        assert len(result["raw", name]) == len(result["pre", name]) == len(result["t"])
@@ -0,0 +1,162 @@
+"""Background execution for page computations.
+
+``WorkerPool`` runs plain callables on a ``QThreadPool`` and delivers the
+result back on the GUI thread through Qt signals. Only the latest
+submission is live: submitting a new job cancels the previous one, and
+results from cancelled jobs are dropped instead of reaching the page.
+Jobs submitted with ``with_progress=True`` receive a ``progress(fraction)``
+callback whose calls arrive as the pool's ``progress`` signal, and with
+``with_partial=True`` a ``partial(result)`` callback for results that are
+ready before the job ends (the pool's ``partial`` signal).
+"""
+
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from profiling import profiler
+
+
+class _JobSignals(QObject):
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+    done = pyqtSignal(int)
+    progress = pyqtSignal(int, float)
+    partial = pyqtSignal(int, object)
+
+
+class _Cancelled(Exception):
+    pass
+
+
+class _Job(QRunnable):
+    def __init__(self, job_id, func, args, kwargs, signals):
+        super().__init__()
+        self.job_id = job_id
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = signals
+        self.cancelled = False
+
+    def report_progress(self, fraction):
+        # A superseded job stops at its next progress report
+        if self.cancelled:
+            raise _Cancelled()
+        self.signals.progress.emit(self.job_id, fraction)
+
+    def report_partial(self, result):
+        if self.cancelled:
+            raise _Cancelled()
+        self.signals.partial.emit(self.job_id, result)
+
+    def run(self):
+        try:
+            if self.cancelled:
+                return
+            try:
+                with profiler.job():
+                    result = self.func(*self.args, **self.kwargs)
+            except _Cancelled:
+                return
+            except Exception as e:
+                if not self.cancelled:
+                    traceback.print_exc()
+                    self.signals.failed.emit(self.job_id, str(e))
+                return
+            if not self.cancelled:
+                self.signals.finished.emit(self.job_id, result)
+        finally:
+            self.signals.done.emit(self.job_id)
+
+
+class WorkerPool(QObject):
+    """Run one job at a time per owner; newer submissions supersede older ones.
+
+    ``finished(job_id, result)``, ``failed(job_id, message)``,
+    ``progress(fraction)`` and ``partial(result)`` are only emitted for the
+    current job, and
+    ``busy_changed(bool)`` toggles around it.
+    """
+
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+    progress = pyqtSignal(float)
+    partial = pyqtSignal(object)
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None, max_threads=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self._signals = _JobSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        self._signals.done.connect(self._on_done)
+        self._signals.progress.connect(self._on_progress)
+        self._signals.partial.connect(self._on_partial)
+        # Jobs stay referenced from Python until their thread is done with them.
+        self._jobs = {}
+        self._current = None
+        self._next_id = 0
+
+    def submit(self, func, *args, with_progress=False, with_partial=False, **kwargs):
+        self._drop_current()
+        self._next_id += 1
+        job = _Job(self._next_id, func, args, kwargs, self._signals)
+        if with_progress:
+            job.kwargs["progress"] = job.report_progress
+        if with_partial:
+            job.kwargs["partial"] = job.report_partial
+        job.setAutoDelete(False)
+        self._jobs[job.job_id] = job
+        self._current = job
+        self.pool.start(job)
+        self.busy_changed.emit(True)
+        return job.job_id
+
+    def cancel(self):
+        if self._drop_current():
+            self.busy_changed.emit(False)
+
+    def _drop_current(self):
+        job = self._current
+        if job is None:
+            return False
+        job.cancelled = True
+        if self.pool.tryTake(job):
+            self._jobs.pop(job.job_id, None)
+        self._current = None
+        return True
+
+    def is_busy(self):
+        return self._current is not None
+
+    def _is_current(self, job_id):
+        return self._current is not None and self._current.job_id == job_id
+
+    def _on_finished(self, job_id, result):
+        if not self._is_current(job_id):
+            return
+        self._current = None
+        self.busy_changed.emit(False)
+        self.finished.emit(job_id, result)
+
+    def _on_progress(self, job_id, fraction):
+        if self._is_current(job_id):
+            self.progress.emit(fraction)
+
+    def _on_partial(self, job_id, result):
+        if self._is_current(job_id):
+            self.partial.emit(result)
+
+    def _on_done(self, job_id):
+        self._jobs.pop(job_id, None)
+
+    def _on_failed(self, job_id, message):
+        if not self._is_current(job_id):
+            return
+        self._current = None
+        self.busy_changed.emit(False)
+        self.failed.emit(job_id, message)